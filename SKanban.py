@@ -1,102 +1,478 @@
 import os
 import sys
 import json
-import bcrypt
+import time
+import uuid
+import heapq
+import urllib.parse
+import functools
 import threading
-import requests
-import xml.etree.ElementTree as ET
-import xml.dom.minidom
-from xml.etree.ElementTree import Element, SubElement
-
-from flask import Flask, request, jsonify
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity  # JWT/tokenisation
+from collections import deque, OrderedDict
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QDialog, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QMessageBox, QTextEdit, QFormLayout,
     QFrame, QScrollArea, QListWidget, QGridLayout, QSizePolicy, QSpinBox,
-    QDateEdit, QFileDialog
+    QDateEdit, QFileDialog, QComboBox, QProgressDialog, QTabBar, QListWidgetItem, QInputDialog
+)
+from PyQt6.QtGui import QFont, QMouseEvent, QRegion, QPainterPath, QShortcut, QKeySequence
+from PyQt6.QtCore import (
+    Qt, QPoint, QTime, QTimer, QRectF, QPropertyAnimation, QEasingCurve, QDate, QRect, QFileSystemWatcher,
+    QThread, pyqtSignal, QObject
 )
-from PyQt6.QtGui import QFont, QMouseEvent, QRegion, QPainterPath
-from PyQt6.QtCore import Qt, QPoint, QTime, QTimer, QRectF, QPropertyAnimation, QEasingCurve, QDate, QRect
 
+from kanban_storage import (
+    PROJECTS_FOLDER, board_path, log_path, get_project_catalog, get_search_index, get_flow_metrics,
+    get_log_index, iter_import_records, iter_board_records, write_export, AutosaveWriter, newer_autosave,
+    discard_autosave, atomic_open, file_lock, append_log_line, format_log_line, TaskArchive, DONE_COLUMN, TASK_FIELDS,
+    Outbox, open_project_file, write_project_file, get_file_cipher, DependencyGraph, CycleError, parse_blockers,
+    TaskIndex, write_backup, restore_backup, BackupCancelled, apply_project_operations, record_project_changes,
+    empty_board
+)
 
-app = Flask(__name__)
-ADMINS_FILE = "admin_users.json"
+AUTOSAVE_DELAY_MS = 2000  #Edits within this window are coalesced into a single autosave write
+ARCHIVE_AFTER_DAYS = float(os.environ.get("KANBAN_ARCHIVE_DAYS", "14"))  #Done tasks older than this leave the board; 0 disables
+BOARD_CACHE_SIZE = 4  #Hidden boards kept alive for instant switching
+BOARD_CACHE_TASKS = 100  #Upper bound on tasks held by hidden boards, as a proxy for their memory; two full boards
+REMINDER_LEAD_HOURS = float(os.environ.get("KANBAN_REMINDER_HOURS", "24"))  #"Due soon" notice this long before a deadline; 0 disables
+REMINDER_MAX_SLEEP_S = 3600  #The timer re-checks at least hourly, so sleep or clock changes cannot delay a reminder for long
+TOKEN_REFRESH_MARGIN = 120  #Client renews access tokens this many seconds before expiry
+BACKEND_URL = os.environ.get("KANBAN_BACKEND_URL", "http://127.0.0.1:5000").rstrip("/")
+SYNC_ENABLED = False  #Edits are pushed to the server only when it keeps its own copy of the boards (--client-only)
+SYNC_BATCH_SIZE = 200  #Queued operations sent per request
+SYNC_MAX_BACKOFF = 60  #Seconds between retries while the server is unreachable
+
+
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Span:
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class Tracer:
+    #Spans go into a ring buffer; when tracing is off, decorated calls cost one attribute check
+    def __init__(self, capacity=20000):
+        self.enabled = os.environ.get("KANBAN_TRACE") == "1"
+        self.spans = deque(maxlen=capacity)
+        self.null_span = NullSpan()
+
+    def record(self, name, start_ns, duration_ns):
+        self.spans.append((name, start_ns, duration_ns, threading.get_ident()))
+
+    def span(self, name):
+        return Span(self, name) if self.enabled else self.null_span
+
+    def trace(self, name):
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter_ns() - start)
+            return wrapper
+        return decorate
+
+    def stats(self):
+        durations = {}
+        for name, _, duration_ns, _ in list(self.spans):
+            durations.setdefault(name, []).append(duration_ns)
+        stats = {}
+        for name, values in durations.items():
+            values.sort()
+            stats[name] = {
+                "count": len(values),
+                "p50_ms": values[len(values) // 2] / 1e6,
+                "p99_ms": values[min(len(values) - 1, int(len(values) * 0.99))] / 1e6,
+            }
+        return stats
+
+    def export_chrome_trace(self, file_path):
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "ts": start_ns / 1000, "dur": duration_ns / 1000,
+                   "pid": pid, "tid": thread_id}
+                  for name, start_ns, duration_ns, thread_id in list(self.spans)]
+        with atomic_open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
 
-#JWT configuration
-app.config["JWT_SECRET_KEY"] = "super-secret-change-this"  #Secret key used to sign tokens
-app.config["JWT_ACCESS_TOKEN_EXPIRES"] = 3600               #Tokens expire in 1 hour
-jwt = JWTManager(app)  #Initialise JWT manager with Flask app
 
+tracer = Tracer()
 
-def load_admins():
-    if not os.path.exists(ADMINS_FILE):
-        return {}
-    with open(ADMINS_FILE, "r") as f:
-        return json.load(f)
 
+class BoardCache:
+    #Recently used boards are hidden instead of destroyed; they are saved on the way in,
+    #so evicting one only has to close it
+    def __init__(self, max_boards=BOARD_CACHE_SIZE, max_tasks=BOARD_CACHE_TASKS):
+        self.max_boards = max_boards
+        self.max_tasks = max_tasks
+        self.windows = OrderedDict()
 
-def save_admins(admins):
-    with open(ADMINS_FILE, "w") as f:
-        json.dump(admins, f)
+    def take(self, project_name, is_Admin):
+        window = self.windows.pop((project_name, is_Admin), None)
+        if window is not None and window.board_mtime != window.current_board_mtime():
+            self.close_window(window)  #changed on disk since it was cached
+            return None
+        return window
 
+    def put(self, window):
+        self.windows[(window.user_name, window.is_Admin)] = window
+        self.windows.move_to_end((window.user_name, window.is_Admin))
+        while self.windows and (len(self.windows) > self.max_boards or
+                                sum(w.task_counter for w in self.windows.values()) > self.max_tasks):
+            self.close_window(self.windows.popitem(last=False)[1])
 
-@app.route("/register", methods=["POST"])
-def register():
-    data = request.json
-    username = data.get("username")
-    password = data.get("password")
+    def discard(self, project_name):
+        for key in [key for key in self.windows if key[0] == project_name]:
+            self.close_window(self.windows.pop(key))
 
-    if not username or not password or len(username) < 3 or len(password) < 4:
-        return jsonify({"success": False, "message": "Username or password too short"}), 400
+    def names(self):
+        return [key for key in reversed(self.windows)]
 
-    admins = load_admins()
-    if username in admins:
-        return jsonify({"success": False, "message": "Username already exists"}), 400
+    def close_window(self, window):
+        window.close()
+        window.deleteLater()
 
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-    admins[username] = hashed.decode("utf-8")
-    save_admins(admins)
 
-    return jsonify({"success": True, "message": f"Admin '{username}' registered."})
+board_cache = BoardCache()
 
 
-@app.route("/login", methods=["POST"])
-def login():
-    data = request.json
-    username = data.get("username")
-    password = data.get("password")
+class ReminderScheduler(QObject):
+    #One min-heap of (fire time, sequence, task key, stage) for the tasks of every loaded board and
+    #one single-shot timer armed for the earliest entry. Rescheduling pushes a new entry and bumps the
+    #task's sequence, so the old one is skipped when it surfaces; the heap is rebuilt once stale
+    #entries outnumber the live ones. Only reminders still ahead are scheduled, so reopening the app
+    #never repeats them; the card tooltip still shows how overdue a task is.
+    reminder_fired = pyqtSignal(str, str, str)  #project, task id, message
 
-    admins = load_admins()
-    if username not in admins:
-        return jsonify({"success": False, "message": "Invalid credentials"}), 401
+    STAGES = (("Task Due Soon", "is due on"), ("Task Overdue", "was due on"))
 
-    if bcrypt.checkpw(password.encode("utf-8"), admins[username].encode("utf-8")):
-        #create a JWT token for the authenticated user
-        access_token = create_access_token(identity=username)
-        return jsonify({"success": True, "access_token": access_token})
-    else:
-        return jsonify({"success": False, "message": "Invalid credentials"}), 401
+    def __init__(self):
+        super().__init__()
+        self.heap = []
+        self.entries = {}  #(project, task id) -> {"title", "end_date", "deadline", "seq"}
+        self.sequence = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.fire_due)
+        self.tray = None
+
+    def deadline(self, end_date):
+        #a task is overdue once its end date is over, matching the tooltip
+        from datetime import datetime, timedelta
+        day = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+        return day.timestamp()
+
+    def stage_times(self, deadline):
+        times = [deadline - REMINDER_LEAD_HOURS * 3600 if REMINDER_LEAD_HOURS > 0 else None, deadline]
+        return [(stage, fire_at) for stage, fire_at in enumerate(times) if fire_at is not None]
+
+    def schedule(self, project, task_id, title, end_date, column_name=""):
+        key = (project, task_id)
+        if not end_date or (column_name or "").lower() == DONE_COLUMN.lower():
+            self.unschedule(project, task_id)
+            return
+        entry = self.entries.get(key)
+        if entry is not None and entry["end_date"] == end_date:
+            entry["title"] = title
+            return
+        try:
+            deadline = self.deadline(end_date)
+        except ValueError:
+            self.unschedule(project, task_id)
+            return
+        self.entries[key] = {"title": title, "end_date": end_date, "deadline": deadline, "seq": None}
+        self.push_next(key, time.time())
+
+    def push_next(self, key, now):
+        entry = self.entries[key]
+        upcoming = [(fire_at, stage) for stage, fire_at in self.stage_times(entry["deadline"]) if fire_at > now]
+        if not upcoming:
+            del self.entries[key]
+            return
+        self.sequence += 1
+        entry["seq"] = self.sequence
+        heapq.heappush(self.heap, (upcoming[0][0], self.sequence, key, upcoming[0][1]))
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            self.compact()
+        if self.heap[0][1] == self.sequence:
+            self.arm()
+
+    def unschedule(self, project, task_id):
+        #the heap entry goes stale and is dropped when it reaches the top
+        self.entries.pop((project, task_id), None)
+
+    def track_board(self, project, board):
+        #bulk (re)registration after a load or import; unchanged tasks cost one dictionary lookup
+        seen = set()
+        for column in board["columns"]:
+            for task in column["tasks"]:
+                seen.add(task["id"])
+                self.schedule(project, task["id"], task["title"], task["end_date"], column["name"])
+        for key in [key for key in self.entries if key[0] == project and key[1] not in seen]:
+            del self.entries[key]
+
+    def forget_project(self, project):
+        for key in [key for key in self.entries if key[0] == project]:
+            del self.entries[key]
+
+    def compact(self):
+        self.heap = [item for item in self.heap
+                     if item[2] in self.entries and self.entries[item[2]]["seq"] == item[1]]
+        heapq.heapify(self.heap)
+
+    def arm(self):
+        while self.heap and self.entries.get(self.heap[0][2], {}).get("seq") != self.heap[0][1]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            self.timer.stop()
+            return
+        delay = min(max(self.heap[0][0] - time.time(), 0), REMINDER_MAX_SLEEP_S)
+        self.timer.start(int(delay * 1000))
+
+    def fire_due(self):
+        now = time.time()
+        while self.heap and self.heap[0][0] <= now:
+            _, seq, key, stage = heapq.heappop(self.heap)
+            entry = self.entries.get(key)
+            if entry is None or entry["seq"] != seq:
+                continue  #rescheduled or removed since it was pushed
+            self.notify(key, entry, stage)
+            self.push_next(key, now)
+        self.arm()
+
+    def notify(self, key, entry, stage):
+        from datetime import datetime
+        project, task_id = key
+        action, verb = self.STAGES[stage]
+        message = f"'{entry['title']}' {verb} {entry['end_date']}"
+        try:
+            append_log_line(log_path(project),
+                            format_log_line(datetime.now().strftime('%Y-%m-%d %H:%M:%S'), action, message))
+        except OSError as e:
+            print(f"Error logging reminder: {e}")
+        self.show_tray_message(f"{action.replace('Task ', '')}: {project}", message)
+        self.reminder_fired.emit(project, task_id, message)
+
+    def show_tray_message(self, title, message):
+        from PyQt6.QtWidgets import QSystemTrayIcon, QStyle
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            return
+        if self.tray is None:
+            self.tray = QSystemTrayIcon(QApplication.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation),
+                                        self)
+            self.tray.show()
+        self.tray.showMessage(title, message)
 
 
-@app.route("/admin_exists", methods=["GET"])
-def admin_exists():
-    admins = load_admins()
-    return jsonify({"exists": len(admins) > 0})
+reminder_scheduler = None
 
 
-@app.route("/protected", methods=["GET"])
-@jwt_required()  #Requires a valid JWT token to access this route
-def protected():
-    #retrieve the username from the token
-    current_user = get_jwt_identity()
-    return jsonify({"message": f"Hello {current_user}, you have access to protected data!"})
+def get_reminder_scheduler():
+    global reminder_scheduler
+    if reminder_scheduler is None:
+        reminder_scheduler = ReminderScheduler()
+    return reminder_scheduler
 
 
 def run_flask():
-    app.run(port=5000, debug=False, use_reloader=False)
+    #Flask and bcrypt are only imported by the process that actually serves the API
+    from kanban_server import run_server
+    run_server()
+
+
+def parse_client_args(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Secure Kanban Board desktop client")
+    parser.add_argument("--client-only", action="store_true",
+                        help="do not start the embedded auth server; use --backend-url instead")
+    parser.add_argument("--backend-url", default=BACKEND_URL,
+                        help="base URL of the auth server (default: $KANBAN_BACKEND_URL or http://127.0.0.1:5000)")
+    #unknown arguments are left for Qt (e.g. -platform offscreen)
+    args, qt_args = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + qt_args
+
+
+class AuthSession:
+    def __init__(self, username, access_token, refresh_token, expires_in):
+        self.username = username
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_in = expires_in
+        self.lock = threading.Lock()
+        self.timer = None
+        self.schedule_refresh(self.expires_in - TOKEN_REFRESH_MARGIN)
+
+    def schedule_refresh(self, delay):
+        #renewal runs on a timer thread so the GUI never waits on the network
+        self.timer = threading.Timer(max(delay, 5), self.refresh)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def refresh(self):
+        import requests
+        try:
+            headers = {"Authorization": f"Bearer {self.refresh_token}"}
+            response = requests.post(f"{BACKEND_URL}/refresh", headers=headers, timeout=10)
+            data = response.json()
+        except Exception as e:
+            print(f"Token refresh failed, retrying: {e}")
+            self.schedule_refresh(30)
+            return
 
+        if response.status_code == 200 and data.get("success"):
+            with self.lock:
+                self.access_token = data.get("access_token")
+                self.expires_in = data.get("expires_in", self.expires_in)
+            self.schedule_refresh(self.expires_in - TOKEN_REFRESH_MARGIN)
+        else:
+            #refresh token expired or admin removed; a full login is needed again
+            with self.lock:
+                self.access_token = None
+
+    def auth_headers(self):
+        with self.lock:
+            return {"Authorization": f"Bearer {self.access_token}"} if self.access_token else {}
+
+    def stop(self):
+        if self.timer:
+            self.timer.cancel()
+
+
+class BoardSync:
+    #Edits are already applied to the local board; this thread diffs board snapshots into the
+    #outbox and pushes queued operations in batches, backing off while the server is unreachable.
+    #When the server rejects an operation the queue is replayed on the server's board and the
+    #conflicting operations are dropped; if that is rejected too, the changes are kept and sync waits
+    #for the next local edit
+    def __init__(self, project_name, auth_session):
+        self.project_name = project_name
+        self.board_url = f"{BACKEND_URL}/boards/{urllib.parse.quote(project_name, safe='')}"  #names may hold / ? #
+        self.auth_session = auth_session
+        self.outbox = Outbox(project_name)
+        self.condition = threading.Condition()
+        self.snapshot = None
+        self.closed = False
+        self.status = "Synced" if not len(self.outbox) else "Sync pending"
+        self.http = None
+        self.resynced = False  #the queue was rebuilt from the server's board since the last accepted batch
+        self.blocked = False   #rejected even after a rebuild; nothing is pushed until the board changes
+        self.thread = threading.Thread(target=self.run, name=f"sync-{project_name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, board):
+        with self.condition:
+            self.snapshot = board
+            self.condition.notify()
+
+    def run(self):
+        import random
+        retry_delay = 0
+        while True:
+            with self.condition:
+                if self.snapshot is None and not self.closed:
+                    self.condition.wait(retry_delay if len(self.outbox) and not self.blocked else None)
+                board, self.snapshot = self.snapshot, None
+                if self.closed:
+                    return
+            if board is not None:
+                self.outbox.record(board)
+                self.resynced = self.blocked = False
+            elif self.blocked:
+                continue
+            if not len(self.outbox):
+                self.status = "Synced"
+                retry_delay = 0
+            elif self.push():
+                retry_delay = 0
+            else:
+                retry_delay = min(max(retry_delay * 2, 1), SYNC_MAX_BACKOFF) * random.uniform(0.8, 1.2)
+
+    def push(self):
+        import requests
+        headers = self.auth_session.auth_headers() if self.auth_session else {}
+        pending = len(self.outbox)
+        if not headers:
+            self.status = f"Offline: {pending} changes queued (admin sign-in needed)"
+            return False
+        ops = self.outbox.peek(SYNC_BATCH_SIZE)
+        try:
+            if self.http is None:
+                self.http = requests.Session()  #keeps the connection alive between batches
+            response = self.http.post(f"{self.board_url}/batch",
+                                      json={"operations": ops}, headers=headers, timeout=15)
+        except requests.RequestException:
+            self.status = f"Offline: {pending} changes queued"
+            return False
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+
+        if response.status_code == 200 and data.get("success"):
+            self.outbox.remove(op["seq"] for op in ops)
+            self.resynced = False
+            self.status = "Synced" if not len(self.outbox) else f"Syncing: {len(self.outbox)} changes queued"
+            return True
+        if response.status_code in (400, 409) and isinstance(data.get("index"), int) and data["index"] < len(ops):
+            #the server's board has diverged from what the queue expects, so replay the queue on it
+            print(f"Server rejected {ops[data['index']]}: {data.get('message')}")
+            if not self.resynced:
+                if not self.resync(headers):
+                    self.status = f"Sync failed (could not load the server's board): {pending} changes queued"
+                    return False
+                self.resynced = True
+                return True
+            self.blocked = True
+            self.status = f"Sync stopped: the server rejected a change ({data.get('message')}); " \
+                          f"{pending} changes kept until the board is edited again"
+            return False
+        self.status = f"Sync failed ({response.status_code}): {pending} changes queued"
+        return False
+
+    def resync(self, headers):
+        import requests
+        try:
+            response = self.http.get(self.board_url, headers=headers, timeout=15)
+            data = response.json()
+        except (requests.RequestException, ValueError):
+            return False
+        if response.status_code == 404:
+            server_board = empty_board()
+        elif response.status_code == 200 and data.get("success"):
+            server_board = data["board"]
+        else:
+            return False
+        self.outbox.rebase(server_board)
+        return True
+
+    def close(self):
+        #the last snapshot is still recorded so it is pushed on the next start
+        with self.condition:
+            board, self.snapshot = self.snapshot, None
+            self.closed = True
+            self.condition.notify()
+        if board is not None:
+            self.outbox.record(board)
 
 
 class AdminLoginDialog(QDialog):
@@ -105,6 +481,7 @@ class AdminLoginDialog(QDialog):
         self.setWindowTitle("Admin Login")
         self.setFixedSize(300, 220)
         self.access_token = None  # store JWT here
+        self.session = None  # renews the JWT in the background
 
         layout = QVBoxLayout(self)
 
@@ -129,8 +506,9 @@ class AdminLoginDialog(QDialog):
         layout.addLayout(button_layout)
 
         # Check if any admins exist (call Flask backend)
+        import requests
         try:
-            response = requests.get("http://127.0.0.1:5000/admin_exists")
+            response = requests.get(f"{BACKEND_URL}/admin_exists")
             if response.status_code == 200 and not response.json().get("exists", False):
                 QMessageBox.information(self, "First Time Setup", "No admins exist. Please register one.")
         except Exception:
@@ -139,11 +517,14 @@ class AdminLoginDialog(QDialog):
     def try_login(self):
         user = self.username.text().strip()
         pw = self.password.text()
+        import requests
         try:
-            response = requests.post("http://127.0.0.1:5000/login", json={"username": user, "password": pw})
+            response = requests.post(f"{BACKEND_URL}/login", json={"username": user, "password": pw})
             data = response.json()
             if response.status_code == 200 and data.get("success"):
                 self.access_token = data.get("access_token")
+                self.session = AuthSession(user, self.access_token, data.get("refresh_token"),
+                                           data.get("expires_in", 3600))
                 QMessageBox.information(self, "Success", "Login successful! Token acquired.")
                 self.accept()
             else:
@@ -157,8 +538,9 @@ class AdminLoginDialog(QDialog):
         if len(user) < 3 or len(pw) < 4:
             QMessageBox.warning(self, "Error", "Username or password too short")
             return
+        import requests
         try:
-            response = requests.post("http://127.0.0.1:5000/register", json={"username": user, "password": pw})
+            response = requests.post(f"{BACKEND_URL}/register", json={"username": user, "password": pw})
             data = response.json()
             if response.status_code == 200 and data.get("success"):
                 QMessageBox.information(self, "Success", data.get("message"))
@@ -169,12 +551,13 @@ class AdminLoginDialog(QDialog):
 
     def test_protected_request(self):
         """ Example: use token to call protected route """
-        if not self.access_token:
+        if not self.session:
             QMessageBox.warning(self, "Error", "You must login first")
             return
+        import requests
         try:
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            response = requests.get("http://127.0.0.1:5000/protected", headers=headers)
+            headers = self.session.auth_headers()
+            response = requests.get(f"{BACKEND_URL}/protected", headers=headers)
             data = response.json()
             QMessageBox.information(self, "Protected Data", data.get("message", "No message"))
         except Exception as e:
@@ -186,18 +569,18 @@ class TaskDetailsPopup(QDialog):
         super().__init__(parent)
         self.setWindowFlag(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setFixedSize(350, 350)
+        self.setFixedSize(350, 450)
 
         container = QWidget(self)
         container.setObjectName("container")
-        container.setGeometry(0, 0, 350, 350)
+        container.setGeometry(0, 0, 350, 450)
 
         self.setStyleSheet("""
             #container {
                 background-color: #6b21a8;
                 border-radius: 15px;
             }
-            QLineEdit, QTextEdit {
+            QLineEdit, QTextEdit, QListWidget {
                 background-color: #7c3aed;
                 color: #ffffff;
                 border: 1px solid #a855f7;
@@ -267,11 +650,24 @@ class TaskDetailsPopup(QDialog):
 
         self.description_input = QTextEdit(self.task.description, self)
 
+        self.blocked_by_input = QListWidget(self)
+        self.blocked_by_input.setMaximumHeight(90)
+        window = self.task.kanban_window
+        for column in window.columns:
+            for other in window.tasks_in(column):
+                if other is not self.task:
+                    item = QListWidgetItem(f"{other.title} ({column.title})")
+                    item.setData(Qt.ItemDataRole.UserRole, other.task_id)
+                    item.setCheckState(Qt.CheckState.Checked if other.task_id in self.task.blocked_by
+                                       else Qt.CheckState.Unchecked)
+                    self.blocked_by_input.addItem(item)
+
         layout.addRow("Title:", self.title_input)
         layout.addRow("Assignee:", self.assignee_input)
         layout.addRow("Start Date:", self.start_date_input)
         layout.addRow("End Date:", self.end_date_input)
         layout.addRow("Description:", self.description_input)
+        layout.addRow("Blocked By:", self.blocked_by_input)
 
         self.save_button = QPushButton("Save", self)
         self.save_button.clicked.connect(self.save_task_details)
@@ -282,6 +678,24 @@ class TaskDetailsPopup(QDialog):
     def save_task_details(self):
         changes = []
 
+        listed, blocked_by = set(), []
+        for i in range(self.blocked_by_input.count()):
+            item = self.blocked_by_input.item(i)
+            listed.add(item.data(Qt.ItemDataRole.UserRole))
+            if item.checkState() == Qt.CheckState.Checked:
+                blocked_by.append(item.data(Qt.ItemDataRole.UserRole))
+        blocked_by += [blocker for blocker in self.task.blocked_by if blocker not in listed]  #archived blockers
+        if set(blocked_by) != set(self.task.blocked_by):
+            window = self.task.kanban_window
+            try:
+                window.dependencies.set_blockers(self.task.task_id, blocked_by)
+            except CycleError as e:
+                titles = {task.task_id: task.title for column in window.columns for task in window.tasks_in(column)}
+                QMessageBox.warning(self, "Circular Dependency",
+                                    "These links would form a cycle:\n" +
+                                    " blocks ".join(f"'{titles.get(task_id, task_id)}'" for task_id in e.path + e.path[:1]))
+                return
+
         if self.task.title != self.title_input.text():
             changes.append("Title")
         if self.task.assignee != self.assignee_input.text():
@@ -292,17 +706,21 @@ class TaskDetailsPopup(QDialog):
             changes.append("End Date")
         if self.task.description != self.description_input.toPlainText():
             changes.append("Description")
+        if set(self.task.blocked_by) != set(blocked_by):
+            changes.append("Blocked By")
 
         self.task.title = self.title_input.text()
         self.task.assignee = self.assignee_input.text()
         self.task.start_date = self.start_date_input.date()
         self.task.end_date = self.end_date_input.date()
         self.task.description = self.description_input.toPlainText()
+        self.task.blocked_by = blocked_by
 
         self.task.setText(self.task.title)
         self.task.update_tooltip()
 
         if changes:
+            self.task.kanban_window.task_changed(self.task)
             if hasattr(self.task.kanban_window, "append_log_entry"):
                 self.task.kanban_window.append_log_entry(
                     "Task Edited",
@@ -316,22 +734,26 @@ class Task(QLabel):
     def __init__(self, text, kanban_window, parent=None):
         super().__init__(text, parent)
         self.kanban_window = kanban_window
-        self.setStyleSheet("""
-            QLabel {
-                background-color: #7c3aed;
-                border: 2px solid #a855f7;
-                border-radius: 8px;
-                padding: 12px;
-                font-size: 14px;
-                font-family: "Segoe UI", "Roboto", sans-serif;
-                color: #ffffff;
-                transition: all 0.3s ease-in-out;
-            }
-            QLabel:hover {
-                background-color: #9333ea;
-                border-color: #c084fc;
-            }
-        """)
+        with tracer.span("Task.setStyleSheet"):
+            self.setStyleSheet("""
+                QLabel {
+                    background-color: #7c3aed;
+                    border: 2px solid #a855f7;
+                    border-radius: 8px;
+                    padding: 12px;
+                    font-size: 14px;
+                    font-family: "Segoe UI", "Roboto", sans-serif;
+                    color: #ffffff;
+                    transition: all 0.3s ease-in-out;
+                }
+                QLabel:hover {
+                    background-color: #9333ea;
+                    border-color: #c084fc;
+                }
+                QLabel[blocked="true"] {
+                    border: 2px dashed #f97316;
+                }
+            """)
         self.setMinimumHeight(50)
         self.setMaximumHeight(50)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
@@ -341,6 +763,9 @@ class Task(QLabel):
         self.start_date = QDate.currentDate()
         self.end_date = QDate.currentDate()
         self.description = ""
+        self.task_id = uuid.uuid4().hex
+        self.blocked_by = []  #ids of tasks this one waits for
+        self.open_blockers = []  #titles of those that are not done yet
         self.update_tooltip()
 
         self.dragging = False
@@ -401,6 +826,8 @@ class Task(QLabel):
                 days_remaining = f"\nDays Remaining: {days_left} days"
             else:
                 days_remaining = f"\nTask overdue by {-days_left} days!"
+        if self.open_blockers:
+            days_remaining += f"\nBlocked by: {', '.join(self.open_blockers)}"
 
         self.setToolTip(
             f"Title: {self.title}\n"
@@ -411,10 +838,22 @@ class Task(QLabel):
             f"Description: {self.description}"
         )
 
+    def set_blocked(self, open_blockers):
+        if open_blockers == self.open_blockers:
+            return
+        was_blocked = bool(self.open_blockers)
+        self.open_blockers = open_blockers
+        if bool(open_blockers) != was_blocked:
+            self.setProperty("blocked", bool(open_blockers))
+            self.style().unpolish(self)
+            self.style().polish(self)
+        self.update_tooltip()
+
     def delete_task(self):
         try:
             parent_widget = self.parent()
-            self.kanban_window.append_log_entry("Task Deleted", f"'{self.title}' deleted")
+            self.kanban_window.append_log_entry("Task Deleted", f"'{self.title}' deleted [id {self.task_id}]")
+            self.kanban_window.task_changed(self, deleted=True)
 
             parent_layout = parent_widget.layout()
             if parent_layout:
@@ -438,18 +877,33 @@ class Task(QLabel):
             print(f"Error deleting task: {e}")
 
     def to_xml(self):
-        task_element = Element("task")
+        from xml.etree.ElementTree import Element, SubElement
+        task_element = Element("task", id=self.task_id)
         SubElement(task_element, "title").text = self.title
         SubElement(task_element, "assignee").text = self.assignee
         SubElement(task_element, "start_date").text = self.start_date.toString("yyyy-MM-dd")
         SubElement(task_element, "end_date").text = self.end_date.toString("yyyy-MM-dd")
         SubElement(task_element, "description").text = self.description
+        SubElement(task_element, "blocked_by").text = " ".join(self.blocked_by)
         return task_element
 
+    def to_dict(self):
+        return {
+            "id": self.task_id,
+            "title": self.title,
+            "assignee": self.assignee,
+            "start_date": self.start_date.toString("yyyy-MM-dd"),
+            "end_date": self.end_date.toString("yyyy-MM-dd"),
+            "description": self.description,
+            "blocked_by": " ".join(self.blocked_by),
+        }
+
     @classmethod
+    @tracer.trace("Task.from_xml")
     def from_xml(cls, xml_element, kanban_window, parent=None):
         title = xml_element.find("title").text
         task = cls(title, kanban_window, parent)
+        task.task_id = xml_element.get("id") or task.task_id
         task.assignee = xml_element.find("assignee").text
         start_date_str = xml_element.find("start_date").text
         if start_date_str:
@@ -458,6 +912,21 @@ class Task(QLabel):
         if end_date_element is not None and end_date_element.text:
             task.end_date = QDate.fromString(end_date_element.text, "yyyy-MM-dd")
         task.description = xml_element.find("description").text
+        task.blocked_by = parse_blockers(xml_element.findtext("blocked_by"))
+        task.update_tooltip()
+        return task
+
+    @classmethod
+    def from_dict(cls, record, kanban_window, parent=None):
+        task = cls(record["title"], kanban_window, parent)
+        task.task_id = record.get("id") or task.task_id
+        task.assignee = record.get("assignee", "")
+        if record.get("start_date"):
+            task.start_date = QDate.fromString(record["start_date"], "yyyy-MM-dd")
+        if record.get("end_date"):
+            task.end_date = QDate.fromString(record["end_date"], "yyyy-MM-dd")
+        task.description = record.get("description", "")
+        task.blocked_by = parse_blockers(record.get("blocked_by"))
         task.update_tooltip()
         return task
 
@@ -469,62 +938,63 @@ class Column(QFrame):
         self.title = title
         self.wip_limit = 0
 
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #581c87;
-                border: 2px solid #6b21a8;
-                border-radius: 8px;
-                padding: 4px;
-            }
-            QFrame:hover {
-                border: 2px solid #7e22ce;
-            }
-            QLabel {
-                color: #E0E0E0;
-            }
-            QScrollBar:vertical {
-                background: #f1f1f1;
-                width: 10px;
-            }
-            QScrollBar::handle:vertical {
-                background: #bdc3c7;
-                min-height: 20px;
-                border-radius: 5px;
-            }
-            QPushButton {
-                background-color: #6b21a8;
-                color: #E0E0E0;
-                border: 2px outset #7e22ce;
-                border-radius: 4px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #7e22ce;
-                border: 2px inset #9333ea;
-            }
-            #wip-label {
-                background-color: #581c87;
-                color: #E0E0E0;
-                font-weight: bold;
-                padding: 2px 6px;
-                border-radius: 4px;
-            }
-            QLineEdit {
-                background-color: #6b21a8;
-                color: #E0E0E0;
-                border: 1px solid #7e22ce;
-                border-radius: 4px;
-                padding: 5px;
-            }
-            QTextEdit {
-                background-color: #6b21a8;
-                color: #E0E0E0;
-                border: 1px solid #7e22ce;
-                border-radius: 4px;
-                padding: 5px;
-            }
-        """)
+        with tracer.span("Column.setStyleSheet"):
+            self.setStyleSheet("""
+                QFrame {
+                    background-color: #581c87;
+                    border: 2px solid #6b21a8;
+                    border-radius: 8px;
+                    padding: 4px;
+                }
+                QFrame:hover {
+                    border: 2px solid #7e22ce;
+                }
+                QLabel {
+                    color: #E0E0E0;
+                }
+                QScrollBar:vertical {
+                    background: #f1f1f1;
+                    width: 10px;
+                }
+                QScrollBar::handle:vertical {
+                    background: #bdc3c7;
+                    min-height: 20px;
+                    border-radius: 5px;
+                }
+                QPushButton {
+                    background-color: #6b21a8;
+                    color: #E0E0E0;
+                    border: 2px outset #7e22ce;
+                    border-radius: 4px;
+                    font-size: 14px;
+                    font-weight: bold;
+                }
+                QPushButton:hover {
+                    background-color: #7e22ce;
+                    border: 2px inset #9333ea;
+                }
+                #wip-label {
+                    background-color: #581c87;
+                    color: #E0E0E0;
+                    font-weight: bold;
+                    padding: 2px 6px;
+                    border-radius: 4px;
+                }
+                QLineEdit {
+                    background-color: #6b21a8;
+                    color: #E0E0E0;
+                    border: 1px solid #7e22ce;
+                    border-radius: 4px;
+                    padding: 5px;
+                }
+                QTextEdit {
+                    background-color: #6b21a8;
+                    color: #E0E0E0;
+                    border: 1px solid #7e22ce;
+                    border-radius: 4px;
+                    padding: 5px;
+                }
+            """)
 
         self.layout = QVBoxLayout(self)
         self.layout.setAlignment(Qt.AlignmentFlag.AlignTop)
@@ -543,6 +1013,11 @@ class Column(QFrame):
         self.header_layout.addWidget(self.label)
         self.label.mouseDoubleClickEvent = self.label_double_clicked
 
+        self.filter_label = QLabel("", self)  #"shown/total" while the board is filtered
+        self.filter_label.setStyleSheet("font-size: 12px; color: #E0E0E0;")
+        self.filter_label.hide()
+        self.header_layout.addWidget(self.filter_label)
+
         self.control_layout = QHBoxLayout()
         self.control_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -642,6 +1117,7 @@ class Column(QFrame):
         ok_button.clicked.connect(on_ok)
         dialog.exec()
 
+    @tracer.trace("Column.update_wip_display")
     def update_wip_display(self):
         task_count = self.get_task_count()
         if self.parent_board.is_Admin:
@@ -667,19 +1143,23 @@ class Column(QFrame):
                 self.wip_label.hide()
 
     def get_task_count(self):
-        count = 0
-        for i in range(self.task_container.layout().count()):
-            widget = self.task_container.layout().itemAt(i).widget()
-            if isinstance(widget, Task):
-                count += 1
-        return count
+        return self.parent_board.task_index.count(self)
+
+    def update_filter_count(self, matches):
+        if matches is None:
+            self.filter_label.hide()
+            return
+        self.filter_label.setText(f"{len(self.parent_board.task_index.in_column(self) & matches)}/{self.get_task_count()}")
+        self.filter_label.show()
 
+    @tracer.trace("Column.remove_task")
     def remove_task(self, task):
             layout = self.task_container.layout()
             if layout.indexOf(task) != -1:
                 layout.removeWidget(task)
                 task.setParent(None)
                 task.column = None
+                self.parent_board.task_index.place(task.task_id, None)
                 layout.update()
                 self.task_container.update()
                 self.update()
@@ -759,6 +1239,7 @@ class Column(QFrame):
             self.parent_board.remove_column(self)
             self.parent_board.append_log_entry("Column Deleted", f"'{self.title}' column deleted")
 
+    @tracer.trace("Column.add_task")
     def add_task(self, task):
         if self.wip_limit > 0 and self.get_task_count() >= self.wip_limit:
             return False
@@ -766,9 +1247,24 @@ class Column(QFrame):
         self.task_container.layout().addWidget(task)
         task.setParent(self.task_container)
         task.column = self
+        self.parent_board.task_index.place(task.task_id, self)
         self.update_wip_display()
         return True
 
+    def add_tasks(self, tasks):
+        #batch insert for imports: one WIP check and one display update for the whole batch
+        layout = self.task_container.layout()
+        for task in tasks:
+            layout.addWidget(task)
+            task.column = self
+            self.parent_board.task_index.place(task.task_id, self)
+        self.update_wip_display()
+
+    def free_slots(self):
+        if self.wip_limit > 0:
+            return max(self.wip_limit - self.get_task_count(), 0)
+        return None
+
     def get_task_position(self, task):
         for i in range(self.task_container.layout().count()):
             if self.task_container.layout().itemAt(i).widget() == task:
@@ -776,8 +1272,53 @@ class Column(QFrame):
         return -1
 
 
+class ProfilerOverlay(QLabel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setStyleSheet("""
+            QLabel {
+                background-color: rgba(0, 0, 0, 190);
+                color: #a7f3d0;
+                font-family: "Consolas", "Courier New", monospace;
+                font-size: 11px;
+                padding: 8px;
+                border-radius: 6px;
+            }
+        """)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.move(20, 20)
+        self.was_enabled = tracer.enabled
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        #showing the overlay switches tracing on; hiding it restores the previous state
+        if not self.isHidden():
+            self.refresh_timer.stop()
+            tracer.enabled = self.was_enabled
+            self.hide()
+        else:
+            self.was_enabled = tracer.enabled
+            tracer.enabled = True
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.refresh_timer.start(500)
+
+    def refresh(self):
+        lines = [f"{'operation':<32}{'n':>6}{'p50 ms':>9}{'p99 ms':>9}"]
+        for name, stats in sorted(tracer.stats().items(), key=lambda item: -item[1]["p99_ms"]):
+            lines.append(f"{name[:31]:<32}{stats['count']:>6}{stats['p50_ms']:>9.2f}{stats['p99_ms']:>9.2f}")
+        if len(lines) == 1:
+            lines.append("no spans recorded yet")
+        lines.append("Ctrl+Shift+E: export Chrome trace")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+
+
 class KanbanWindow(QMainWindow):
-    def __init__(self, user_name="", is_Admin=False):
+    def __init__(self, user_name="", is_Admin=False, auth_session=None):
         super().__init__()
         self.setWindowTitle("Kanban Board")
         self.setWindowFlag(Qt.WindowType.FramelessWindowHint)
@@ -786,7 +1327,7 @@ class KanbanWindow(QMainWindow):
 
         self.user_name = user_name
         self.is_Admin = is_Admin
-        self.filename = f"{self.user_name}.xml"
+        self.auth_session = auth_session
         self.task_counter = 0
         self.max_tasks = 50
         self.columns = []
@@ -810,6 +1351,42 @@ class KanbanWindow(QMainWindow):
         """
 
         self.main_layout = QVBoxLayout()
+        self.board_tabs = QTabBar(self)
+        self.board_tabs.setExpanding(False)
+        self.board_tabs.setStyleSheet("""
+            QTabBar::tab {
+                background-color: #ede9fe;
+                color: #6b21a8;
+                border-radius: 6px;
+                padding: 6px 14px;
+                margin-right: 4px;
+                font-weight: bold;
+            }
+            QTabBar::tab:selected {
+                background-color: #6b21a8;
+                color: white;
+            }
+        """)
+        self.board_tabs.tabBarClicked.connect(self.on_board_tab_clicked)
+        self.main_layout.addWidget(self.board_tabs)
+
+        filter_layout = QHBoxLayout()
+        self.filter_input = QLineEdit(self)
+        self.filter_input.setPlaceholderText("Filter by title...")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.textChanged.connect(lambda _: self.apply_filter())
+        filter_layout.addWidget(self.filter_input)
+        self.assignee_filter = QComboBox(self)
+        self.assignee_filter.addItem("All assignees")
+        self.assignee_filter.currentIndexChanged.connect(lambda _: self.apply_filter())
+        self.assignee_filter.showPopup = self.show_assignee_filter
+        filter_layout.addWidget(self.assignee_filter)
+        self.due_filter = QComboBox(self)
+        self.due_filter.addItems(["Any due date", "Overdue", "Due today", "Due this week", "Due later"])
+        self.due_filter.currentIndexChanged.connect(lambda _: self.apply_filter())
+        filter_layout.addWidget(self.due_filter)
+        self.main_layout.addLayout(filter_layout)
+
         self.add_column_button = QPushButton("Add Column")
         self.add_column_button.setVisible(self.is_Admin)
         self.add_column_button.clicked.connect(self.add_column)
@@ -834,6 +1411,12 @@ class KanbanWindow(QMainWindow):
             self.add_task_button.setStyleSheet(self.button_style)
             bottom_layout.addWidget(self.add_task_button)
 
+            self.import_button = QPushButton("Import", self)
+            self.import_button.setFont(QFont("Arial", 16))
+            self.import_button.clicked.connect(self.import_tasks)
+            self.import_button.setStyleSheet(self.button_style)
+            bottom_layout.addWidget(self.import_button)
+
         role = "Admin" if self.is_Admin else "User"
         self.user_label = QLabel(f"Role: {role}\nProject: {self.user_name}", self)
         self.user_label.setStyleSheet("font-size: 16px; font-weight: bold;")
@@ -845,8 +1428,36 @@ class KanbanWindow(QMainWindow):
         self.task_counter_label.setStyleSheet("font-size: 16px; font-weight: bold;")
         bottom_layout.addWidget(self.task_counter_label)
 
+        self.sync_label = QLabel("", self)
+        self.sync_label.setStyleSheet("font-size: 12px; color: #6b21a8;")
+        self.sync_label.setVisible(SYNC_ENABLED)
+        bottom_layout.addWidget(self.sync_label)
+
+        self.reminder_label = QLabel("", self)
+        self.reminder_label.setStyleSheet("font-size: 12px; font-weight: bold; color: #b91c1c;")
+        self.reminder_label.hide()
+        bottom_layout.addWidget(self.reminder_label)
+
         bottom_layout.addStretch()
 
+        self.stats_button = QPushButton("Stats", self)
+        self.stats_button.setFont(QFont("Arial", 16))
+        self.stats_button.clicked.connect(self.open_stats)
+        self.stats_button.setStyleSheet(self.button_style)
+        bottom_layout.addWidget(self.stats_button)
+
+        self.archive_button = QPushButton("Archive", self)
+        self.archive_button.setFont(QFont("Arial", 16))
+        self.archive_button.clicked.connect(self.open_archive)
+        self.archive_button.setStyleSheet(self.button_style)
+        bottom_layout.addWidget(self.archive_button)
+
+        self.export_button = QPushButton("Export", self)
+        self.export_button.setFont(QFont("Arial", 16))
+        self.export_button.clicked.connect(self.export_tasks)
+        self.export_button.setStyleSheet(self.button_style)
+        bottom_layout.addWidget(self.export_button)
+
         self.main_menu_button = QPushButton("Home", self)
         self.main_menu_button.setFont(QFont("Arial", 16))
         self.main_menu_button.clicked.connect(self.open_main_menu)
@@ -866,8 +1477,41 @@ class KanbanWindow(QMainWindow):
         self.setCentralWidget(container)
         self.setStyleSheet("background-color: white;")
 
+        self.profiler_overlay = ProfilerOverlay(self)
+        QShortcut(QKeySequence("Ctrl+Shift+P"), self, self.profiler_overlay.toggle)
+        QShortcut(QKeySequence("Ctrl+Shift+E"), self, self.export_trace)
+
+        self.autosave = AutosaveWriter(self.user_name) if self.user_name else None
+        self.sync = BoardSync(self.user_name, self.auth_session) if SYNC_ENABLED and self.user_name else None
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave_now)
+
+        get_reminder_scheduler().reminder_fired.connect(self.show_reminder)
+        self.dependencies = DependencyGraph()
+        self.task_index = TaskIndex()
+        self.task_widgets = {}
+        self.hidden_tasks = set()
         self.load_from_xml()
 
+        if self.sync:
+            self.sync.submit(self.board_state())  #picks up edits made while sync was off
+            self.sync_timer = QTimer(self)
+            self.sync_timer.timeout.connect(lambda: self.sync_label.setText(self.sync.status))
+            self.sync_timer.start(1000)
+
+    def export_trace(self):
+        save_path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "kanban_trace.json",
+                                                   "Chrome Trace (*.json);;All Files (*)")
+        if save_path:
+            try:
+                count = tracer.export_chrome_trace(save_path)
+                QMessageBox.information(self, "Trace Exported",
+                                        f"{count} spans written to:\n{save_path}\nOpen it in chrome://tracing")
+            except OSError as e:
+                QMessageBox.warning(self, "Error", f"Failed to export trace: {e}")
+
     def round_window(self, radius=20):
         path = QPainterPath()
         path.addRoundedRect(QRectF(0, 0, self.width(), self.height()), radius, radius)
@@ -877,6 +1521,51 @@ class KanbanWindow(QMainWindow):
     def showEvent(self, event):
         super().showEvent(event)
         self.center_window()
+        self.refresh_board_tabs()
+
+    def refresh_board_tabs(self):
+        #the current board first, then the cached boards from most to least recently used
+        while self.board_tabs.count():
+            self.board_tabs.removeTab(0)
+        for project_name, is_Admin in [(self.user_name, self.is_Admin)] + board_cache.names():
+            index = self.board_tabs.addTab(project_name if is_Admin == self.is_Admin
+                                           else f"{project_name} ({'Admin' if is_Admin else 'User'})")
+            self.board_tabs.setTabData(index, (project_name, is_Admin))
+        self.board_tabs.setCurrentIndex(0)
+        self.board_tabs.setVisible(self.board_tabs.count() > 1)
+
+    def on_board_tab_clicked(self, index):
+        if index > 0:
+            self.switch_board(*self.board_tabs.tabData(index))
+
+    def switch_board(self, project_name, is_Admin):
+        self.save_to_xml()
+        window = board_cache.take(project_name, is_Admin) or KanbanWindow(project_name, is_Admin, self.auth_session)
+        window.set_auth_session(self.auth_session)
+        self.hide()
+        board_cache.put(self)
+        window.show()
+
+    def show_reminder(self, project_name, task_id, message):
+        if project_name != self.user_name:
+            return
+        for column in self.columns:
+            for task in self.tasks_in(column):
+                if task.task_id == task_id:
+                    task.update_tooltip()
+        self.reminder_label.setText(message)
+        self.reminder_label.show()
+
+    def set_auth_session(self, auth_session):
+        self.auth_session = auth_session
+        if self.sync:
+            self.sync.auth_session = auth_session
+
+    def current_board_mtime(self):
+        try:
+            return os.stat(board_path(self.user_name)).st_mtime
+        except OSError:
+            return None
 
     def center_window(self):
         screen = QApplication.primaryScreen()
@@ -890,20 +1579,35 @@ class KanbanWindow(QMainWindow):
         self.task_counter -= 1
         self.task_counter_label.setText(f"Tasks: {self.task_counter}/50")
 
+    @tracer.trace("KanbanWindow.append_log_entry")
     def append_log_entry(self, action, details):
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_folder = "Project Files"
-        if not os.path.exists(log_folder):
-            os.makedirs(log_folder)
-
-        log_path = os.path.join(log_folder, f"Log_{self.user_name}.csv")
-        is_new_file = not os.path.exists(log_path)
-
-        with open(log_path, "a", encoding="utf-8") as f:
-            if is_new_file:
-                f.write("timestamp,action,details\n")
-            f.write(f"{timestamp},{action},{details}\n")
+        append_log_line(log_path(self.user_name), format_log_line(timestamp, action, details))
+        self.schedule_autosave()
+
+    def schedule_autosave(self):
+        #every board edit is logged, so each log entry restarts the coalescing timer
+        if self.autosave:
+            self.autosave_timer.start()
+
+    @tracer.trace("KanbanWindow.autosave_now")
+    def autosave_now(self):
+        #the snapshot is plain dicts and strings, so the workers never touch widgets
+        board = self.board_state()
+        self.autosave.submit(board)
+        if self.sync:
+            self.sync.submit(board)
+
+    def closeEvent(self, event):
+        self.autosave_timer.stop()
+        if self.user_name:
+            get_reminder_scheduler().forget_project(self.user_name)
+        if self.autosave:
+            self.autosave.close()
+        if self.sync:
+            self.sync.close()
+        super().closeEvent(event)
 
     def add_column(self, title=None):
         if not title or not isinstance(title, str):
@@ -923,11 +1627,14 @@ class KanbanWindow(QMainWindow):
                          if isinstance(task_layout.itemAt(i).widget(), Task))
         self.task_counter -= task_count
         self.task_counter_label.setText(f"Tasks: {self.task_counter}/50")
+        for task in self.tasks_in(column):
+            self.task_changed(task, deleted=True)
         self.columns.remove(column)
         column.setParent(None)
         self.rearrange_columns()
         self.append_log_entry("Column Removed", f"'{column.title}' column removed")
 
+    @tracer.trace("KanbanWindow.rearrange_columns")
     def rearrange_columns(self):
         for i in reversed(range(self.board_layout.count())):
             self.board_layout.itemAt(i).widget().setParent(None)
@@ -953,18 +1660,21 @@ class KanbanWindow(QMainWindow):
         super().resizeEvent(event)
         self.adjust_column_sizes()
 
+    @tracer.trace("KanbanWindow.create_task")
     def create_task(self):
         if self.task_counter >= self.max_tasks:
             return
         to_do_column = next((col for col in self.columns if col.title == "To Do"), None)
         if to_do_column:
             task = Task(f"Task {self.task_counter + 1}", self, to_do_column.task_container)
-            self.append_log_entry("Task Created", f"'{task.title}' in column '{to_do_column.title}'")
+            self.append_log_entry("Task Created", f"'{task.title}' in column '{to_do_column.title}' [id {task.task_id}]")
             to_do_column.add_task(task)
+            self.task_changed(task)
             self.task_counter += 1
             self.task_counter_label.setText(f"Tasks: {self.task_counter}/50")
             to_do_column.update_wip_display()
 
+    @tracer.trace("KanbanWindow.snap_to_column")
     def snap_to_column(self, task):
             original_column = task.column
             original_index = -1
@@ -983,18 +1693,27 @@ class KanbanWindow(QMainWindow):
                     closest_column = column
                     break
 
+            if closest_column and closest_column != original_column and task.open_blockers and original_column \
+                    and self.columns.index(closest_column) > self.columns.index(original_column):
+                QMessageBox.warning(self, "Task Blocked",
+                                    f"'{task.title}' is blocked by {', '.join(task.open_blockers)}.")
+                closest_column = None
+
             if closest_column and closest_column != original_column:
                 if original_column:
                     original_column.remove_task(task)
 
                 if closest_column.add_task(task):
-                    self.append_log_entry("Task Moved", f"'{task.title}' moved to '{closest_column.title}'")
+                    self.append_log_entry("Task Moved",
+                                          f"'{task.title}' moved to '{closest_column.title}' [id {task.task_id}]")
+                    self.task_changed(task)
                     return True
                 else:
                     if original_column:
                        original_column.task_container.layout().insertWidget(original_index, task)
                        task.setParent(original_column.task_container)
                        task.column = original_column
+                       self.task_index.place(task.task_id, original_column)
                        task.show()
                        original_column.update_wip_display()
                     return False
@@ -1003,38 +1722,228 @@ class KanbanWindow(QMainWindow):
                 original_column.task_container.layout().insertWidget(original_index, task)
                 task.setParent(original_column.task_container)
                 task.column = original_column
+                self.task_index.place(task.task_id, original_column)
                 task.show()
                 original_column.update_wip_display()
 
             return False
 
+    @tracer.trace("KanbanWindow.save_to_xml")
     def save_to_xml(self):
         if not self.user_name:
             return
-        folder_path = "Project Files"
-        os.makedirs(folder_path, exist_ok=True)
-        file_path = os.path.join(folder_path, f"{self.user_name}.xml")
-        root = ET.Element("kanban_board")
+        self.autosave_timer.stop()
+        if self.autosave:
+            self.autosave.cancel()
+        import xml.etree.ElementTree as ET
+        import xml.dom.minidom
+        os.makedirs(PROJECTS_FOLDER, exist_ok=True)
+        file_path = board_path(self.user_name)
+        self.board_version += 1
+        root = ET.Element("kanban_board", version=str(self.board_version))
+        task_count = 0
         for column in self.columns:
             column_element = ET.SubElement(root, "column", name=column.title, wip_limit=str(column.wip_limit))
             for i in range(column.task_container.layout().count()):
                 task_widget = column.task_container.layout().itemAt(i).widget()
                 if isinstance(task_widget, Task):
                     column_element.append(task_widget.to_xml())
+                    task_count += 1
         rough_string = ET.tostring(root, 'utf-8')
         reparsed = xml.dom.minidom.parseString(rough_string)
         pretty_xml_as_string = reparsed.toprettyxml(indent="  ")
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(pretty_xml_as_string)
+        with file_lock(file_path):
+            write_project_file(file_path, pretty_xml_as_string)
+        self.board_mtime = self.current_board_mtime()
+        discard_autosave(self.user_name)
+        get_project_catalog(refresh=False).record_save(self.user_name, len(self.columns), task_count)
+        board = self.board_state()
+        if self.sync:
+            self.sync.submit(board)
+        try:
+            get_search_index(refresh=False).index_project(self.user_name, board, os.stat(file_path).st_mtime)
+        except Exception as e:
+            print(f"Error updating search index: {e}")
+
+    def tasks_in(self, column):
+        layout = column.task_container.layout()
+        return [layout.itemAt(i).widget() for i in range(layout.count())
+                if isinstance(layout.itemAt(i).widget(), Task)]
+
+    def board_state(self):
+        return {"columns": [{"name": column.title, "wip_limit": column.wip_limit,
+                             "tasks": [task.to_dict() for task in self.tasks_in(column)]}
+                            for column in self.columns]}
+
+    def task_changed(self, task, deleted=False):
+        self.update_search_index(task, deleted)
+        self.update_dependencies(task, deleted)
+        self.update_task_index(task, deleted)
+        if self.user_name:
+            column = getattr(task, "column", None)
+            if deleted:
+                get_reminder_scheduler().unschedule(self.user_name, task.task_id)
+            else:
+                get_reminder_scheduler().schedule(self.user_name, task.task_id, task.title,
+                                                  task.end_date.toString("yyyy-MM-dd"),
+                                                  column.title if column else "")
+
+    def update_dependencies(self, task, deleted=False):
+        linked = bool(task.blocked_by or task.open_blockers or self.dependencies.dependents.get(task.task_id))
+        if deleted:
+            self.dependencies.remove_task(task.task_id)
+        elif task.task_id not in self.dependencies:
+            self.dependencies.add_task(task.task_id, task.start_date.toString("yyyy-MM-dd"),
+                                       task.end_date.toString("yyyy-MM-dd"))
+            try:
+                self.dependencies.set_blockers(task.task_id, task.blocked_by)
+            except CycleError:
+                task.blocked_by = []
+            linked = linked or bool(self.dependencies.dependents[task.task_id])
+        else:
+            self.dependencies.set_dates(task.task_id, task.start_date.toString("yyyy-MM-dd"),
+                                        task.end_date.toString("yyyy-MM-dd"))
+        #tasks without links cannot change anyone's blocked state, which keeps edits on large boards O(log n)
+        if linked:
+            self.refresh_blocked()
+
+    def update_task_index(self, task, deleted=False):
+        if deleted:
+            self.task_index.remove(task.task_id)
+            self.task_widgets.pop(task.task_id, None)
+            self.hidden_tasks.discard(task.task_id)
+        else:
+            self.task_index.update(task.task_id, task.title, task.assignee, task.end_date.toString("yyyy-MM-dd"))
+            self.task_widgets[task.task_id] = task
+        if self.filter_active():
+            self.apply_filter()
+
+    def rebuild_task_index(self):
+        self.task_index = TaskIndex()
+        self.task_widgets = {}
+        for column in self.columns:
+            for task in self.tasks_in(column):
+                self.task_index.update(task.task_id, task.title, task.assignee, task.end_date.toString("yyyy-MM-dd"))
+                self.task_index.place(task.task_id, column)
+                self.task_widgets[task.task_id] = task
+        self.hidden_tasks = set()
+        self.apply_filter()
+
+    def filter_active(self):
+        return bool(self.filter_input.text().strip()) or self.assignee_filter.currentIndex() > 0 \
+            or self.due_filter.currentIndex() > 0
+
+    def due_range(self):
+        today = QDate.currentDate()
+        ranges = {
+            "Overdue": (None, today.addDays(-1)),
+            "Due today": (today, today),
+            "Due this week": (today, today.addDays(6)),
+            "Due later": (today.addDays(7), None),
+        }
+        low, high = ranges.get(self.due_filter.currentText(), (None, None))
+        return (low.toString("yyyy-MM-dd") if low else None), (high.toString("yyyy-MM-dd") if high else None)
+
+    @tracer.trace("KanbanWindow.apply_filter")
+    def apply_filter(self):
+        #only cards whose visibility changes are touched, so a keystroke costs the size of the
+        #matching index sets rather than a walk over every column
+        if self.filter_active():
+            due_from, due_to = self.due_range()
+            matches = self.task_index.match(
+                self.filter_input.text(),
+                self.assignee_filter.currentText() if self.assignee_filter.currentIndex() > 0 else None,
+                due_from, due_to)
+            if matches is None:
+                matches = set(self.task_widgets)  #the due filter is "Any" and the text has no words
+        else:
+            matches = None
+        hidden = set() if matches is None else self.task_widgets.keys() - matches
+        for task_id in hidden ^ self.hidden_tasks:
+            self.task_widgets[task_id].setVisible(task_id not in hidden)
+        self.hidden_tasks = hidden
+        for column in self.columns:
+            column.update_filter_count(matches)
+
+    def show_assignee_filter(self):
+        self.refresh_assignee_filter()
+        QComboBox.showPopup(self.assignee_filter)
+
+    def refresh_assignee_filter(self):
+        #the list is rebuilt when the popup opens, so edits never pay for it
+        current = self.assignee_filter.currentText() if self.assignee_filter.currentIndex() > 0 else None
+        self.assignee_filter.blockSignals(True)
+        self.assignee_filter.clear()
+        self.assignee_filter.addItem("All assignees")
+        self.assignee_filter.addItems(self.task_index.assignees())
+        if current is not None:
+            index = self.assignee_filter.findText(current)
+            self.assignee_filter.setCurrentIndex(index if index > 0 else 0)
+        self.assignee_filter.blockSignals(False)
+
+    def rebuild_dependencies(self):
+        def drop_link(task_id, blocker, error):
+            print(f"Ignoring blocked-by link {blocker} -> {task_id}: {error}")
+        self.dependencies = DependencyGraph.from_board(self.board_state(), on_error=drop_link)
+        self.refresh_blocked()
+
+    def refresh_blocked(self):
+        #a task is blocked while any task it waits for is on the board outside the Done column
+        tasks = {task.task_id: (task, column) for column in self.columns for task in self.tasks_in(column)}
+        for task, _ in tasks.values():
+            task.set_blocked([tasks[blocker][0].title for blocker in task.blocked_by
+                              if blocker in tasks and blocker in self.dependencies
+                              and tasks[blocker][1].title.lower() != DONE_COLUMN.lower()])
+
+    def critical_path(self):
+        #(days, titles) along the longest chain of blocked-by links, or None while there are no links
+        tasks = {task.task_id: task for column in self.columns for task in self.tasks_in(column)}
+        days, path = self.dependencies.critical_path()
+        if len(path) < 2:
+            return None
+        return days, [tasks[task_id].title for task_id in path if task_id in tasks]
+
+    def update_search_index(self, task, deleted=False):
+        if not self.user_name:
+            return
+        try:
+            index = get_search_index(refresh=False)
+            if deleted:
+                index.delete_task(task.task_id)
+            else:
+                column = getattr(task, "column", None)
+                index.upsert_task(self.user_name, task.task_id, column.title if column else "",
+                                  task.title, task.assignee, task.description)
+        except Exception as e:
+            print(f"Error updating search index: {e}")
 
+    @tracer.trace("KanbanWindow.load_from_xml")
     def load_from_xml(self):
+        import xml.etree.ElementTree as ET
+        stale = []
+        self.done_times = None
+        self.board_version = 0
         try:
             for column in self.columns[:]:
                 self.remove_column(column)
-            folder_path = "Project Files"
-            file_path = os.path.join(folder_path, self.filename)
-            tree = ET.parse(file_path)
+            file_path = board_path(self.user_name)
+            recovered_path = newer_autosave(self.user_name) if self.user_name else None
+            if recovered_path:
+                saved_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(os.stat(recovered_path).st_mtime))
+                answer = QMessageBox.question(
+                    self, "Recover Board",
+                    f"'{self.user_name}' has unsaved changes autosaved at {saved_at}.\nRecover them?")
+                if answer == QMessageBox.StandardButton.Yes:
+                    file_path = recovered_path
+                else:
+                    discard_autosave(self.user_name)
+            with open_project_file(file_path) as f:
+                tree = ET.parse(f)
             root = tree.getroot()
+            try:
+                self.board_version = int(root.get("version", "0"))
+            except ValueError:
+                self.board_version = 0
             for column_element in root.findall("column"):
                 column_name = column_element.get("name")
                 self.add_column(column_name)
@@ -1047,6 +1956,9 @@ class KanbanWindow(QMainWindow):
                     column.wip_limit = 0
                 column.wip_button.setVisible(self.is_Admin)
                 for task_element in column_element.findall("task"):
+                    if self.is_stale(column_name, task_element):
+                        stale.append(self.archive_record(column_name, task_element))
+                        continue
                     task = Task.from_xml(task_element, self, column.task_container)
                     column.add_task(task)
                     self.task_counter += 1
@@ -1057,6 +1969,180 @@ class KanbanWindow(QMainWindow):
                 column.wip_button.setVisible(self.is_Admin)
         except ET.ParseError as e:
             QMessageBox.critical(self, "XML Error", f"Error parsing XML file: {e}")
+        self.board_mtime = self.current_board_mtime()
+        if stale:
+            self.archive_tasks(stale)
+        self.rebuild_dependencies()
+        self.rebuild_task_index()
+        if self.user_name:
+            get_reminder_scheduler().track_board(self.user_name, self.board_state())
+        self.autosave_timer.stop()
+
+    def is_stale(self, column_name, task_element):
+        if ARCHIVE_AFTER_DAYS <= 0 or not self.user_name or (column_name or "").lower() != DONE_COLUMN.lower():
+            return False
+        if self.done_times is None:
+            #the flow metrics know when each task last entered Done; tasks without log history fall back to end_date
+            metrics = get_flow_metrics(self.user_name)
+            try:
+                metrics.update()
+            except Exception as e:
+                print(f"Error updating flow metrics: {e}")
+            #keyed by task id; tasks last moved before ids were logged are keyed by their title
+            self.done_times = {key: state[1] for key, state in metrics.tasks.items()
+                               if state[0].lower() == DONE_COLUMN.lower()}
+        done_at = self.done_times.get(task_element.get("id") or "")
+        if done_at is None:
+            done_at = self.done_times.get(task_element.findtext("title") or "")
+        if done_at is None:
+            end_date = QDate.fromString(task_element.findtext("end_date") or "", "yyyy-MM-dd")
+            if not end_date.isValid():
+                return False
+            return end_date.daysTo(QDate.currentDate()) > ARCHIVE_AFTER_DAYS
+        return time.time() - done_at > ARCHIVE_AFTER_DAYS * 86400
+
+    def archive_record(self, column_name, task_element):
+        record = {field: task_element.findtext(field) or "" for field in TASK_FIELDS}
+        record["id"] = task_element.get("id") or uuid.uuid4().hex
+        record["column"] = column_name
+        record["archived_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        return record
+
+    def archive_tasks(self, records):
+        #the archive is written before the board, so a crash in between can only duplicate, never lose, a task
+        try:
+            TaskArchive(self.user_name).append(records)
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Failed to archive tasks: {e}")
+            return
+        self.save_to_xml()
+        for record in records:
+            self.append_log_entry("Task Archived", f"'{record['title']}' archived [id {record['id']}]")
+
+    def open_archive(self):
+        dialog = ArchiveDialog(self)
+        dialog.exec()
+
+    def restore_tasks(self, task_ids):
+        on_board = {task.task_id for column in self.columns for task in self.tasks_in(column)}
+        columns = {column.title: column for column in self.columns}
+        fallback = columns.get("To Do") or (self.columns[0] if self.columns else None)
+        restored = 0
+        for record in TaskArchive(self.user_name).remove(task_ids):
+            column = columns.get(record.get("column"), fallback)
+            if record["id"] in on_board:
+                continue  #left over from an interrupted archive run
+            if column is None or self.task_counter >= self.max_tasks or column.free_slots() == 0:
+                TaskArchive(self.user_name).append([record])
+                continue
+            task = Task.from_dict(record, self, column.task_container)
+            column.add_task(task)
+            self.task_changed(task)
+            self.task_counter += 1
+            restored += 1
+            self.append_log_entry("Task Restored", f"'{task.title}' in column '{column.title}' [id {task.task_id}]")
+        self.task_counter_label.setText(f"Tasks: {self.task_counter}/50")
+        return restored
+
+    def open_stats(self):
+        dialog = BoardStatsDialog(self.user_name, self, self.critical_path())
+        dialog.exec()
+
+    def run_exchange_worker(self, worker, label):
+        progress = QProgressDialog(label, "Cancel", 0, 100, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        worker.progress.connect(progress.setValue)
+        worker.finished.connect(progress.close)
+        progress.canceled.connect(worker.requestInterruption)
+        self.exchange_worker = worker
+        worker.start()
+
+    def import_tasks(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Tasks", "",
+                                                   "Task Files (*.csv *.jsonl *.ndjson);;All Files (*)")
+        if not file_path:
+            return
+        worker = ImportWorker(file_path, self.max_tasks - self.task_counter, self)
+        worker.loaded.connect(lambda columns, records, skipped: self.apply_import(
+            columns, records, skipped, os.path.basename(file_path)))
+        worker.failed.connect(lambda message: QMessageBox.warning(self, "Error", f"Failed to import tasks: {message}"))
+        self.run_exchange_worker(worker, "Reading tasks...")
+
+    @tracer.trace("KanbanWindow.apply_import")
+    def apply_import(self, column_limits, records, skipped, source_name):
+        #every widget is created with updates off, then the board, counter, log and index are updated once
+        self.board_container.setUpdatesEnabled(False)
+        added = 0
+        try:
+            by_column = {}
+            new_ids = {}
+            for record in records:
+                by_column.setdefault(record["column"], []).append(record)
+                record["new_id"] = uuid.uuid4().hex
+                if record["id"]:
+                    new_ids.setdefault(record["id"], record["new_id"])
+            columns = {column.title: column for column in self.columns}
+            for name in list(column_limits) + list(by_column):
+                if name not in columns and len(self.columns) < 10:
+                    column = Column(name, self)
+                    column.wip_button.setVisible(self.is_Admin)
+                    self.columns.append(column)
+                    columns[name] = column
+            #limits from the file apply before its tasks are placed, so they cap the import too
+            for name, wip_limit in column_limits.items():
+                if name in columns and wip_limit is not None:
+                    columns[name].wip_limit = wip_limit
+                    columns[name].update_wip_display()
+
+            for name, column_records in by_column.items():
+                column = columns.get(name)
+                if column is None:
+                    skipped += len(column_records)
+                    continue
+                free = column.free_slots()
+                accepted = column_records if free is None else column_records[:free]
+                skipped += len(column_records) - len(accepted)
+                #imported tasks get fresh ids so copies never collide; links between them follow the new ids
+                column.add_tasks([Task.from_dict(dict(record, id=record["new_id"], blocked_by=" ".join(
+                    new_ids[blocker] for blocker in parse_blockers(record["blocked_by"]) if blocker in new_ids)),
+                    self, column.task_container) for record in accepted])
+                added += len(accepted)
+
+            self.rearrange_columns()
+        finally:
+            self.board_container.setUpdatesEnabled(True)
+
+        self.task_counter += added
+        self.task_counter_label.setText(f"Tasks: {self.task_counter}/50")
+        self.rebuild_dependencies()
+        self.rebuild_task_index()
+        self.append_log_entry("Tasks Imported", f"{added} tasks imported from '{source_name}'")
+        if self.user_name:
+            try:
+                file_path = board_path(self.user_name)
+                mtime = os.stat(file_path).st_mtime if os.path.exists(file_path) else 0
+                get_search_index(refresh=False).index_project(self.user_name, self.board_state(), mtime)
+            except Exception as e:
+                print(f"Error updating search index: {e}")
+            get_reminder_scheduler().track_board(self.user_name, self.board_state())
+
+        message = f"{added} tasks imported from {source_name}."
+        if skipped:
+            message += f"\n{skipped} tasks were skipped (task limit, WIP limits or column limit)."
+        QMessageBox.information(self, "Import Complete", message)
+
+    def export_tasks(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Tasks", f"{self.user_name or 'board'}.csv",
+                                                   "CSV Files (*.csv);;JSON Lines (*.jsonl);;All Files (*)")
+        if not file_path:
+            return
+        #the snapshot is taken on the GUI thread; the worker only serializes plain dicts
+        worker = ExportWorker(file_path, self.board_state(), self)
+        worker.exported.connect(lambda count: QMessageBox.information(
+            self, "Export Complete", f"{count} rows written to:\n{file_path}"))
+        worker.failed.connect(lambda message: QMessageBox.warning(self, "Error", f"Failed to export tasks: {message}"))
+        self.run_exchange_worker(worker, "Writing tasks...")
 
     def save_and_close(self):
         self.save_to_xml()
@@ -1064,11 +2150,381 @@ class KanbanWindow(QMainWindow):
 
     def open_main_menu(self):
         self.save_to_xml()
-        self.close()
-        self.main_menu = MainMenu()
+        self.hide()
+        board_cache.put(self)
+        self.main_menu = MainMenu(auth_session=self.auth_session)
         self.main_menu.show()
 
 
+class ImportWorker(QThread):
+    progress = pyqtSignal(int)
+    loaded = pyqtSignal(dict, list, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, capacity, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.capacity = max(capacity, 0)
+
+    def run(self):
+        #rows stream from disk; only column definitions and tasks that fit on the board are kept
+        import csv
+        try:
+            total = max(os.path.getsize(self.file_path), 1)
+            read = 0
+            column_limits = {}
+            records = []
+            skipped = 0
+
+            def on_progress(size):
+                nonlocal read
+                previous = read * 100 // total
+                read += size
+                if read * 100 // total != previous:
+                    self.progress.emit(read * 100 // total)
+
+            for record in iter_import_records(self.file_path, on_progress):
+                if self.isInterruptionRequested():
+                    return
+                if record["wip_limit"] is not None or record["column"] not in column_limits:
+                    column_limits[record["column"]] = record["wip_limit"]
+                if not record["title"]:
+                    continue
+                if len(records) < self.capacity:
+                    records.append(record)
+                else:
+                    skipped += 1
+            self.loaded.emit(column_limits, records, skipped)
+        except (OSError, csv.Error) as e:
+            self.failed.emit(str(e))
+
+
+class ExportWorker(QThread):
+    progress = pyqtSignal(int)
+    exported = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, board, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.board = board
+
+    def run(self):
+        total = max(sum(max(len(column["tasks"]), 1) for column in self.board["columns"]), 1)
+        try:
+            count = write_export(self.file_path, iter_board_records(self.board),
+                                 lambda written: self.progress.emit(written * 100 // total))
+            self.exported.emit(count)
+        except OSError as e:
+            self.failed.emit(str(e))
+
+
+class BackupWorker(QThread):
+    progress = pyqtSignal(int)
+    completed = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, projects=None, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.projects = projects
+
+    def on_progress(self, done, total):
+        percent = done * 100 // max(total, 1)
+        if percent != self.percent:
+            self.percent = percent
+            self.progress.emit(percent)
+
+    def run(self):
+        #the archive is written to a temp file next to the target, so a cancelled backup leaves nothing behind
+        self.percent = 0
+        try:
+            with atomic_open(self.file_path) as f:
+                count = write_backup(f, self.projects, self.on_progress, self.isInterruptionRequested)
+            self.completed.emit(count)
+        except BackupCancelled:
+            return
+        except (OSError, ValueError) as e:
+            self.failed.emit(str(e))
+
+
+class RestoreWorker(QThread):
+    progress = pyqtSignal(int)
+    restored = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+
+    def run(self):
+        import tarfile
+        try:
+            total = max(os.path.getsize(self.file_path), 1)
+            percent = 0
+
+            def on_progress(done):
+                nonlocal percent
+                if done * 100 // total != percent:
+                    percent = done * 100 // total
+                    self.progress.emit(percent)
+
+            with open(self.file_path, "rb") as f:
+                self.restored.emit(restore_backup(f, on_progress, self.isInterruptionRequested))
+        except BackupCancelled:
+            return
+        except (OSError, ValueError, tarfile.TarError) as e:
+            self.failed.emit(str(e))
+
+
+class ProjectOperationsWorker(QThread):
+    progress = pyqtSignal(int)
+    completed = pyqtSignal(list, list, list)
+
+    def __init__(self, operations, parent=None):
+        super().__init__(parent)
+        self.operations = operations
+
+    def run(self):
+        #a cancelled job still reports the operations it finished, so they can be recorded
+        total = max(len(self.operations), 1)
+        added, removed, errors = apply_project_operations(
+            self.operations, lambda count: self.progress.emit(count * 100 // total), self.isInterruptionRequested)
+        self.completed.emit(added, removed, errors)
+
+
+class ArchiveDialog(QDialog):
+    def __init__(self, kanban_window):
+        super().__init__(kanban_window)
+        self.kanban_window = kanban_window
+        self.archive = TaskArchive(kanban_window.user_name)
+        self.setWindowTitle(f"Archive: {kanban_window.user_name}")
+        self.setFixedSize(620, 480)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #6b21a8;
+            }
+            QLineEdit, QListWidget {
+                background-color: #7c3aed;
+                color: white;
+                border: 1px solid #a855f7;
+                border-radius: 6px;
+                padding: 4px;
+            }
+            QLabel {
+                color: white;
+            }
+            QPushButton {
+                background-color: #a855f7;
+                color: white;
+                border-radius: 6px;
+                padding: 6px;
+                font-weight: bold;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        self.query_input = QLineEdit(self)
+        self.query_input.setPlaceholderText("Search archived titles, assignees and descriptions")
+        self.query_input.textChanged.connect(self.run_search)
+        layout.addWidget(self.query_input)
+
+        self.status_label = QLabel("", self)
+        layout.addWidget(self.status_label)
+
+        self.results_list = QListWidget(self)
+        self.results_list.setUniformItemSizes(True)
+        self.results_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        layout.addWidget(self.results_list)
+
+        button_layout = QHBoxLayout()
+        self.restore_button = QPushButton("Restore Selected", self)
+        self.restore_button.setVisible(kanban_window.is_Admin)
+        self.restore_button.clicked.connect(self.restore_selected)
+        button_layout.addWidget(self.restore_button)
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.run_search("")
+
+    def run_search(self, text):
+        results = self.archive.search(text)
+        self.results_list.clear()
+        for record in results:
+            label = f"{record['title']}  —  {record.get('column', '')}, archived {record.get('archived_at', '')}"
+            if record.get("assignee"):
+                label += f"  ({record['assignee']})"
+            self.results_list.addItem(label)
+            self.results_list.item(self.results_list.count() - 1).setData(Qt.ItemDataRole.UserRole, record["id"])
+        self.status_label.setText(f"{len(results)} archived tasks")
+
+    def restore_selected(self):
+        task_ids = [item.data(Qt.ItemDataRole.UserRole) for item in self.results_list.selectedItems()]
+        if not task_ids:
+            return
+        restored = self.kanban_window.restore_tasks(task_ids)
+        if restored < len(task_ids):
+            QMessageBox.warning(self, "Restore",
+                                f"{restored} of {len(task_ids)} tasks restored; the rest did not fit on the board.")
+        self.run_search(self.query_input.text())
+
+
+class BoardStatsDialog(QDialog):
+    def __init__(self, project_name, parent=None, critical_path=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Statistics: {project_name}")
+        self.setFixedSize(620, 480)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #6b21a8;
+            }
+            QTextEdit {
+                background-color: #7c3aed;
+                color: white;
+                border: 1px solid #a855f7;
+                border-radius: 6px;
+                font-family: "Consolas", "Courier New", monospace;
+                font-size: 12px;
+            }
+            QPushButton {
+                background-color: #a855f7;
+                color: white;
+                border-radius: 6px;
+                padding: 6px;
+                font-weight: bold;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        self.text = QTextEdit(self)
+        self.text.setReadOnly(True)
+        layout.addWidget(self.text)
+
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        text = self.format_summary(get_flow_metrics(project_name).summary(days=14))
+        if critical_path:
+            days, titles = critical_path
+            text = f"Critical path: {days} days\n  " + " -> ".join(titles) + "\n\n" + text
+        self.text.setPlainText(text)
+
+    def format_summary(self, summary):
+        if not summary["events"]:
+            return "No activity has been logged for this board yet."
+
+        lines = [f"Events processed: {summary['events']}",
+                 f"Cycle time (to 'Done'): {summary['cycle_time']['average_hours']} h average "
+                 f"over {summary['cycle_time']['count']} tasks", "",
+                 f"{'Column':<20}{'Now':>6}{'Visits':>8}{'Avg hours in column':>22}"]
+        for column, stats in sorted(summary["columns"].items()):
+            lines.append(f"{column[:19]:<20}{stats['current']:>6}{stats['visits']:>8}"
+                         f"{stats['average_residence_hours']:>22}")
+
+        from datetime import date, timedelta
+        start = date.fromisoformat(summary["start_date"])
+        columns = sorted(summary["cumulative_flow"])
+        lines += ["", "Throughput and cumulative flow (last 14 days)",
+                  f"{'Day':<12}{'Done':>6}" + "".join(f"{column[:10]:>12}" for column in columns)]
+        for offset, done in enumerate(summary["throughput"]):
+            day = (start + timedelta(days=offset)).isoformat()
+            counts = "".join(f"{summary['cumulative_flow'][column][offset]:>12}" for column in columns)
+            lines.append(f"{day:<12}{done:>6}{counts}")
+        return "\n".join(lines)
+
+
+class LogQueryDialog(QDialog):
+    MAX_ROWS = 2000
+
+    def __init__(self, project_name, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Log Query: {project_name}")
+        self.setFixedSize(700, 500)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #6b21a8;
+            }
+            QLabel {
+                color: white;
+            }
+            QLineEdit, QDateEdit, QComboBox, QListWidget {
+                background-color: #7c3aed;
+                color: white;
+                border: 1px solid #a855f7;
+                border-radius: 4px;
+                padding: 4px;
+            }
+            QPushButton {
+                background-color: #a855f7;
+                color: white;
+                border-radius: 6px;
+                padding: 6px;
+                font-weight: bold;
+            }
+        """)
+        self.log_index = get_log_index(project_name)
+        self.log_index.update()
+
+        layout = QVBoxLayout(self)
+        filters = QHBoxLayout()
+
+        self.from_date = QDateEdit(QDate.currentDate().addDays(-7), self)
+        self.from_date.setCalendarPopup(True)
+        filters.addWidget(QLabel("From:", self))
+        filters.addWidget(self.from_date)
+
+        self.to_date = QDateEdit(QDate.currentDate(), self)
+        self.to_date.setCalendarPopup(True)
+        filters.addWidget(QLabel("To:", self))
+        filters.addWidget(self.to_date)
+
+        self.action_combo = QComboBox(self)
+        self.action_combo.addItem("All actions")
+        self.action_combo.addItems(sorted(self.log_index.actions))
+        filters.addWidget(self.action_combo)
+
+        self.text_input = QLineEdit(self)
+        self.text_input.setPlaceholderText("Details contain...")
+        self.text_input.returnPressed.connect(self.run_query)
+        filters.addWidget(self.text_input)
+
+        run_button = QPushButton("Run", self)
+        run_button.clicked.connect(self.run_query)
+        filters.addWidget(run_button)
+        layout.addLayout(filters)
+
+        self.status_label = QLabel("", self)
+        layout.addWidget(self.status_label)
+
+        self.results_list = QListWidget(self)
+        self.results_list.setUniformItemSizes(True)
+        layout.addWidget(self.results_list)
+
+        self.run_query()
+
+    def run_query(self):
+        start = self.from_date.date().toString("yyyy-MM-dd") + " 00:00:00"
+        end = self.to_date.date().toString("yyyy-MM-dd") + " 23:59:59"
+        actions = [self.action_combo.currentText()] if self.action_combo.currentIndex() > 0 else None
+        rows = self.log_index.query(start, end, actions, self.text_input.text().strip() or None)
+
+        self.results_list.setUpdatesEnabled(False)
+        self.results_list.clear()
+        count = 0
+        for row in rows:
+            if count == self.MAX_ROWS:
+                self.status_label.setText(f"Showing the first {self.MAX_ROWS} matches")
+                break
+            self.results_list.addItem(f"{row['timestamp']}  {row['action']:<18}  {row['details']}")
+            count += 1
+        else:
+            self.status_label.setText(f"{count} matching entries")
+        self.results_list.setUpdatesEnabled(True)
+
+
 class LoadingScreen(QDialog):
     def __init__(self):
         super().__init__()
@@ -1105,10 +2561,14 @@ class LoadingScreen(QDialog):
 
         self.text_to_display = "KANBAN"
         self.current_index = 0
+        self.main_menu = None
 
         self.typing_timer = QTimer(self)
         self.typing_timer.timeout.connect(self.show_next_letter)
-        self.typing_timer.start(150)
+        self.typing_timer.start(40)
+
+        #build the main menu once the splash has painted; the splash closes as soon as it is ready
+        QTimer.singleShot(0, self.prepare_main_menu)
 
         self.animation = QPropertyAnimation(self.container, b"geometry")
         self.animation.setDuration(1000)
@@ -1118,17 +2578,27 @@ class LoadingScreen(QDialog):
         self.animation.setLoopCount(-1)
         self.animation.start()
 
+    def prepare_main_menu(self):
+        self.main_menu = MainMenu()
+        self.finish_typing()
+
     def show_next_letter(self):
         if self.current_index < len(self.text_to_display):
             self.label.setText(self.label.text() + self.text_to_display[self.current_index])
             self.current_index += 1
         else:
-            self.typing_timer.stop()
-            self.fade_out()
+            self.finish_typing()
+
+    def finish_typing(self):
+        if self.main_menu is None or not self.typing_timer.isActive():
+            return
+        self.typing_timer.stop()
+        self.label.setText(self.text_to_display)
+        self.fade_out()
 
     def fade_out(self):
         self.fade_animation = QPropertyAnimation(self, b"windowOpacity")
-        self.fade_animation.setDuration(500)
+        self.fade_animation.setDuration(250)
         self.fade_animation.setStartValue(1)
         self.fade_animation.setEndValue(0)
         self.fade_animation.finished.connect(self.go_to_main_menu)
@@ -1136,19 +2606,106 @@ class LoadingScreen(QDialog):
 
     def go_to_main_menu(self):
         self.close()
-        self.main_menu = MainMenu()
         self.main_menu.show()
 
 
+class TaskSearchDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Search Tasks")
+        self.setFixedSize(500, 400)
+        self.setWindowFlag(Qt.WindowType.FramelessWindowHint)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.selected_project = None
+
+        container = QFrame(self)
+        container.setGeometry(0, 0, 500, 400)
+        container.setStyleSheet("""
+            QFrame {
+                background-color: #6b21a8;
+                border-radius: 20px;
+                border: 2px solid rgba(255, 255, 255, 0.2);
+            }
+            QLineEdit, QListWidget {
+                background-color: #7c3aed;
+                color: white;
+                border: 1px solid white;
+                border-radius: 10px;
+                padding: 6px;
+            }
+            QLabel {
+                color: white;
+                border: none;
+            }
+            QPushButton {
+                background-color: #a855f7;
+                color: white;
+                border: 2px solid white;
+                border-radius: 8px;
+                padding: 6px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #9333ea;
+            }
+        """)
+
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(10)
+
+        self.query_input = QLineEdit(container)
+        self.query_input.setPlaceholderText("Search titles, assignees and descriptions")
+        self.query_input.textChanged.connect(self.run_search)
+        layout.addWidget(self.query_input)
+
+        self.status_label = QLabel("", container)
+        layout.addWidget(self.status_label)
+
+        self.results_list = QListWidget(container)
+        self.results_list.setUniformItemSizes(True)
+        self.results_list.itemDoubleClicked.connect(self.open_result)
+        layout.addWidget(self.results_list)
+
+        close_button = QPushButton("Close", container)
+        close_button.clicked.connect(self.reject)
+        layout.addWidget(close_button)
+
+        self.index = get_search_index()
+        self.query_input.setFocus()
+
+    def run_search(self, text):
+        from time import perf_counter
+        start = perf_counter()
+        results = self.index.search(text)
+        elapsed = (perf_counter() - start) * 1000
+
+        self.results_list.clear()
+        for result in results:
+            label = f"{result['title']}  —  {result['project']} / {result['column']}"
+            if result["assignee"]:
+                label += f"  ({result['assignee']})"
+            self.results_list.addItem(label)
+            self.results_list.item(self.results_list.count() - 1).setData(Qt.ItemDataRole.UserRole,
+                                                                           result["project"])
+        self.status_label.setText(f"{len(results)} results in {elapsed:.1f} ms" if text.strip() else "")
+
+    def open_result(self, item):
+        self.selected_project = item.data(Qt.ItemDataRole.UserRole)
+        self.accept()
+
+
 class MainMenu(QWidget):
-    def __init__(self, saved_user_name=""):
+    def __init__(self, saved_user_name="", auth_session=None):
         super().__init__()
         self.setWindowTitle("Kanban Board")
         self.setFixedSize(600, 400)
         self.setWindowFlag(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.user_name = saved_user_name
+        self.auth_session = auth_session
         self.saved_boards = self.load_saved_boards()
+        self.watch_project_folder()
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
         self.container = QWidget(self)
@@ -1197,6 +2754,13 @@ class MainMenu(QWidget):
         self.admin_button.clicked.connect(lambda: self.open_kanban("Admin"))
         layout.addWidget(self.admin_button)
 
+        self.search_button = QPushButton("SEARCH TASKS")
+        self.search_button.setFont(QFont("Poppins", 14, QFont.Weight.Bold))
+        self.search_button.setFixedSize(200, 60)
+        self.search_button.setStyleSheet(button_style)
+        self.search_button.clicked.connect(self.open_task_search)
+        layout.addWidget(self.search_button)
+
         self.animate_button(self.user_button)
         self.animate_button(self.admin_button)
 
@@ -1214,19 +2778,41 @@ class MainMenu(QWidget):
             self.close()
 
     def load_saved_boards(self):
-        saved_boards = []
-        folder_path = "Project Files"
-        if os.path.exists(folder_path):
-            for filename in os.listdir(folder_path):
-                if filename.endswith(".xml"):
-                    saved_boards.append(filename[:-4])
-        saved_boards.sort()
-        return saved_boards
+        return get_project_catalog().names()
+
+    def watch_project_folder(self):
+        #inotify-backed on Linux: the catalog is refreshed when boards appear or disappear
+        self.folder_watcher = QFileSystemWatcher(self)
+        if os.path.isdir(PROJECTS_FOLDER):
+            self.folder_watcher.addPath(PROJECTS_FOLDER)
+        self.folder_watcher.directoryChanged.connect(self.on_project_folder_changed)
+
+    def on_project_folder_changed(self, path):
+        self.saved_boards = self.load_saved_boards()
+
+    def fill_project_list(self, name_list):
+        catalog = get_project_catalog()
+        name_list.setUpdatesEnabled(False)
+        name_list.clear()
+        name_list.addItems(self.saved_boards)
+        for row in range(name_list.count()):
+            item = name_list.item(row)
+            item.setToolTip(catalog.describe(item.text()))
+        name_list.setUpdatesEnabled(True)
+
+    def filter_project_list(self, name_list, text):
+        text = text.strip().lower()
+        name_list.setUpdatesEnabled(False)
+        for row in range(name_list.count()):
+            item = name_list.item(row)
+            item.setHidden(bool(text) and text not in item.text().lower())
+        name_list.setUpdatesEnabled(True)
 
     def open_kanban(self, user_type):
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Select {'or Enter' if user_type == 'Admin' else ''} Name")
-        dialog.setFixedSize(400, 300)
+        dialog_height = 350 if user_type == "Admin" else 300
+        dialog.setFixedSize(400, dialog_height)
         dialog.setWindowFlag(Qt.WindowType.FramelessWindowHint)
         dialog.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
 
@@ -1238,14 +2824,29 @@ class MainMenu(QWidget):
                 border: 2px solid rgba(255, 255, 255, 0.2);
             }
         """)
-        container.setGeometry(0, 0, 400, 300)
+        container.setGeometry(0, 0, 400, dialog_height)
 
         layout = QVBoxLayout(container)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(15)
 
+        filter_input = QLineEdit(container)
+        filter_input.setPlaceholderText("Type to filter projects")
+        filter_input.setStyleSheet("""
+            QLineEdit {
+                background-color: #7c3aed;
+                color: white;
+                border: 1px solid white;
+                border-radius: 10px;
+                padding: 6px;
+            }
+        """)
+        layout.addWidget(filter_input)
+
         name_list = QListWidget(container)
-        name_list.addItems(self.saved_boards)
+        name_list.setUniformItemSizes(True)
+        self.fill_project_list(name_list)
+        filter_input.textChanged.connect(lambda text: self.filter_project_list(name_list, text))
         name_list.setStyleSheet("""
             QListWidget {
                 background-color: #7c3aed;
@@ -1262,6 +2863,9 @@ class MainMenu(QWidget):
             login_dialog = AdminLoginDialog(self)
             if login_dialog.exec() != QDialog.DialogCode.Accepted:
                 return
+            if self.auth_session:
+                self.auth_session.stop()
+            self.auth_session = login_dialog.session
 
             name_input = QLineEdit(container)
             name_input.setPlaceholderText("Enter project name here")
@@ -1276,7 +2880,10 @@ class MainMenu(QWidget):
             """)
             layout.addWidget(name_input)
 
-            delete_button = QPushButton("Delete Selected Project", container)
+            name_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+            projects_layout = QHBoxLayout()
+
+            delete_button = QPushButton("Delete Selected", container)
             delete_button.setStyleSheet("""
                 QPushButton {
                     background-color: #e11d48;
@@ -1289,8 +2896,27 @@ class MainMenu(QWidget):
                     background-color: #be123c;
                 }
             """)
-            delete_button.clicked.connect(lambda: self.delete_project(name_list))
-            layout.addWidget(delete_button)
+            delete_button.clicked.connect(lambda: self.delete_project(name_list, filter_input))
+            projects_layout.addWidget(delete_button, stretch=2)
+
+            for text, handler in (("Clone", lambda: self.clone_projects(name_list, filter_input)),
+                                  ("Rename", lambda: self.rename_projects(name_list, filter_input))):
+                button = QPushButton(text, container)
+                button.setStyleSheet("""
+                    QPushButton {
+                        background-color: #a855f7;
+                        color: white;
+                        border-radius: 8px;
+                        padding: 6px;
+                        font-weight: bold;
+                    }
+                    QPushButton:hover {
+                        background-color: #9333ea;
+                    }
+                """)
+                button.clicked.connect(handler)
+                projects_layout.addWidget(button, stretch=1)
+            layout.addLayout(projects_layout)
 
             downloads_layout = QHBoxLayout()
 
@@ -1328,8 +2954,44 @@ class MainMenu(QWidget):
             log_download_button.clicked.connect(lambda: self.handle_download_log(name_list))
             downloads_layout.addWidget(log_download_button, stretch=1)
 
+            log_query_button = QPushButton("Query Logs", container)
+            log_query_button.setStyleSheet("""
+                QPushButton {
+                    background-color: #38bdf8;
+                    color: white;
+                    border-radius: 8px;
+                    padding: 6px;
+                    font-weight: bold;
+                }
+                QPushButton:hover {
+                    background-color: #0ea5e9;
+                }
+            """)
+            log_query_button.clicked.connect(lambda: self.handle_query_log(name_list))
+            downloads_layout.addWidget(log_query_button, stretch=1)
+
             layout.addLayout(downloads_layout)
 
+            backup_layout = QHBoxLayout()
+            for text, handler in (("Back Up Projects", lambda: self.handle_backup(name_list)),
+                                  ("Restore Backup", lambda: self.handle_restore(name_list, filter_input))):
+                button = QPushButton(text, container)
+                button.setStyleSheet("""
+                    QPushButton {
+                        background-color: #f59e0b;
+                        color: white;
+                        border-radius: 8px;
+                        padding: 6px;
+                        font-weight: bold;
+                    }
+                    QPushButton:hover {
+                        background-color: #d97706;
+                    }
+                """)
+                button.clicked.connect(handler)
+                backup_layout.addWidget(button, stretch=1)
+            layout.addLayout(backup_layout)
+
         ok_button = QPushButton("OK", container)
         ok_button.setStyleSheet("""
             QPushButton {
@@ -1385,13 +3047,23 @@ class MainMenu(QWidget):
                 return
 
         dialog.accept()
+        self.open_board(self.user_name, user_type == "Admin")
+
+    def open_board(self, project_name, is_Admin):
+        self.user_name = project_name
         current_pos = self.pos()
         self.close()
-        is_Admin = user_type == "Admin"
-        self.kanban_window = KanbanWindow(self.user_name, is_Admin)
+        self.kanban_window = board_cache.take(self.user_name, is_Admin) or \
+            KanbanWindow(self.user_name, is_Admin, self.auth_session)
+        self.kanban_window.set_auth_session(self.auth_session)
         self.kanban_window.move(current_pos)
         self.kanban_window.show()
 
+    def open_task_search(self):
+        dialog = TaskSearchDialog(self)
+        if dialog.exec() == QDialog.DialogCode.Accepted and dialog.selected_project:
+            self.open_board(dialog.selected_project, False)
+
     def handle_download_project(self, name_list):
         selected_item = name_list.currentItem()
         if selected_item:
@@ -1406,9 +3078,80 @@ class MainMenu(QWidget):
         else:
             self.show_message("Error", "Please select a project to download logs.", QMessageBox.Icon.Warning)
 
+    def handle_query_log(self, name_list):
+        selected_item = name_list.currentItem()
+        if not selected_item:
+            self.show_message("Error", "Please select a project to query logs.", QMessageBox.Icon.Warning)
+            return
+        if not os.path.exists(log_path(selected_item.text())):
+            self.show_message("Error", f"The log file for '{selected_item.text()}' does not exist.",
+                              QMessageBox.Icon.Warning)
+            return
+        dialog = LogQueryDialog(selected_item.text(), self)
+        dialog.exec()
+
+    def handle_backup(self, name_list):
+        projects = None
+        selected_item = name_list.currentItem()
+        if selected_item:
+            choice = QMessageBox.question(
+                self, "Back Up Projects",
+                f"Back up only '{selected_item.text()}'?\n\nChoose No to back up every project.",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel,
+            )
+            if choice == QMessageBox.StandardButton.Cancel:
+                return
+            if choice == QMessageBox.StandardButton.Yes:
+                projects = [selected_item.text()]
+        default_name = f"kanban-backup-{time.strftime('%Y%m%d-%H%M%S')}.tar.gz"
+        save_path, _ = QFileDialog.getSaveFileName(self, "Save Backup As", default_name,
+                                                   "Backups (*.tar.gz);;All Files (*)")
+        if not save_path:
+            return
+        worker = BackupWorker(save_path, projects, self)
+        worker.completed.connect(lambda count: self.show_message(
+            "Success", f"{count} files backed up to:\n{save_path}", QMessageBox.Icon.Information))
+        worker.failed.connect(lambda message: self.show_message(
+            "Error", f"Backup failed: {message}", QMessageBox.Icon.Critical))
+        self.run_background_job(worker, "Writing backup...")
+
+    def handle_restore(self, name_list, filter_input):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Restore Backup", "", "Backups (*.tar.gz);;All Files (*)")
+        if not file_path:
+            return
+        confirm = QMessageBox.question(
+            self, "Restore Confirmation",
+            "Projects, logs and admin accounts in the backup replace the current ones. Continue?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+        worker = RestoreWorker(file_path, self)
+        worker.restored.connect(lambda names: self.finish_restore(names, name_list, filter_input))
+        worker.failed.connect(lambda message: self.show_message(
+            "Error", f"Restore failed: {message}", QMessageBox.Icon.Critical))
+        self.run_background_job(worker, "Restoring backup...")
+
+    def run_background_job(self, worker, label):
+        progress = QProgressDialog(label, "Cancel", 0, 100, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        worker.progress.connect(progress.setValue)
+        worker.finished.connect(progress.close)
+        progress.canceled.connect(worker.requestInterruption)
+        self.background_job = worker
+        worker.start()
+
+    def finish_restore(self, names, name_list, filter_input):
+        for name in names:
+            board_cache.discard(name)  #cached windows still hold the boards from before the restore
+        self.saved_boards = self.load_saved_boards()
+        self.fill_project_list(name_list)
+        self.filter_project_list(name_list, filter_input.text())
+        self.show_message("Success", f"Restored {len(names)} project(s)", QMessageBox.Icon.Information)
+
     def download_project_file(self, project_name):
-        folder_path = os.path.abspath("Project Files")
-        file_path = os.path.join(folder_path, f"{project_name}.xml")
+        file_path = os.path.abspath(board_path(project_name))
 
         if not os.path.exists(file_path):
             self.show_message("Error", f"The file '{project_name}.xml' does not exist.", QMessageBox.Icon.Warning)
@@ -1419,14 +3162,14 @@ class MainMenu(QWidget):
         if save_path:
             try:
                 import shutil
-                shutil.copy(file_path, save_path)
+                with open_project_file(file_path) as source, open(save_path, "wb") as target:
+                    shutil.copyfileobj(source, target)  #downloads are always plaintext
                 self.show_message("Success", f"Project saved as:\n{save_path}", QMessageBox.Icon.Information)
             except Exception as e:
                 self.show_message("Error", f"Failed to save file: {e}", QMessageBox.Icon.Critical)
 
     def download_log_file(self, project_name):
-        folder_path = os.path.abspath("Project Files")
-        file_path = os.path.join(folder_path, f"Log_{project_name}.csv")
+        file_path = os.path.abspath(log_path(project_name))
 
         if not os.path.exists(file_path):
             self.show_message("Error", f"The log file for '{project_name}' does not exist.", QMessageBox.Icon.Warning)
@@ -1437,50 +3180,94 @@ class MainMenu(QWidget):
         if save_path:
             try:
                 import shutil
-                shutil.copy(file_path, save_path)
+                with open_project_file(file_path) as source, open(save_path, "wb") as target:
+                    shutil.copyfileobj(source, target)
                 self.show_message("Success", f"Log saved as:\n{save_path}", QMessageBox.Icon.Information)
             except Exception as e:
                 self.show_message("Error", f"Failed to save log file: {e}", QMessageBox.Icon.Critical)
 
-    def delete_project(self, name_list):
-        selected_item = name_list.currentItem()
-        if selected_item:
-            project_name = selected_item.text()
-            folder_path = "Project Files"
-            file_path = os.path.join(folder_path, f"{project_name}.xml")
-            log_file_path = os.path.join(folder_path, f"Log_{project_name}.csv")
-
-            confirm = QMessageBox.question(
-                self,
-                "Delete Confirmation",
-                f"Are you sure you want to delete '{project_name}'?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            )
+    def selected_projects(self, name_list):
+        return [item.text() for item in name_list.selectedItems() if not item.isHidden()]
 
-            if confirm == QMessageBox.StandardButton.Yes:
-                try:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-
-                        from datetime import datetime
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-                        if os.path.exists(log_file_path):
-                            with open(log_file_path, "a", encoding="utf-8") as log_file:
-                                log_file.write(f"{timestamp},Project Deleted,Project '{project_name}' XML deleted\n")
-                        else:
-                            with open(log_file_path, "w", encoding="utf-8") as log_file:
-                                log_file.write("timestamp,action,details\n")
-                                log_file.write(f"{timestamp},Project Deleted,Project '{project_name}' XML deleted\n")
-
-                    self.saved_boards.remove(project_name)
-                    name_list.takeItem(name_list.row(selected_item))
-                    self.show_message("Success", f"Deleted '{project_name}' (XML only, logs preserved)",
-                                      QMessageBox.Icon.Information)
-                except Exception as e:
-                    self.show_message("Error", f"Deletion failed: {e}", QMessageBox.Icon.Critical)
-        else:
+    def delete_project(self, name_list, filter_input):
+        names = self.selected_projects(name_list)
+        if not names:
             self.show_message("Error", "Please select a project to delete", QMessageBox.Icon.Warning)
+            return
+        question = f"Are you sure you want to delete '{names[0]}'?" if len(names) == 1 else \
+            f"Are you sure you want to delete these {len(names)} projects?\n\n" + "\n".join(names[:10]) + \
+            ("\n..." if len(names) > 10 else "")
+        confirm = QMessageBox.question(self, "Delete Confirmation", question,
+                                       QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if confirm == QMessageBox.StandardButton.Yes:
+            self.run_project_operations([("delete", name) for name in names], name_list, filter_input,
+                                        "Deleting projects...")
+
+    def clone_projects(self, name_list, filter_input):
+        names = self.selected_projects(name_list)
+        if not names:
+            self.show_message("Error", "Please select a project to clone", QMessageBox.Icon.Warning)
+            return
+        taken = set(self.saved_boards)
+        operations = []
+        for name in names:
+            copy_name = f"{name} copy"
+            suffix = 2
+            while copy_name in taken or os.path.exists(log_path(copy_name)):
+                copy_name = f"{name} copy {suffix}"
+                suffix += 1
+            taken.add(copy_name)
+            operations.append(("clone", name, copy_name))
+        if len(names) == 1:
+            copy_name, accepted = QInputDialog.getText(self, "Clone Project", "Name of the copy:", text=operations[0][2])
+            if not accepted or not copy_name.strip():
+                return
+            operations = [("clone", names[0], copy_name.strip())]
+        self.run_project_operations(operations, name_list, filter_input, "Cloning projects...")
+
+    def rename_projects(self, name_list, filter_input):
+        names = self.selected_projects(name_list)
+        if not names:
+            self.show_message("Error", "Please select a project to rename", QMessageBox.Icon.Warning)
+            return
+        if len(names) == 1:
+            pattern, accepted = QInputDialog.getText(self, "Rename Project", "New name:", text=names[0])
+        else:
+            pattern, accepted = QInputDialog.getText(self, "Rename Projects",
+                                                     f"New names for {len(names)} projects ({{name}} is the current name):",
+                                                     text="{name}")
+        if not accepted or not pattern.strip():
+            return
+        operations = [("rename", name, pattern.strip().replace("{name}", name)) for name in names]
+        operations = [operation for operation in operations if operation[1] != operation[2]]
+        if operations:
+            self.run_project_operations(operations, name_list, filter_input, "Renaming projects...")
+
+    def run_project_operations(self, operations, name_list, filter_input, label):
+        for action, name, *_ in operations:
+            if action != "clone":
+                board_cache.discard(name)  #a cached window would save the board back under its old name
+        worker = ProjectOperationsWorker(operations, self)
+        worker.completed.connect(lambda added, removed, errors: self.finish_project_operations(
+            operations, added, removed, errors, name_list, filter_input))
+        self.run_background_job(worker, label)
+
+    def finish_project_operations(self, operations, added, removed, errors, name_list, filter_input):
+        record_project_changes(added, removed)
+        self.saved_boards = self.load_saved_boards()
+        self.fill_project_list(name_list)
+        self.filter_project_list(name_list, filter_input.text())
+        action = operations[0][0]
+        done = len(removed) if action == "delete" else len(added)
+        summary = {"delete": f"Deleted {done} project(s) (XML only, logs preserved)",
+                   "clone": f"Cloned {done} project(s)",
+                   "rename": f"Renamed {done} project(s)"}[action]
+        if len(operations) > done + len(errors):
+            summary += f"\n\nCancelled before {len(operations) - done - len(errors)} project(s)"
+        if errors:
+            self.show_message("Error", summary + "\n\n" + "\n".join(errors[:10]), QMessageBox.Icon.Warning)
+        else:
+            self.show_message("Success", summary, QMessageBox.Icon.Information)
 
     def show_message(self, title, message, icon):
         msg = QMessageBox(self)
@@ -1519,12 +3306,17 @@ class KanbanApp(QApplication):
 
 
 if __name__ == "__main__":
-    # Start Flask backend in a thread
-    flask_thread = threading.Thread(target=run_flask, daemon=True)
-    flask_thread.start()
+    args, qt_argv = parse_client_args(sys.argv)
+    BACKEND_URL = args.backend_url.rstrip("/")
+    SYNC_ENABLED = args.client_only
+
+    # Start Flask backend in a thread unless a separate server is used
+    if not args.client_only:
+        flask_thread = threading.Thread(target=run_flask, daemon=True)
+        flask_thread.start()
 
     # Start PyQt app
-    app = QApplication(sys.argv)
+    app = QApplication(qt_argv)
     app.setStyleSheet("""
         QMessageBox {
             background-color: #6b21a8;
@@ -1544,7 +3336,13 @@ if __name__ == "__main__":
         }
     """)
 
-    kanban_app = KanbanApp(sys.argv)  # Your existing main app class
+    try:
+        get_file_cipher()  #derives the encryption key up front, so a wrong passphrase is reported before any board opens
+    except (RuntimeError, ValueError) as e:
+        QMessageBox.critical(None, "Encryption", str(e))
+        sys.exit(1)
+
+    kanban_app = KanbanApp(qt_argv)  # Your existing main app class
     sys.exit(app.exec())
 
 
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import kanban_server  # noqa: E402
+from kanban_storage import PROJECTS_FOLDER  # noqa: E402
+
+
+def write_board(task_count, description_size=600):
+    import xml.etree.ElementTree as ET
+    root = ET.Element("kanban_board")
+    names = ["To Do", "In Progress", "Review", "Done"]
+    for index, name in enumerate(names):
+        column = ET.SubElement(root, "column", name=name, wip_limit="0")
+        for i in range(index, task_count, len(names)):
+            task = ET.SubElement(column, "task")
+            ET.SubElement(task, "title").text = f"Task {i + 1}"
+            ET.SubElement(task, "assignee").text = f"user{i % 7}"
+            ET.SubElement(task, "start_date").text = "2024-01-01"
+            ET.SubElement(task, "end_date").text = "2024-02-01"
+            ET.SubElement(task, "description").text = ("Lorem ipsum dolor sit amet. " * 40)[:description_size]
+    os.makedirs(PROJECTS_FOLDER, exist_ok=True)
+    ET.ElementTree(root).write(os.path.join(PROJECTS_FOLDER, "bench.xml"), encoding="utf-8")
+
+
+def measure(client, headers, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/boards/bench", headers=headers)
+        timings.append(time.perf_counter() - start)
+        size = len(response.get_data())
+    return size, statistics.median(timings) * 1000
+
+
+def main():
+    repeat = int(os.environ.get("BENCH_REPEAT", "30"))
+    variants = [("json", "application/json", "identity"), ("json+gzip", "application/json", "gzip")]
+    if kanban_server.brotli:
+        variants.append(("json+br", "application/json", "br"))
+    if kanban_server.msgpack:
+        variants.append(("msgpack", kanban_server.MSGPACK_MIMETYPE, "identity"))
+        variants.append(("msgpack+gzip", kanban_server.MSGPACK_MIMETYPE, "gzip"))
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        client = kanban_server.app.test_client()
+        client.post("/register", json={"username": "bench", "password": "bench"})
+        token = client.post("/login", json={"username": "bench", "password": "bench"}).json["access_token"]
+
+        for task_count in (50, 500, 5000):
+            write_board(task_count)
+            for label, accept, encoding in variants:
+                headers = {"Authorization": f"Bearer {token}", "Accept": accept, "Accept-Encoding": encoding}
+                size, latency = measure(client, headers, repeat)
+                results.append({"tasks": task_count, "variant": label, "bytes": size, "median_ms": round(latency, 3)})
+
+    for result in results:
+        print(f"{result['tasks']:>6} tasks  {result['variant']:<14}{result['bytes']:>10} B{result['median_ms']:>10.2f} ms")
+    if "--json" in sys.argv:
+        print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from harness import BenchmarkRun, work_in_temp_dir  # noqa: E402
+
+COLUMNS = ("To Do", "In Progress", "Review", "Done")
+
+
+def write_board(project_name, task_count):
+    import xml.etree.ElementTree as ET
+    from kanban_storage import PROJECTS_FOLDER, board_path
+    root = ET.Element("kanban_board")
+    for index, name in enumerate(COLUMNS):
+        column = ET.SubElement(root, "column", name=name, wip_limit="0")
+        for i in range(index, task_count, len(COLUMNS)):
+            task = ET.SubElement(column, "task", id=f"bench-{i}")
+            ET.SubElement(task, "title").text = f"Task {i + 1}"
+            ET.SubElement(task, "assignee").text = f"user{i % 7}"
+            ET.SubElement(task, "start_date").text = "2024-01-01"
+            ET.SubElement(task, "end_date").text = "2024-02-01"
+            ET.SubElement(task, "description").text = "Benchmark task description " * 4
+    os.makedirs(PROJECTS_FOLDER, exist_ok=True)
+    ET.ElementTree(root).write(board_path(project_name), encoding="utf-8")
+
+
+def open_board(SKanban, project_name, task_count):
+    window = SKanban.KanbanWindow(project_name, True)
+    window.max_tasks = max(task_count, window.max_tasks)
+    return window
+
+
+def bench_create_tasks(run, SKanban, app, count):
+    def setup():
+        window = SKanban.KanbanWindow(f"create{count}", True)
+        window.max_tasks = count
+        return window
+
+    def create(window):
+        for _ in range(count):
+            window.create_task()
+
+    run.time(f"create_task x{count}", create, setup=setup, operations=count)
+
+
+def bench_persistence(run, SKanban, app, sizes):
+    for task_count in sizes:
+        project_name = f"board{task_count}"
+        write_board(project_name, task_count)
+        repeat = 1 if task_count >= 10000 else None
+        windows = []
+
+        def load():
+            windows.append(open_board(SKanban, project_name, task_count))
+
+        run.time(f"load_from_xml {task_count} tasks", load, repeat=repeat, operations=task_count)
+        window = windows[-1]
+        run.time(f"save_to_xml {task_count} tasks", window.save_to_xml, repeat=repeat, operations=task_count)
+        for window in windows:
+            window.deleteLater()
+        app.processEvents()
+
+
+def bench_drag_drop(run, SKanban, app, moves):
+    from PyQt6.QtCore import QPoint
+    write_board("dragdrop", moves)
+    window = open_board(SKanban, "dragdrop", moves)
+    window.show()
+    app.processEvents()
+    source, target = window.columns[0], window.columns[1]
+
+    timings = []
+    moved = 0
+    for task in window.tasks_in(source):
+        target_position = window.mapFromGlobal(target.mapToGlobal(QPoint(10, 120)))
+        task.setParent(window)
+        task.move(target_position)
+        start = time.perf_counter()
+        moved += bool(window.snap_to_column(task))
+        timings.append(time.perf_counter() - start)
+    if moved != len(timings):
+        print(f"warning: only {moved} of {len(timings)} drops landed in the target column")
+    run.record(f"snap_to_column x{len(timings)}", timings)
+    window.close()
+
+
+def bench_log_burst(run, SKanban, app, count):
+    window = SKanban.KanbanWindow("logburst", True)
+
+    def burst():
+        for i in range(count):
+            window.append_log_entry("Task Edited", f"'Task {i}' fields changed: Title")
+
+    run.time(f"append_log_entry x{count}", burst, operations=count)
+
+
+def bench_login(run, levels, logins_per_thread):
+    import kanban_server
+    client = kanban_server.app.test_client()
+    client.post("/register", json={"username": "bench", "password": "bench"})
+
+    for concurrency in levels:
+        def worker():
+            thread_client = kanban_server.app.test_client()
+            for _ in range(logins_per_thread):
+                response = thread_client.post("/login", json={"username": "bench", "password": "bench"})
+                assert response.status_code == 200
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        run.record(f"/login concurrency {concurrency}", [elapsed], operations=concurrency * logins_per_thread)
+
+
+def main():
+    run = BenchmarkRun("Headless benchmarks for board operations, persistence and auth")
+    work_in_temp_dir()
+
+    from PyQt6.QtWidgets import QApplication
+    import SKanban
+    app = QApplication(sys.argv[:1])
+
+    sizes = (100, 1000) if run.args.quick else (100, 1000, 10000)
+    bench_create_tasks(run, SKanban, app, 50)
+    bench_create_tasks(run, SKanban, app, 500)
+    bench_persistence(run, SKanban, app, sizes)
+    bench_drag_drop(run, SKanban, app, 100)
+    bench_log_burst(run, SKanban, app, 1000)
+    bench_login(run, (1, 4, 8), 2 if run.args.quick else 5)
+    run.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import BenchmarkRun, work_in_temp_dir  # noqa: E402
+
+
+def board_payload(task_count):
+    from kanban_storage import board_to_xml
+    columns = [{"name": name, "wip_limit": 0, "tasks": []} for name in ("To Do", "In Progress", "Done")]
+    for i in range(task_count):
+        columns[i % 3]["tasks"].append({"id": f"bench-{i}", "title": f"Task {i + 1}", "assignee": f"user{i % 7}",
+                                        "start_date": "2024-01-01", "end_date": "2024-02-01",
+                                        "description": "Benchmark task description " * 4})
+    return board_to_xml({"columns": columns})
+
+
+def plain_write(file_path, data):
+    with open(file_path, "wb") as f:
+        f.write(data)
+
+
+def bench_writes(run, label, file_path, data):
+    from kanban_storage import atomic_write, file_lock
+
+    def locked_write():
+        with file_lock(file_path):
+            atomic_write(file_path, data)
+
+    size = f"{len(data) // 1024} KiB"
+    run.time(f"{label} {size} plain write", lambda: plain_write(file_path, data))
+    run.time(f"{label} {size} atomic_write", lambda: atomic_write(file_path, data))
+    run.time(f"{label} {size} locked atomic_write", locked_write)
+
+
+def bench_log_appends(run, count):
+    from kanban_storage import append_log_line
+    line = "2024-01-01 12:00:00,Task Moved,'Task 1' moved to 'Done'\n"
+
+    def plain():
+        with open("plain_log.csv", "a", encoding="utf-8") as f:
+            for _ in range(count):
+                f.write(line)
+
+    def reopened():
+        for _ in range(count):
+            with open("reopened_log.csv", "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def locked():
+        for _ in range(count):
+            append_log_line("locked_log.csv", line)
+
+    run.time(f"log append x{count} one handle", plain, operations=count)
+    run.time(f"log append x{count} reopen per line", reopened, operations=count)
+    run.time(f"log append x{count} append_log_line", locked, operations=count)
+
+
+def bench_concurrent_admins(run, threads, per_thread):
+    from kanban_storage import ADMINS_FILE, add_admin, load_admins
+
+    def setup():
+        if os.path.exists(ADMINS_FILE):
+            os.remove(ADMINS_FILE)
+
+    def register(state):
+        def worker(thread_index):
+            for i in range(per_thread):
+                add_admin(f"admin{thread_index}-{i}", "hash")
+
+        workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    total = threads * per_thread
+    run.time(f"add_admin {threads} threads x{per_thread}", register, setup=setup, operations=total)
+    registered = len(load_admins())
+    if registered != total:
+        print(f"warning: {registered} of {total} concurrent registrations survived")
+
+
+def main():
+    run = BenchmarkRun("Cost of crash-safe writes: temp file, fsync, rename and advisory locks")
+    work_in_temp_dir()
+
+    sizes = (100, 1000) if run.args.quick else (100, 1000, 10000)
+    for task_count in sizes:
+        bench_writes(run, f"board {task_count} tasks", "board.xml", board_payload(task_count))
+    admins = {f"admin{i}": "$2b$12$" + "x" * 53 for i in range(50)}
+    bench_writes(run, "admins", "admin_users.json", json.dumps(admins).encode("utf-8"))
+    bench_log_appends(run, 200 if run.args.quick else 1000)
+    bench_concurrent_admins(run, 8, 5 if run.args.quick else 20)
+    run.finish()
+
+
+if __name__ == "__main__":
+    main()
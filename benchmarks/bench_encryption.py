@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import BenchmarkRun, work_in_temp_dir  # noqa: E402
+from bench_durability import board_payload  # noqa: E402
+
+PASSPHRASE = "benchmark passphrase"
+
+
+def set_encryption(enabled):
+    from kanban_storage import ENCRYPTION_PASSPHRASE_ENV
+    if enabled:
+        os.environ[ENCRYPTION_PASSPHRASE_ENV] = PASSPHRASE
+    else:
+        os.environ.pop(ENCRYPTION_PASSPHRASE_ENV, None)
+
+
+def bench_key_derivation(run):
+    import kanban_storage
+    set_encryption(True)
+    start = time.perf_counter()
+    kanban_storage.get_file_cipher()
+    run.record("key derivation (scrypt, once per session)", [time.perf_counter() - start])
+    run.time("key lookup (cached)", kanban_storage.get_file_cipher, repeat=1000)
+
+
+def bench_boards(run, task_count):
+    from kanban_storage import write_project_file, read_board
+    data = board_payload(task_count)
+    for mode in ("plaintext", "encrypted"):
+        set_encryption(mode == "encrypted")
+        file_path = f"{mode}-{task_count}.xml"
+        label = f"board {task_count} tasks {mode}"
+        run.time(f"{label} save", lambda: write_project_file(file_path, data), operations=task_count)
+        run.time(f"{label} load", lambda: read_board(file_path), operations=task_count)
+
+
+def bench_logs(run, count):
+    from kanban_storage import append_log_line, open_project_file, project_file_size
+    line = "2024-01-01 12:00:00,Task Moved,'Task 1' moved to 'Done'\n"
+    for mode in ("plaintext", "encrypted"):
+        set_encryption(mode == "encrypted")
+        file_path = f"Log_{mode}.csv"
+
+        def setup():
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+        def append(state):
+            for _ in range(count):
+                append_log_line(file_path, line)
+
+        def read():
+            with open_project_file(file_path) as f:
+                f.seek(project_file_size(file_path) // 2)
+                f.read()
+
+        run.time(f"log append x{count} {mode}", append, setup=setup, operations=count)
+        run.time(f"log read second half of {count} lines {mode}", read)
+
+
+def main():
+    run = BenchmarkRun("Overhead of encrypted-at-rest boards and logs against plaintext")
+    work_in_temp_dir()
+    os.makedirs(os.path.join("Project Files", ".kanban"), exist_ok=True)
+
+    bench_key_derivation(run)
+    for task_count in (100, 1000) if run.args.quick else (100, 1000, 10000):
+        bench_boards(run, task_count)
+    bench_logs(run, 200 if run.args.quick else 1000)
+    run.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#Import-time budget for `import SKanban` in microseconds, and modules the GUI must not load at startup
+IMPORT_BUDGET_US = int(os.environ.get("STARTUP_BUDGET_US", "150000"))
+DEFERRED_MODULES = ("flask", "flask_jwt_extended", "bcrypt", "requests", "xml.dom.minidom", "kanban_server")
+
+
+def measure_imports(module="SKanban"):
+    env = dict(os.environ, PYTHONPATH=ROOT, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=env, capture_output=True, text=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        timings[parts[2].strip()] = {"self_us": self_us, "cumulative_us": cumulative_us}
+    return timings
+
+
+def main():
+    runs = [measure_imports() for _ in range(int(os.environ.get("BENCH_REPEAT", "5")))]
+    totals = sorted(run["SKanban"]["cumulative_us"] for run in runs)
+    median_total = totals[len(totals) // 2]
+    loaded = [name for name in DEFERRED_MODULES if name in runs[0]]
+
+    slowest = sorted(runs[0].items(), key=lambda item: item[1]["cumulative_us"], reverse=True)[:10]
+    for name, timing in slowest:
+        print(f"{timing['cumulative_us'] / 1000:>9.1f} ms  {name}")
+    print(f"import SKanban: {median_total / 1000:.1f} ms (budget {IMPORT_BUDGET_US / 1000:.1f} ms)")
+
+    failures = []
+    if median_total > IMPORT_BUDGET_US:
+        failures.append(f"import time {median_total} us exceeds budget {IMPORT_BUDGET_US} us")
+    if loaded:
+        failures.append(f"modules that should be deferred were imported at startup: {', '.join(loaded)}")
+
+    if "--json" in sys.argv:
+        print(json.dumps({"import_us": median_total, "budget_us": IMPORT_BUDGET_US, "eager_modules": loaded}))
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
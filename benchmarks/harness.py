@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+
+
+class BenchmarkRun:
+    def __init__(self, description):
+        parser = argparse.ArgumentParser(description=description)
+        parser.add_argument("--json", metavar="PATH", help="write machine-readable results to PATH")
+        parser.add_argument("--baseline", metavar="PATH", help="compare against results from an earlier --json run")
+        parser.add_argument("--threshold", type=float, default=0.25,
+                            help="allowed slowdown against the baseline before failing (default 0.25 = 25%%)")
+        parser.add_argument("--repeat", type=int, default=5, help="timed repetitions per case")
+        parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+        self.args = parser.parse_args()
+        #resolved now, as work_in_temp_dir changes the working directory afterwards
+        for option in ("json", "baseline"):
+            if getattr(self.args, option):
+                setattr(self.args, option, os.path.abspath(getattr(self.args, option)))
+        self.results = {}
+
+    def time(self, name, func, setup=None, repeat=None, operations=1):
+        #setup runs before every repetition and is not timed; its return value is passed to func
+        timings = []
+        for _ in range(repeat or self.args.repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            func(state) if setup else func()
+            timings.append(time.perf_counter() - start)
+        self.record(name, timings, operations)
+
+    def record(self, name, timings, operations=1):
+        timings = sorted(timings)
+        median = statistics.median(timings)
+        self.results[name] = {
+            "median_ms": round(median * 1000, 3),
+            "min_ms": round(timings[0] * 1000, 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3),
+            "ops_per_sec": round(operations / median, 1) if median else None,
+            "repeat": len(timings),
+        }
+        result = self.results[name]
+        print(f"{name:<44}{result['median_ms']:>11.2f} ms{result['ops_per_sec'] or 0:>12.1f} ops/s", flush=True)
+
+    def finish(self):
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "results": self.results,
+        }
+        if self.args.json:
+            with open(self.args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+        regressions = self.compare() if self.args.baseline else []
+        for name, ratio in regressions:
+            print(f"REGRESSION: {name} is {ratio:.2f}x its baseline median")
+        sys.exit(1 if regressions else 0)
+
+    def compare(self):
+        with open(self.args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = []
+        for name, result in self.results.items():
+            previous = baseline.get(name)
+            if not previous or not previous["median_ms"]:
+                continue
+            ratio = result["median_ms"] / previous["median_ms"]
+            if ratio > 1 + self.args.threshold:
+                regressions.append((name, ratio))
+        return regressions
+
+
+def work_in_temp_dir():
+    #every module resolves "Project Files" and admin_users.json relative to the working directory;
+    #the directory is removed again when the benchmark exits
+    import atexit
+    import tempfile
+    workdir = tempfile.TemporaryDirectory(prefix="kanban-bench-")
+    previous = os.getcwd()
+    os.chdir(workdir.name)
+
+    def cleanup():
+        os.chdir(previous)
+        workdir.cleanup()
+
+    atexit.register(cleanup)
+    return workdir.name
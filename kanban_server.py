@@ -0,0 +1,463 @@
+import os
+import gzip
+import time
+import queue
+import bisect
+import bcrypt
+import threading
+from contextlib import contextmanager
+import xml.etree.ElementTree as ET
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from werkzeug.serving import WSGIRequestHandler
+from flask_jwt_extended import (  # JWT/tokenisation
+    JWTManager, create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+)
+
+from kanban_storage import (
+    load_admins, add_admin, read_board, project_file_path, log_path, get_search_index, get_flow_metrics,
+    get_log_index, get_project_catalog, update_board, BatchError, get_file_cipher, board_path, write_backup,
+    BackupCancelled, LOG_HEADER, format_log_line
+)
+
+try:
+    import brotli  # optional: better ratios than gzip for large board payloads
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack  # optional: compact binary representation of board payloads
+except ImportError:
+    msgpack = None
+
+app = Flask(__name__)
+app.json.compact = True     #No indentation or spaces in JSON responses
+app.json.sort_keys = False
+
+SERVER_HOST = os.environ.get("KANBAN_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("KANBAN_PORT", "5000"))
+
+#JWT configuration
+app.config["JWT_SECRET_KEY"] = os.environ.get("KANBAN_JWT_SECRET", "super-secret-change-this")  #Secret key used to sign tokens
+app.config["JWT_ACCESS_TOKEN_EXPIRES"] = 3600               #Tokens expire in 1 hour
+app.config["JWT_REFRESH_TOKEN_EXPIRES"] = 30 * 24 * 3600    #Refresh tokens expire in 30 days
+jwt = JWTManager(app)  #Initialise JWT manager with Flask app
+
+COMPRESSION_MIN_SIZE = 1024  #Responses smaller than this are sent uncompressed
+MSGPACK_MIMETYPE = "application/x-msgpack"
+MAX_BATCH_OPERATIONS = 1000  #Operations accepted in one /boards/<name>/batch request
+BACKUP_QUEUE_CHUNKS = 16  #Compressed chunks buffered between the backup writer thread and the response
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)  #Seconds
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)  #bucket lookup happens outside the lock
+        with self.lock:
+            self.counts[index] += 1
+            self.total += value
+
+    def render(self, name, labels):
+        with self.lock:
+            counts = list(self.counts)
+            total = self.total
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_latency = {}   #(method, route) -> Histogram
+        self.responses = {}         #(method, route, status) -> count
+        self.storage_latency = {}   #operation -> Histogram
+        self.counters = {"login_failures": 0, "login_successes": 0}
+        self.gauges = {"requests_in_flight": 0, "bcrypt_in_flight": 0}
+
+    def histogram(self, table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = table.setdefault(key, Histogram())
+        return histogram
+
+    def increment(self, table, key, amount=1):
+        with self.lock:
+            table[key] = table.get(key, 0) + amount
+
+    def render(self):
+        lines = ["# TYPE kanban_http_request_duration_seconds histogram"]
+        for (method, route), histogram in sorted(self.request_latency.items()):
+            lines += histogram.render("kanban_http_request_duration_seconds", f'method="{method}",route="{route}"')
+        lines.append("# TYPE kanban_http_responses_total counter")
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(f'kanban_http_responses_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+        lines.append("# TYPE kanban_storage_duration_seconds histogram")
+        for operation, histogram in sorted(self.storage_latency.items()):
+            lines += histogram.render("kanban_storage_duration_seconds", f'operation="{operation}"')
+        for name, value in self.counters.items():
+            lines += [f"# TYPE kanban_{name}_total counter", f"kanban_{name}_total {value}"]
+        for name, value in self.gauges.items():
+            lines += [f"# TYPE kanban_{name} gauge", f"kanban_{name} {value}"]
+        lines += ["# TYPE kanban_active_threads gauge", f"kanban_active_threads {threading.active_count()}"]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def storage_timer(operation):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.histogram(metrics.storage_latency, operation).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def bcrypt_slot():
+    #bcrypt_in_flight is the number of requests currently hashing, i.e. the login queue depth
+    metrics.increment(metrics.gauges, "bcrypt_in_flight")
+    try:
+        yield
+    finally:
+        metrics.increment(metrics.gauges, "bcrypt_in_flight", -1)
+
+
+def payload_response(data):
+    #MessagePack is only used when the client explicitly prefers it
+    if msgpack and request.accept_mimetypes.best_match(["application/json", MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE:
+        response = app.response_class(msgpack.packb(data, use_bin_type=True), mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = jsonify(data)
+    response.vary.add("Accept")  #the same URL answers in two formats
+    return response
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    metrics.increment(metrics.gauges, "requests_in_flight")
+
+
+@app.teardown_request
+def finish_request_timer(error=None):
+    metrics.increment(metrics.gauges, "requests_in_flight", -1)
+
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    if "request_start" in g:
+        elapsed = time.perf_counter() - g.request_start
+        metrics.histogram(metrics.request_latency, (request.method, route)).observe(elapsed)
+    metrics.increment(metrics.responses, (request.method, route, response.status_code))
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or "Content-Encoding" in response.headers):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return response
+
+    encoding = request.accept_encodings.best_match(["br", "gzip"] if brotli else ["gzip"])
+    if encoding == "br":
+        response.set_data(brotli.compress(body, quality=5))
+    elif encoding == "gzip":
+        response.set_data(gzip.compress(body, compresslevel=6))
+    else:
+        return response
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+@app.route("/register", methods=["POST"])
+def register():
+    data = request.json
+    username = data.get("username")
+    password = data.get("password")
+
+    if not username or not password or len(username) < 3 or len(password) < 4:
+        return jsonify({"success": False, "message": "Username or password too short"}), 400
+
+    with storage_timer("load_admins"):
+        admins = load_admins()
+    if username in admins:
+        return jsonify({"success": False, "message": "Username already exists"}), 400
+
+    with bcrypt_slot():
+        hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    with storage_timer("save_admins"):
+        added = add_admin(username, hashed.decode("utf-8"))
+    if not added:
+        return jsonify({"success": False, "message": "Username already exists"}), 400
+
+    return jsonify({"success": True, "message": f"Admin '{username}' registered."})
+
+
+@app.route("/login", methods=["POST"])
+def login():
+    data = request.json
+    username = data.get("username")
+    password = data.get("password")
+
+    with storage_timer("load_admins"):
+        admins = load_admins()
+    if username not in admins:
+        metrics.increment(metrics.counters, "login_failures")
+        return jsonify({"success": False, "message": "Invalid credentials"}), 401
+
+    with bcrypt_slot():
+        password_ok = bcrypt.checkpw(password.encode("utf-8"), admins[username].encode("utf-8"))
+    if password_ok:
+        metrics.increment(metrics.counters, "login_successes")
+        #create a JWT token for the authenticated user, plus a refresh token so the
+        #client can renew it without sending the password (and paying for bcrypt) again
+        access_token = create_access_token(identity=username)
+        refresh_token = create_refresh_token(identity=username)
+        return jsonify({
+            "success": True,
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": app.config["JWT_ACCESS_TOKEN_EXPIRES"],
+        })
+    else:
+        metrics.increment(metrics.counters, "login_failures")
+        return jsonify({"success": False, "message": "Invalid credentials"}), 401
+
+
+@app.route("/refresh", methods=["POST"])
+@jwt_required(refresh=True)  #Only refresh tokens are accepted here
+def refresh():
+    current_user = get_jwt_identity()
+    with storage_timer("load_admins"):
+        admins = load_admins()
+    if current_user not in admins:
+        return jsonify({"success": False, "message": "Unknown admin"}), 401
+
+    access_token = create_access_token(identity=current_user)
+    return jsonify({
+        "success": True,
+        "access_token": access_token,
+        "expires_in": app.config["JWT_ACCESS_TOKEN_EXPIRES"],
+    })
+
+
+@app.route("/admin_exists", methods=["GET"])
+def admin_exists():
+    with storage_timer("load_admins"):
+        admins = load_admins()
+    return jsonify({"exists": len(admins) > 0})
+
+
+@app.route("/protected", methods=["GET"])
+@jwt_required()  #Requires a valid JWT token to access this route
+def protected():
+    #retrieve the username from the token
+    current_user = get_jwt_identity()
+    return jsonify({"message": f"Hello {current_user}, you have access to protected data!"})
+
+
+@app.route("/boards/<name>", methods=["GET"])
+@jwt_required()
+def get_board(name):
+    file_path = project_file_path(name)
+    if not file_path or not os.path.exists(file_path):
+        return jsonify({"success": False, "message": "Board not found"}), 404
+    try:
+        with storage_timer("read_board"):
+            board = read_board(file_path)
+    except ET.ParseError as e:
+        return jsonify({"success": False, "message": f"Error parsing XML file: {e}"}), 500
+    return payload_response({"success": True, "name": name, "board": board})
+
+
+@app.route("/boards/<name>/batch", methods=["POST"])
+@jwt_required()
+def batch_update(name):
+    file_path = project_file_path(name)
+    if not file_path:
+        return jsonify({"success": False, "message": "Invalid board name"}), 400
+    data = request.get_json(silent=True) or {}
+    operations = data.get("operations")
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"success": False, "message": "operations must be a non-empty list"}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({"success": False, "message": f"At most {MAX_BATCH_OPERATIONS} operations per batch"}), 413
+
+    #the batch is applied all-or-nothing; a rejected operation is reported by its index
+    try:
+        with storage_timer("update_board"):
+            board, applied = update_board(name, operations)
+    except BatchError as e:
+        return jsonify({"success": False, "index": e.index, "message": str(e)}), 409
+    except ET.ParseError as e:
+        return jsonify({"success": False, "message": f"Error parsing XML file: {e}"}), 500
+
+    if applied:
+        try:
+            get_project_catalog(refresh=False).record_save(name, len(board["columns"]),
+                                              sum(len(column["tasks"]) for column in board["columns"]))
+            get_search_index(refresh=False).index_project(name, board, os.stat(file_path).st_mtime)
+        except Exception as e:
+            print(f"Error updating indexes for {name}: {e}")
+    return jsonify({"success": True, "version": board["version"], "applied": applied})
+
+
+@app.route("/boards/<name>/metrics", methods=["GET"])
+@jwt_required()
+def board_metrics(name):
+    if not project_file_path(name) or not os.path.exists(log_path(name)):
+        return jsonify({"success": False, "message": "No log for this board"}), 404
+    try:
+        days = min(int(request.args.get("days", "30")), 3650)
+    except ValueError:
+        return jsonify({"success": False, "message": "days must be a number"}), 400
+    if days < 1:
+        return jsonify({"success": False, "message": "days must be at least 1"}), 400
+    return jsonify({"success": True, "metrics": get_flow_metrics(name).summary(days)})
+
+
+@app.route("/logs/<name>", methods=["GET"])
+@jwt_required()
+def query_log(name):
+    if not project_file_path(name) or not os.path.exists(log_path(name)):
+        return jsonify({"success": False, "message": "No log for this board"}), 404
+    try:
+        limit = int(request.args["limit"]) if "limit" in request.args else None  #no limit: every matching row
+    except ValueError:
+        return jsonify({"success": False, "message": "limit must be a number"}), 400
+    if limit is not None and limit < 1:
+        return jsonify({"success": False, "message": "limit must be at least 1"}), 400
+    actions = request.args.getlist("action")
+    rows = get_log_index(name).query(request.args.get("start"), request.args.get("end"),
+                                     actions, request.args.get("q"))
+
+    def generate():
+        #rows are streamed straight from the log file as they match, csv-quoted like the log itself
+        yield LOG_HEADER
+        for count, row in enumerate(rows, 1):
+            yield format_log_line(row["timestamp"], row["action"], row["details"])
+            if count == limit:
+                break
+
+    return Response(stream_with_context(generate()), mimetype="text/csv")
+
+
+@app.route("/search", methods=["GET"])
+@jwt_required()
+def search():
+    query = request.args.get("q", "")
+    try:
+        limit = min(int(request.args.get("limit", "50")), 500)
+    except ValueError:
+        return jsonify({"success": False, "message": "limit must be a number"}), 400
+    results = get_search_index().search(query, limit)
+    return jsonify({"success": True, "results": results})
+
+
+class QueueWriter:
+    #File object for write_backup that hands each compressed chunk to the response generator; the
+    #bounded queue keeps a slow client from buffering the whole archive in memory
+    def __init__(self, chunks, stop):
+        self.chunks = chunks
+        self.stop = stop
+
+    def write(self, data):
+        self.put(bytes(data))
+        return len(data)
+
+    def put(self, item):
+        while not self.stop.is_set():
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+        raise BackupCancelled()
+
+
+@app.route("/backup", methods=["GET"])
+@jwt_required()
+def backup():
+    projects = request.args.get("projects")
+    projects = [name for name in projects.split(",") if name] if projects else None
+    for name in projects or []:
+        if not project_file_path(name) or not os.path.exists(board_path(name)):
+            return jsonify({"success": False, "message": f"Board not found: {name}"}), 404
+    chunks = queue.Queue(BACKUP_QUEUE_CHUNKS)
+    stop = threading.Event()
+    writer = QueueWriter(chunks, stop)
+
+    def produce():
+        try:
+            write_backup(writer, projects, should_stop=stop.is_set)
+        except BackupCancelled:
+            pass
+        except Exception:
+            app.logger.exception("Error writing backup")  #the client sees a truncated archive
+        finally:
+            try:
+                writer.put(None)  #always end the stream, or generate() waits forever
+            except BackupCancelled:
+                pass
+
+    def generate():
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while (chunk := chunks.get()) is not None:
+                yield chunk
+        finally:
+            stop.set()  #the client went away or the archive is complete
+
+    filename = f"kanban-backup-{time.strftime('%Y%m%d-%H%M%S')}.tar.gz"
+    return Response(generate(), mimetype="application/gzip",
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+def run_server(host=None, port=None):
+    #HTTP/1.1 keeps client connections alive between requests
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    app.run(host=host or SERVER_HOST, port=port or SERVER_PORT, debug=False, use_reloader=False, threaded=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Secure Kanban Board API server (no GUI dependencies)")
+    parser.add_argument("--host", default=SERVER_HOST, help="interface to bind (default: $KANBAN_HOST or 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="port to listen on (default: $KANBAN_PORT or 5000)")
+    args = parser.parse_args()
+
+    try:
+        get_file_cipher()
+    except (RuntimeError, ValueError) as e:
+        parser.exit(1, f"{e}\n")
+    if app.config["JWT_SECRET_KEY"] == "super-secret-change-this":
+        print("Warning: KANBAN_JWT_SECRET is not set; tokens are signed with the default development key")
+    run_server(args.host, args.port)
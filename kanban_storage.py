@@ -0,0 +1,2565 @@
+import io
+import os
+import re
+import csv
+import copy
+import gzip
+import hmac
+import json
+import uuid
+import bisect
+import shutil
+import hashlib
+import sqlite3
+import tarfile
+import tempfile
+import threading
+from array import array
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime
+import xml.etree.ElementTree as ET
+
+try:
+    from cryptography.exceptions import InvalidTag  # optional: only needed for encrypted project files
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+    from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+except ImportError:
+    InvalidTag = AESGCM = None
+
+ADMINS_FILE = "admin_users.json"
+PROJECTS_FOLDER = "Project Files"
+METADATA_FOLDER = os.path.join(PROJECTS_FOLDER, ".kanban")  #Indexes and caches kept next to the boards
+MANIFEST_FILE = os.path.join(PROJECTS_FOLDER, "manifest.json")  #Present only in the sharded layout
+SHARD_DEPTH = 2  #Two levels of 256 hashed directories keep every directory small up to millions of projects
+CATALOG_FILE = os.path.join(METADATA_FOLDER, "catalog.json")
+SEARCH_INDEX_FILE = os.path.join(METADATA_FOLDER, "search.db")
+METRICS_FOLDER = os.path.join(METADATA_FOLDER, "metrics")
+LOG_INDEX_FOLDER = os.path.join(METADATA_FOLDER, "logindex")
+AUTOSAVE_FOLDER = os.path.join(METADATA_FOLDER, "autosave")
+ARCHIVE_FOLDER = os.path.join(METADATA_FOLDER, "archive")
+OUTBOX_FOLDER = os.path.join(METADATA_FOLDER, "outbox")
+LOCK_FOLDER = os.path.join(METADATA_FOLDER, "locks")
+ENCRYPTION_FILE = os.path.join(METADATA_FOLDER, "encryption.json")  #Key-derivation salt and a passphrase check value
+ENCRYPTION_PASSPHRASE_ENV = "KANBAN_ENCRYPTION_PASSPHRASE"  #Boards and logs are encrypted at rest while this is set
+ENCRYPTED_MAGIC = b"KBE2"
+LEGACY_ENCRYPTED_MAGIC = b"KBE1"  #Read for compatibility and rewritten as KBE2 on the next write or append
+ENCRYPTION_CHUNK = 64 * 1024  #Plaintext bytes per authenticated chunk
+BACKUP_MANIFEST = "backup.json"  #First member of every backup archive
+BACKUP_ENCRYPTION = "encryption.json"
+BACKUP_SPOOL_MEMORY = 8 * 1024 * 1024  #Files up to this size are snapshotted in memory for the backup, larger ones on disk
+BACKUP_MEMBER = re.compile(r"^(?:projects/(?P<board>[^/]+)\.xml|projects/Log_(?P<log>[^/]+)\.csv|archive/(?P<archive>[^/]+)\.jsonl\.gz)$")
+DONE_COLUMN = "Done"  #Tasks moved into this column count towards throughput and cycle time
+TASK_FIELDS = ("title", "assignee", "start_date", "end_date", "description", "blocked_by")  #blocked_by: space-separated task ids
+LOG_HEADER = "timestamp,action,details\n"
+LOG_TASK_ID = r"(?: \[id ([^\]]+)\])?"  #Task entries end in " [id <task id>]" so renamed tasks can be followed
+TODO_COLUMN = "To Do"  #New tasks start here; it cannot be deleted and always comes first
+MAX_BOARD_TASKS = 50
+MAX_BOARD_COLUMNS = 10
+MAX_WIP_LIMIT = 50
+
+
+def fsync_directory(directory):
+    #makes the rename itself durable; Windows has no directory handles to fsync
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_umask():
+    #os.umask can only be read by setting it, which is not safe once other threads run
+    current = os.umask(0o022)
+    os.umask(current)
+    return current
+
+
+process_umask = read_umask()
+
+
+@contextmanager
+def atomic_open(file_path, mode="wb", **kwargs):
+    #writes go to a temp file in the same directory, which replaces the target only once it is on disk,
+    #so readers and crashes see either the old file or the new one, never a truncated mix
+    directory = os.path.dirname(file_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory)
+    try:
+        #mkstemp creates the file as 0600; keep the mode of the file being replaced, or the usual one for a new file
+        try:
+            file_mode = os.stat(file_path).st_mode & 0o7777
+        except FileNotFoundError:
+            file_mode = 0o666 & ~process_umask
+        os.chmod(temp_path, file_mode)
+        with open(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    fsync_directory(directory)
+
+
+def atomic_write(file_path, data):
+    with atomic_open(file_path) as f:
+        f.write(data.encode("utf-8") if isinstance(data, str) else data)
+
+
+def lock_path(file_path):
+    #one lock file per target under a single folder, named by a hash of the target's absolute path
+    digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(LOCK_FOLDER, f"{digest}-{os.path.basename(file_path)[:100]}.lock")
+
+
+@contextmanager
+def file_lock(file_path):
+    #Advisory lock on the target's file in LOCK_FOLDER; it serializes writers across processes, readers
+    #never take it. The lock file is removed on release once the target is gone (deleted or renamed), so
+    #a locker that waited on a removed lock file sees it has been replaced and locks again.
+    path = lock_path(file_path)
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    os.makedirs(LOCK_FOLDER, exist_ok=True)
+    while True:
+        lock_file = open(path, "a+b")
+        try:
+            if os.name == "nt":
+                import msvcrt
+                lock_file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  #LK_LOCK gives up after ten seconds
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    current = os.path.samestat(os.fstat(lock_file.fileno()), os.stat(path))
+                except FileNotFoundError:
+                    current = False
+                if not current:
+                    lock_file.close()
+                    continue
+        except BaseException:
+            lock_file.close()
+            raise
+        break
+    with lock_file:
+        try:
+            yield
+            if os.name != "nt" and not os.path.exists(file_path):
+                os.remove(path)  #Windows cannot remove a file that is still open, so it keeps its lock files
+        finally:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class FileCipher:
+    #AES-256-GCM over independently authenticated chunks: "KBE2" + 16-byte file salt, then chunks of
+    #[4-byte ciphertext length][12-byte nonce][ciphertext + tag]. The salt, the chunk's file offset and a
+    #flag are the associated data: data chunks carry 0, and every write or append ends with an empty end
+    #record carrying 1. Chunks cannot be reordered or spliced between files, and readers stop at the last
+    #end record, so chunks cut off the end are never read as a complete file. KBE1 files have no flag
+    #(final=None).
+    def __init__(self, passphrase):
+        if AESGCM is None:
+            raise RuntimeError(f"{ENCRYPTION_PASSPHRASE_ENV} is set but the 'cryptography' package is not installed")
+        self.aead_class = AESGCM
+        self.master_key = self.derive_master_key(passphrase)
+        self.file_keys = {}
+
+    def derive_master_key(self, passphrase):
+        #scrypt is deliberately slow, so it runs once per session; per-file keys come from the cheap HKDF below
+        with file_lock(ENCRYPTION_FILE):
+            try:
+                with open(ENCRYPTION_FILE, "r", encoding="utf-8") as f:
+                    params = json.load(f)
+            except (OSError, ValueError):
+                params = {"salt": os.urandom(16).hex(), "n": 2 ** 15}
+            master_key = Scrypt(salt=bytes.fromhex(params["salt"]), length=32, n=params["n"], r=8,
+                                p=1).derive(passphrase.encode("utf-8"))
+            check = hmac.new(master_key, b"kanban-key-check", hashlib.sha256).hexdigest()
+            if "check" not in params:
+                params["check"] = check
+                atomic_write(ENCRYPTION_FILE, json.dumps(params))
+            elif not hmac.compare_digest(check, params["check"]):
+                raise ValueError(f"{ENCRYPTION_PASSPHRASE_ENV} does not match the key these project files use")
+        return master_key
+
+    def file_aead(self, salt):
+        aead = self.file_keys.get(salt)
+        if aead is None:
+            key = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b"kanban-file").derive(self.master_key)
+            if len(self.file_keys) >= 4096:
+                self.file_keys.clear()
+            aead = self.file_keys[salt] = self.aead_class(key)
+        return aead
+
+    def associated_data(self, salt, position, final):
+        data = salt + position.to_bytes(8, "big")
+        return data if final is None else data + (b"\x01" if final else b"\x00")
+
+    def encrypt_chunk(self, salt, position, data, final):
+        nonce = os.urandom(12)
+        ciphertext = self.file_aead(salt).encrypt(nonce, data, self.associated_data(salt, position, final))
+        return len(ciphertext).to_bytes(4, "big") + nonce + ciphertext
+
+    def decrypt_chunk(self, salt, position, nonce, ciphertext, final):
+        return self.file_aead(salt).decrypt(nonce, ciphertext, self.associated_data(salt, position, final))
+
+
+file_ciphers = {}
+file_ciphers_lock = threading.Lock()
+
+
+def get_file_cipher():
+    passphrase = os.environ.get(ENCRYPTION_PASSPHRASE_ENV)
+    if not passphrase:
+        return None
+    with file_ciphers_lock:
+        cipher = file_ciphers.get(passphrase)
+        if cipher is None:
+            cipher = file_ciphers[passphrase] = FileCipher(passphrase)
+    return cipher
+
+
+def require_file_cipher(file_path):
+    cipher = get_file_cipher()
+    if cipher is None:
+        raise OSError(f"{file_path} is encrypted; set {ENCRYPTION_PASSPHRASE_ENV} to open it")
+    return cipher
+
+
+ENCRYPTED_HEADER_SIZE = len(ENCRYPTED_MAGIC) + 16
+CHUNK_OVERHEAD = 4 + 12 + 16  #length prefix, nonce and GCM tag
+END_RECORD_LENGTH = 16  #Ciphertext length of an end record: the GCM tag of an empty chunk
+chunk_maps = {}
+chunk_maps_lock = threading.Lock()
+
+
+def encrypted_chunk_map(file_path, f):
+    #(plaintext offset, file offset, ciphertext length) per complete chunk, read from the length prefixes
+    #only; cached per path and extended incrementally, so reopening an appended log scans just the new chunks.
+    #In KBE2 files the map stops at the last end record: chunks after it belong to an append that has not
+    #finished, or that a crash cut off, and the next append truncates them. Bytes up to an end record are
+    #never rewritten, so the cached map stays valid.
+    size = os.fstat(f.fileno()).st_size
+    f.seek(0)
+    header = f.read(ENCRYPTED_HEADER_SIZE)
+    salt = header[len(ENCRYPTED_MAGIC):]
+    with chunk_maps_lock:
+        cached = chunk_maps.get(file_path)
+    if cached is None or cached["salt"] != salt or cached["scanned"] > size:
+        cached = {"salt": salt, "scanned": ENCRYPTED_HEADER_SIZE, "length": 0, "chunks": []}
+    else:
+        cached = dict(cached, chunks=list(cached["chunks"]))
+    position, length, chunks = cached["scanned"], cached["length"], cached["chunks"]
+    f.seek(position)
+    while position + 4 <= size:
+        ciphertext_length = int.from_bytes(f.read(4), "big")
+        end = position + 16 + ciphertext_length
+        if end > size:
+            break  #a chunk that is still being appended is picked up next time
+        chunks.append((length, position, ciphertext_length))
+        length += ciphertext_length - 16
+        position = end
+        f.seek(position)
+    if header.startswith(ENCRYPTED_MAGIC):
+        while chunks and chunks[-1][2] != END_RECORD_LENGTH:
+            length, position, _ = chunks.pop()
+    cached.update(scanned=position, length=length)
+    with chunk_maps_lock:
+        chunk_maps[file_path] = cached
+    return cached
+
+
+class EncryptedReader(io.RawIOBase):
+    #seekable plaintext view of an encrypted file that decrypts one chunk at a time
+    def __init__(self, file_path, cipher):
+        self.file = open(file_path, "rb")
+        try:
+            self.legacy = self.file.read(len(ENCRYPTED_MAGIC)) == LEGACY_ENCRYPTED_MAGIC
+            layout = encrypted_chunk_map(file_path, self.file)
+            self.cipher = cipher
+            self.salt = layout["salt"]
+            self.chunks = layout["chunks"]
+            self.starts = [chunk[0] for chunk in self.chunks]
+            self.size = layout["length"]
+            self.position = 0
+            self.cached_index = None
+            self.cached_data = b""
+            if not self.legacy:
+                #the map ends at the last end record, which has to authenticate as one
+                if not self.chunks:
+                    raise OSError(f"{file_path} is truncated")
+                self.chunk(len(self.chunks) - 1, final=True)
+        except BaseException:
+            self.file.close()
+            raise
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(offset, 0)
+        return self.position
+
+    def chunk(self, index, final=False):
+        if index != self.cached_index:
+            _, position, ciphertext_length = self.chunks[index]
+            self.file.seek(position + 4)
+            nonce = self.file.read(12)
+            try:
+                self.cached_data = self.cipher.decrypt_chunk(self.salt, position, nonce,
+                                                             self.file.read(ciphertext_length),
+                                                             None if self.legacy else final)
+            except (InvalidTag, ValueError):  #ValueError: a nonce cut short by a truncated file
+                raise OSError(f"{self.file.name} failed authentication at byte {position}") from None
+            self.cached_index = index
+        return self.cached_data
+
+    def readinto(self, buffer):
+        if self.position >= self.size:
+            return 0
+        index = bisect.bisect_right(self.starts, self.position) - 1
+        data = self.chunk(index)
+        offset = self.position - self.starts[index]
+        count = min(len(buffer), len(data) - offset)
+        buffer[:count] = data[offset:offset + count]
+        self.position += count
+        return count
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def is_encrypted_file(file_path):
+    with open(file_path, "rb") as f:
+        return f.read(len(ENCRYPTED_MAGIC)) in (ENCRYPTED_MAGIC, LEGACY_ENCRYPTED_MAGIC)
+
+
+def open_project_file(file_path):
+    #binary, seekable reader over the plaintext of a board or log, whether or not it is encrypted
+    if not is_encrypted_file(file_path):
+        return open(file_path, "rb")
+    return io.BufferedReader(EncryptedReader(file_path, require_file_cipher(file_path)), ENCRYPTION_CHUNK)
+
+
+def project_file_size(file_path):
+    #plaintext length, so log offsets mean the same thing for encrypted and plain files
+    if not is_encrypted_file(file_path):
+        return os.path.getsize(file_path)
+    require_file_cipher(file_path)
+    with open(file_path, "rb") as f:
+        return encrypted_chunk_map(file_path, f)["length"]
+
+
+def write_encrypted(f, cipher, source):
+    #streams one chunk at a time from a binary reader, so only a single chunk is ever held in memory
+    salt = os.urandom(16)
+    f.write(ENCRYPTED_MAGIC + salt)
+    while True:
+        data = source.read(ENCRYPTION_CHUNK)
+        if not data:
+            break
+        f.write(cipher.encrypt_chunk(salt, f.tell(), data, final=False))
+    f.write(cipher.encrypt_chunk(salt, f.tell(), b"", final=True))
+
+
+def encrypted_append(cipher, salt, position, data):
+    #a data chunk and the end record after it, to be written at position
+    chunk = cipher.encrypt_chunk(salt, position, data, final=False)
+    return chunk + cipher.encrypt_chunk(salt, position + len(chunk), b"", final=True)
+
+
+def write_project_stream(file_path, source):
+    #atomic write from a binary reader, encrypted when a passphrase is configured
+    cipher = get_file_cipher()
+    with atomic_open(file_path) as f:
+        if cipher is None:
+            shutil.copyfileobj(source, f)
+        else:
+            write_encrypted(f, cipher, source)
+
+
+def write_project_file(file_path, data):
+    #atomic write of a board, checkpoint or other project data, encrypted when a passphrase is configured
+    data = data.encode("utf-8") if isinstance(data, str) else data
+    if get_file_cipher() is None:
+        atomic_write(file_path, data)
+        return
+    write_project_stream(file_path, io.BytesIO(data))
+
+
+def read_project_json(file_path):
+    with open_project_file(file_path) as f:
+        return json.loads(f.read())
+
+
+def append_project_file(file_path, data, header=b"", durable=False):
+    #One append-mode write per call under the lock, so concurrent writers never interleave and a crash
+    #can only cut off the last entry, which the readers already skip. header is written first into a new
+    #file. With a passphrase set, a plaintext or KBE1 file is rewritten encrypted once; after that each
+    #append writes a data chunk and an end record after the last end record, and never rewrites earlier bytes.
+    if not data:
+        return
+    with file_lock(file_path):
+        cipher = get_file_cipher()
+        with open(file_path, "a+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(0)
+            magic = f.read(len(ENCRYPTED_MAGIC))
+        if size and magic == LEGACY_ENCRYPTED_MAGIC:
+            cipher = require_file_cipher(file_path)
+        if size and cipher is not None and magic != ENCRYPTED_MAGIC:
+            with open_project_file(file_path) as source:
+                write_project_stream(file_path, source)
+        with open(file_path, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            magic = f.read(len(ENCRYPTED_MAGIC))
+            if size == 0:
+                data = header + data
+                if cipher is not None:
+                    salt = os.urandom(16)
+                    data = ENCRYPTED_MAGIC + salt + encrypted_append(cipher, salt, ENCRYPTED_HEADER_SIZE, data)
+            elif magic == ENCRYPTED_MAGIC:
+                layout = encrypted_chunk_map(file_path, f)
+                if layout["scanned"] < size:
+                    size = layout["scanned"]
+                    f.truncate(size)  #an append that a crash cut off before its end record never completed
+                data = encrypted_append(require_file_cipher(file_path), layout["salt"], size, data)
+            f.seek(size)
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def format_log_line(timestamp, action, details):
+    #csv quoting keeps commas and quotes in titles inside the details field; line breaks are flattened
+    #so every entry stays one physical line for the line-based log readers
+    row = io.StringIO()
+    csv.writer(row, lineterminator="\n").writerow([timestamp, action, re.sub(r"[\r\n]+", " ", details)])
+    return row.getvalue()
+
+
+def parse_log_line(line):
+    #(timestamp, action, details) of one log line, or None for the header and malformed lines. Entries
+    #written before the log was csv-quoted have unquoted details, commas and all, so only a quoted
+    #field goes through the csv parser
+    parts = line.rstrip("\r\n").split(",", 2)
+    if len(parts) < 3 or parts[0] == "timestamp":
+        return None
+    if parts[1].startswith('"') or parts[2].startswith('"'):
+        try:
+            parts = next(csv.reader([line.rstrip("\r\n")]))
+        except (csv.Error, StopIteration):
+            return None
+        if len(parts) != 3:
+            return None
+    return parts[0], parts[1], parts[2]
+
+
+def append_log_line(file_path, line):
+    append_project_file(file_path, line.encode("utf-8"), LOG_HEADER.encode("utf-8"))
+
+
+def load_admins():
+    if not os.path.exists(ADMINS_FILE):
+        return {}
+    with open(ADMINS_FILE, "r") as f:
+        return json.load(f)
+
+
+def save_admins(admins):
+    with file_lock(ADMINS_FILE):
+        atomic_write(ADMINS_FILE, json.dumps(admins))
+
+
+def add_admin(username, password_hash):
+    #read-modify-write under the lock so concurrent registrations cannot drop each other
+    with file_lock(ADMINS_FILE):
+        admins = load_admins()
+        if username in admins:
+            return False
+        admins[username] = password_hash
+        atomic_write(ADMINS_FILE, json.dumps(admins))
+    return True
+
+
+def read_board(file_path):
+    with open_project_file(file_path) as f:
+        root = ET.parse(f).getroot()
+    columns = []
+    for column_element in root.findall("column"):
+        try:
+            wip_limit = int(column_element.get("wip_limit", "0"))
+        except ValueError:
+            wip_limit = 0
+        tasks = []
+        for task_element in column_element.findall("task"):
+            task = {field: task_element.findtext(field) or "" for field in TASK_FIELDS}
+            task["id"] = task_element.get("id", "")
+            tasks.append(task)
+        columns.append({"name": column_element.get("name"), "wip_limit": wip_limit, "tasks": tasks})
+    try:
+        version = int(root.get("version", "0"))
+    except ValueError:
+        version = 0
+    return {"version": version, "columns": columns}
+
+
+def board_to_xml(board):
+    root = ET.Element("kanban_board", version=str(board.get("version", 0)))
+    for column in board["columns"]:
+        column_element = ET.SubElement(root, "column", name=column["name"], wip_limit=str(column["wip_limit"]))
+        for task in column["tasks"]:
+            task_element = ET.SubElement(column_element, "task", id=task.get("id", ""))
+            for field in TASK_FIELDS:
+                ET.SubElement(task_element, field).text = task.get(field, "")
+    return ET.tostring(root, encoding="utf-8")
+
+
+class ProjectLayout:
+    #Flat: boards and logs sit directly in PROJECTS_FOLDER. Sharded: each project lives in
+    #PROJECTS_FOLDER/<aa>/<bb>/ named after a hash of the project, so finding its files never
+    #lists a directory, and manifest.json holds the project list instead of a folder scan
+    def __init__(self):
+        self.manifest_mtime = None
+        self.load()
+
+    def load(self):
+        try:
+            self.manifest_mtime = os.stat(MANIFEST_FILE).st_mtime
+            with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.manifest_mtime = None
+            data = {}
+        self.sharded = data.get("layout") == "sharded"
+        self.depth = data.get("depth", SHARD_DEPTH)
+        self.projects = set(data.get("projects", []))
+
+    def save(self):
+        atomic_write(MANIFEST_FILE, json.dumps({"layout": "sharded", "depth": self.depth,
+                                                "projects": sorted(self.projects)}))
+        self.manifest_mtime = os.stat(MANIFEST_FILE).st_mtime
+
+    def reload_if_changed(self):
+        try:
+            mtime = os.stat(MANIFEST_FILE).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self.manifest_mtime:
+            self.load()
+
+    def folder(self, project_name, sharded=None):
+        if not (self.sharded if sharded is None else sharded):
+            return PROJECTS_FOLDER
+        digest = hashlib.sha1(project_name.encode("utf-8")).hexdigest()
+        return os.path.join(PROJECTS_FOLDER, *(digest[2 * i:2 * i + 2] for i in range(self.depth)))
+
+    def names(self):
+        if self.sharded:
+            self.reload_if_changed()
+            return sorted(self.projects)
+        try:
+            return sorted(entry.name[:-4] for entry in os.scandir(PROJECTS_FOLDER)
+                          if entry.name.endswith(".xml") and entry.is_file())
+        except OSError:
+            return []
+
+    def add(self, project_name):
+        if not self.sharded or project_name in self.projects:
+            return
+        with file_lock(MANIFEST_FILE):
+            self.load()  #another process may have added projects since
+            self.projects.add(project_name)
+            self.save()
+
+    def remove(self, project_name):
+        if not self.sharded:
+            return
+        with file_lock(MANIFEST_FILE):
+            self.load()
+            if project_name in self.projects:
+                self.projects.discard(project_name)
+                self.save()
+
+    def update(self, added=(), removed=()):
+        #one manifest write for a batch of project changes
+        if not self.sharded:
+            return
+        with file_lock(MANIFEST_FILE):
+            self.load()
+            projects = (self.projects - set(removed)) | set(added)
+            if projects != self.projects:
+                self.projects = projects
+                self.save()
+
+
+project_layout = None
+
+
+def get_project_layout():
+    global project_layout
+    if project_layout is None:
+        project_layout = ProjectLayout()
+    return project_layout
+
+
+def board_path(project_name):
+    return os.path.join(get_project_layout().folder(project_name), f"{project_name}.xml")
+
+
+def log_path(project_name):
+    return os.path.join(get_project_layout().folder(project_name), f"Log_{project_name}.csv")
+
+
+def autosave_path(project_name):
+    return os.path.join(AUTOSAVE_FOLDER, f"{project_name}.xml")
+
+
+def archive_path(project_name):
+    return os.path.join(ARCHIVE_FOLDER, f"{project_name}.jsonl.gz")
+
+
+def metadata_paths(project_name):
+    #per-project stores under .kanban that hold board contents and are encrypted along with the boards
+    return [archive_path(project_name), os.path.join(METRICS_FOLDER, f"{project_name}.json"),
+            os.path.join(LOG_INDEX_FOLDER, f"{project_name}.json"),
+            os.path.join(OUTBOX_FOLDER, f"{project_name}.jsonl"),
+            os.path.join(OUTBOX_FOLDER, f"{project_name}.base.json")]
+
+
+def project_file_path(project_name):
+    if not project_name or os.sep in project_name or "/" in project_name or project_name.startswith("."):
+        return None
+    return board_path(project_name)
+
+
+class ProjectCatalog:
+    def __init__(self):
+        self.entries = {}
+        self.folder_mtime = None
+        self.catalog_mtime = None
+        self.manifest_mtime = None  #manifest the sharded boards were last stat'ed against
+        self.load()
+
+    def load(self):
+        try:
+            self.catalog_mtime = os.stat(CATALOG_FILE).st_mtime
+            with open(CATALOG_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = data.get("projects", {})
+            self.folder_mtime = data.get("folder_mtime")
+        except (OSError, ValueError):
+            self.entries = {}
+            self.folder_mtime = None
+            self.catalog_mtime = None
+
+    def save(self):
+        atomic_write(CATALOG_FILE, json.dumps({"folder_mtime": self.folder_mtime, "projects": self.entries}))
+        self.catalog_mtime = os.stat(CATALOG_FILE).st_mtime
+
+    def reload_if_changed(self):
+        #saves and deletes in other processes reach this one through catalog.json; one stat checks for them
+        try:
+            mtime = os.stat(CATALOG_FILE).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self.catalog_mtime:
+            self.load()
+
+    def names(self):
+        return sorted(self.entries)
+
+    def refresh(self, force=False):
+        #flat boards are compared by their own stat, since a board edited in place leaves the folder
+        #mtime unchanged; only boards whose mtime or size moved are parsed again
+        try:
+            folder_mtime = os.stat(PROJECTS_FOLDER).st_mtime
+        except OSError:
+            if self.entries:
+                self.entries = {}
+                self.folder_mtime = None
+                self.save()
+            return False
+        self.reload_if_changed()
+        layout = get_project_layout()
+        if layout.sharded:
+            #boards are spread over shard directories, so they are only stat'ed when the manifest says
+            #projects came or went; saves keep their own entries current through record_save
+            names = layout.names()
+            if not force and layout.manifest_mtime == self.manifest_mtime:
+                return False
+            self.manifest_mtime = layout.manifest_mtime
+            boards = self.stat_boards(names)
+        else:
+            boards = ((entry.name[:-4], entry.stat()) for entry in os.scandir(PROJECTS_FOLDER)
+                      if entry.name.endswith(".xml") and entry.is_file())
+
+        seen = set()
+        changed = folder_mtime != self.folder_mtime
+        for name, stat in boards:
+            seen.add(name)
+            cached = self.entries.get(name)
+            if cached and cached["mtime"] == stat.st_mtime and cached["size"] == stat.st_size:
+                continue
+            self.entries[name] = self.scan_board(name, stat)
+            changed = True
+        for name in set(self.entries) - seen:
+            del self.entries[name]
+            changed = True
+
+        self.folder_mtime = folder_mtime
+        if changed:
+            self.save()
+        return changed
+
+    def stat_boards(self, names):
+        for name in names:
+            try:
+                yield name, os.stat(board_path(name))
+            except OSError:
+                continue
+
+    def scan_board(self, name, stat):
+        columns = tasks = 0
+        try:
+            with open_project_file(board_path(name)) as f:
+                for _, element in ET.iterparse(f):
+                    if element.tag == "task":
+                        tasks += 1
+                        element.clear()
+                    elif element.tag == "column":
+                        columns += 1
+                        element.clear()
+        except (ET.ParseError, OSError):
+            pass
+        return self.make_entry(name, stat, columns, tasks)
+
+    def make_entry(self, name, stat, columns, tasks):
+        try:
+            log_mtime = os.stat(log_path(name)).st_mtime
+        except OSError:
+            log_mtime = 0
+        return {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "columns": columns,
+            "tasks": tasks,
+            "last_activity": max(stat.st_mtime, log_mtime),
+        }
+
+    def record_save(self, name, columns, tasks):
+        try:
+            stat = os.stat(board_path(name))
+        except OSError:
+            return
+        self.reload_if_changed()
+        self.entries[name] = self.make_entry(name, stat, columns, tasks)
+        get_project_layout().add(name)
+        self.save()
+
+    def record_delete(self, name):
+        self.reload_if_changed()
+        self.entries.pop(name, None)
+        get_project_layout().remove(name)
+        self.save()
+
+    def record_changes(self, added=(), removed=()):
+        self.reload_if_changed()
+        for name in removed:
+            self.entries.pop(name, None)
+        for name, stat in self.stat_boards(added):
+            self.entries[name] = self.scan_board(name, stat)
+        get_project_layout().update(added, removed)
+        self.save()
+
+    def describe(self, name):
+        entry = self.entries.get(name)
+        if not entry:
+            return "Not saved yet"
+        last_activity = datetime.fromtimestamp(entry["last_activity"]).strftime("%Y-%m-%d %H:%M")
+        return (f"Tasks: {entry['tasks']}\n"
+                f"Columns: {entry['columns']}\n"
+                f"Last activity: {last_activity}")
+
+
+project_catalog = None
+
+
+def get_project_catalog(refresh=True):
+    #shared by every MainMenu so reopening the menu does not touch the disk again. Saves, batches and
+    #searches pass refresh=False: they only need the entries other processes recorded, not a board scan.
+    global project_catalog
+    if project_catalog is None:
+        project_catalog = ProjectCatalog()
+    if refresh:
+        project_catalog.refresh()
+    else:
+        project_catalog.reload_if_changed()
+    return project_catalog
+
+
+def remove_search_database(path=SEARCH_INDEX_FILE):
+    #a plaintext index left over from before encryption was turned on
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+class SearchIndex:
+    #With a passphrase configured the index holds board text, so it lives in memory only (one connection
+    #shared by all threads under a lock) and is rebuilt from the encrypted boards on the first refresh
+    def __init__(self, path=SEARCH_INDEX_FILE):
+        self.path = path
+        self.local = threading.local()  #sqlite connections cannot be shared between threads
+        self.in_memory = get_file_cipher() is not None
+        self.lock = threading.RLock() if self.in_memory else nullcontext()
+        self.shared = None
+        if self.in_memory:
+            remove_search_database(path)
+
+    def connection(self):
+        conn = self.shared if self.in_memory else getattr(self.local, "conn", None)
+        if conn is None:
+            if self.in_memory:
+                conn = sqlite3.connect(":memory:", check_same_thread=False)
+            else:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=10)
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    task_id TEXT UNIQUE,
+                    project TEXT,
+                    column_name TEXT,
+                    title TEXT,
+                    assignee TEXT,
+                    description TEXT
+                );
+                CREATE INDEX IF NOT EXISTS tasks_project ON tasks(project);
+                CREATE TABLE IF NOT EXISTS indexed_projects (name TEXT PRIMARY KEY, mtime REAL);
+                CREATE VIRTUAL TABLE IF NOT EXISTS task_text USING fts5(
+                    title, assignee, description, content='tasks', content_rowid='id', prefix='2 3'
+                );
+                CREATE TRIGGER IF NOT EXISTS tasks_ai AFTER INSERT ON tasks BEGIN
+                    INSERT INTO task_text(rowid, title, assignee, description)
+                    VALUES (new.id, new.title, new.assignee, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tasks_ad AFTER DELETE ON tasks BEGIN
+                    INSERT INTO task_text(task_text, rowid, title, assignee, description)
+                    VALUES ('delete', old.id, old.title, old.assignee, old.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tasks_au AFTER UPDATE ON tasks BEGIN
+                    INSERT INTO task_text(task_text, rowid, title, assignee, description)
+                    VALUES ('delete', old.id, old.title, old.assignee, old.description);
+                    INSERT INTO task_text(rowid, title, assignee, description)
+                    VALUES (new.id, new.title, new.assignee, new.description);
+                END;
+            """)
+            if self.in_memory:
+                self.shared = conn
+            else:
+                self.local.conn = conn
+        return conn
+
+    def upsert_task(self, project, task_id, column_name, title, assignee, description):
+        with self.lock, self.connection() as conn:
+            conn.execute("""
+                INSERT INTO tasks (task_id, project, column_name, title, assignee, description)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(task_id) DO UPDATE SET project = excluded.project,
+                    column_name = excluded.column_name, title = excluded.title,
+                    assignee = excluded.assignee, description = excluded.description
+            """, (task_id, project, column_name, title, assignee, description))
+
+    def delete_task(self, task_id):
+        with self.lock, self.connection() as conn:
+            conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def delete_project(self, project):
+        with self.lock, self.connection() as conn:
+            conn.execute("DELETE FROM tasks WHERE project = ?", (project,))
+            conn.execute("DELETE FROM indexed_projects WHERE name = ?", (project,))
+
+    def index_project(self, project, board, mtime):
+        rows = []
+        for column_index, column in enumerate(board["columns"]):
+            for task_index, task in enumerate(column["tasks"]):
+                #boards saved before tasks had ids get a position-based id until they are saved again
+                task_id = task.get("id") or f"{project}:{column_index}:{task_index}"
+                rows.append((task_id, project, column["name"], task["title"], task["assignee"], task["description"]))
+        with self.lock, self.connection() as conn:
+            conn.execute("DELETE FROM tasks WHERE project = ?", (project,))
+            conn.executemany("""
+                INSERT OR REPLACE INTO tasks (task_id, project, column_name, title, assignee, description)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.execute("INSERT OR REPLACE INTO indexed_projects (name, mtime) VALUES (?, ?)", (project, mtime))
+
+    def mark_current(self, project, mtime):
+        with self.lock, self.connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO indexed_projects (name, mtime) VALUES (?, ?)", (project, mtime))
+
+    def refresh(self, catalog):
+        #only boards changed outside this process since they were last indexed are re-read
+        with self.lock:
+            indexed = dict(self.connection().execute("SELECT name, mtime FROM indexed_projects"))
+        for name, entry in catalog.entries.items():
+            if indexed.pop(name, None) == entry["mtime"]:
+                continue
+            try:
+                self.index_project(name, read_board(board_path(name)), entry["mtime"])
+            except (OSError, ET.ParseError):
+                continue
+        for name in indexed:
+            self.delete_project(name)
+
+    def search(self, text, limit=50):
+        terms = re.findall(r"\w+", text.lower())
+        if not terms:
+            return []
+        #every term must match, the last one as a prefix so results follow the user's typing
+        query = " ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+        with self.lock:
+            rows = self.connection().execute("""
+                SELECT tasks.project, tasks.task_id, tasks.column_name, tasks.title, tasks.assignee
+                FROM task_text JOIN tasks ON tasks.id = task_text.rowid
+                WHERE task_text MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (query.strip(), limit)).fetchall()
+        return [{"project": project, "id": task_id, "column": column_name, "title": title, "assignee": assignee}
+                for project, task_id, column_name, title, assignee in rows]
+
+
+search_index = None
+
+
+def get_search_index(refresh=True):
+    global search_index
+    if search_index is None:
+        search_index = SearchIndex()
+    if refresh:
+        search_index.refresh(get_project_catalog(refresh=False))
+    return search_index
+
+
+class FlowMetrics:
+    #Tasks are tracked by the id at the end of their log entries; entries written before ids were
+    #logged only carry the title, so those fall back to it
+    CREATED = re.compile(r"^'(.*)' in column '(.*)'" + LOG_TASK_ID + "$")
+    MOVED = re.compile(r"^'(.*)' moved to '(.*)'" + LOG_TASK_ID + "$")
+    DELETED = re.compile(r"^'(.*)' deleted" + LOG_TASK_ID + "$")
+    RENAMED = re.compile(r"^'(.*)' renamed to '(.*)'$")
+    ARCHIVED = re.compile(r"^'(.*)' archived" + LOG_TASK_ID + "$")
+    COLUMN_DELETED = re.compile(r"^'(.*)' column deleted$")
+
+    def __init__(self, project):
+        self.project = project
+        self.checkpoint_path = os.path.join(METRICS_FOLDER, f"{project}.json")
+        self.lock = threading.Lock()
+        self.reset()
+        self.load()
+
+    def reset(self):
+        self.offset = 0
+        self.events = 0
+        self.first_day = None      #ordinal of the first logged day; arrays are indexed from it
+        self.tasks = {}            #task id (or title) -> [column, entered_at, created_at]
+        self.counts = {}           #column -> tasks currently in it
+        self.residence = {}        #column -> [seconds, completed visits]
+        self.throughput = array("i")
+        self.flow = {}             #column -> array of end-of-day counts
+        self.cycle_times = array("d")
+
+    def load(self):
+        try:
+            data = read_project_json(self.checkpoint_path)
+        except (OSError, ValueError):
+            return
+        self.offset = data["offset"]
+        self.events = data["events"]
+        self.first_day = data["first_day"]
+        self.tasks = data["tasks"]
+        self.counts = data["counts"]
+        self.residence = data["residence"]
+        self.throughput = array("i", data["throughput"])
+        self.flow = {column: array("i", counts) for column, counts in data["flow"].items()}
+        self.cycle_times = array("d", data["cycle_times"])
+
+    def save(self):
+        data = {
+            "offset": self.offset,
+            "events": self.events,
+            "first_day": self.first_day,
+            "tasks": self.tasks,
+            "counts": self.counts,
+            "residence": self.residence,
+            "throughput": self.throughput.tolist(),
+            "flow": {column: counts.tolist() for column, counts in self.flow.items()},
+            "cycle_times": self.cycle_times.tolist(),
+        }
+        write_project_file(self.checkpoint_path, json.dumps(data))
+
+    def update(self):
+        #reads only the bytes appended since the last checkpoint
+        with self.lock:
+            try:
+                size = project_file_size(log_path(self.project))
+            except OSError:
+                return False
+            if size < self.offset:
+                self.reset()
+            if size == self.offset:
+                return False
+
+            with open_project_file(log_path(self.project)) as f:
+                f.seek(self.offset)
+                data = f.read(size - self.offset)
+            end = data.rfind(b"\n") + 1  #a partially written last line is picked up next time
+            for line in data[:end].splitlines():
+                self.apply(line.decode("utf-8", errors="replace"))
+            self.offset += end
+            self.save()
+            return True
+
+    def apply(self, line):
+        parts = parse_log_line(line)
+        if not parts:
+            return
+        try:
+            moment = datetime.strptime(parts[0], "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return
+        timestamp = moment.timestamp()
+        self.advance_to(moment.toordinal())
+        action, details = parts[1], parts[2]
+        self.events += 1
+
+        if action == "Task Created":
+            match = self.CREATED.match(details)
+            if match:
+                self.enter(match.group(3) or match.group(1), match.group(2), timestamp, timestamp)
+        elif action == "Task Moved":
+            match = self.MOVED.match(details)
+            if match:
+                title, column, task_id = match.groups()
+                created_at = self.leave_task(task_id, title, timestamp)
+                self.enter(task_id or title, column, timestamp, timestamp if created_at is None else created_at)
+                if column.lower() == DONE_COLUMN.lower():
+                    self.throughput[-1] += 1
+                    if created_at is not None:
+                        self.cycle_times.append(timestamp - created_at)
+        elif action == "Task Deleted":
+            match = self.DELETED.match(details)
+            if match:
+                self.leave_task(match.group(2), match.group(1), timestamp)
+        elif action == "Task Archived":
+            match = self.ARCHIVED.match(details)
+            if match:
+                self.leave_task(match.group(2), match.group(1), timestamp)
+        elif action == "Task Restored":
+            #a restored task re-enters its column now, which also restarts its archive age
+            match = self.CREATED.match(details)
+            if match:
+                self.enter(match.group(3) or match.group(1), match.group(2), timestamp, timestamp)
+        elif action == "Column Renamed":
+            match = self.RENAMED.match(details)
+            if match:
+                self.rename(*match.groups())
+        elif action == "Column Deleted":
+            #the column's tasks go with it without entries of their own
+            match = self.COLUMN_DELETED.match(details)
+            if match:
+                for key in [key for key, state in self.tasks.items() if state[0] == match.group(1)]:
+                    self.leave(key, timestamp)
+
+    def advance_to(self, day):
+        if self.first_day is None:
+            self.first_day = day
+            self.throughput.append(0)
+        #close every day between the last event and this one with the counts at that time
+        while self.first_day + len(self.throughput) - 1 < day:
+            self.close_day()
+            self.throughput.append(0)
+
+    def close_day(self):
+        days = len(self.throughput)
+        for column in self.counts:
+            if column not in self.flow:
+                self.flow[column] = array("i", [0] * (days - 1))
+        for column, counts in self.flow.items():
+            counts.append(self.counts.get(column, 0))
+
+    def enter(self, key, column, timestamp, created_at):
+        if key in self.tasks:
+            self.leave(key, timestamp)  #a title reused by a task logged without an id
+        self.tasks[key] = [column, timestamp, created_at]
+        self.counts[column] = self.counts.get(column, 0) + 1
+
+    def leave(self, key, timestamp):
+        state = self.tasks.pop(key, None)
+        if state is None:
+            return None
+        column, entered_at, created_at = state
+        self.counts[column] = max(self.counts.get(column, 0) - 1, 0)
+        totals = self.residence.setdefault(column, [0.0, 0])
+        totals[0] += timestamp - entered_at
+        totals[1] += 1
+        return created_at
+
+    def leave_task(self, task_id, title, timestamp):
+        #a task created before ids were logged is still tracked under its title
+        return self.leave(task_id if task_id in self.tasks else title, timestamp)
+
+    def rename(self, old, new):
+        for state in self.tasks.values():
+            if state[0] == old:
+                state[0] = new
+        for table in (self.counts, self.residence, self.flow):
+            if old in table and new not in table:
+                table[new] = table.pop(old)
+
+    def summary(self, days=30):
+        with self.lock:
+            if self.first_day is None:
+                return {"project": self.project, "events": 0, "columns": {}, "throughput": [],
+                        "cumulative_flow": {}, "cycle_time": {"count": 0, "average_hours": 0}}
+
+            start = max(len(self.throughput) - days, 0)
+            start_date = date.fromordinal(self.first_day + start).isoformat()
+            columns = {}
+            for column in set(self.counts) | set(self.residence):
+                seconds, visits = self.residence.get(column, (0.0, 0))
+                columns[column] = {
+                    "current": self.counts.get(column, 0),
+                    "visits": visits,
+                    "average_residence_hours": round(seconds / visits / 3600, 2) if visits else 0,
+                }
+            #the last day is still open, so its cumulative-flow value is the live count
+            closed_days = len(self.throughput) - 1
+            flow = {}
+            for column in set(self.counts) | set(self.flow):
+                closed = self.flow[column].tolist() if column in self.flow else []
+                closed = [0] * (closed_days - len(closed)) + closed
+                flow[column] = closed[start:] + [self.counts.get(column, 0)]
+            cycle_count = len(self.cycle_times)
+            return {
+                "project": self.project,
+                "events": self.events,
+                "columns": columns,
+                "start_date": start_date,
+                "throughput": self.throughput[start:].tolist(),
+                "cumulative_flow": flow,
+                "cycle_time": {
+                    "count": cycle_count,
+                    "average_hours": round(sum(self.cycle_times) / cycle_count / 3600, 2) if cycle_count else 0,
+                },
+            }
+
+
+flow_metrics = {}
+flow_metrics_lock = threading.Lock()  #one engine per project, even when server threads ask at once
+
+
+def get_flow_metrics(project):
+    with flow_metrics_lock:
+        engine = flow_metrics.get(project)
+        if engine is None:
+            engine = flow_metrics[project] = FlowMetrics(project)
+    engine.update()
+    return engine
+
+
+class LogIndex:
+    #Sidecar index over Log_<project>.csv: for every block of lines it keeps the byte
+    #range, the timestamp range and a bitmap of the action types in the block
+    BLOCK_LINES = 256
+
+    def __init__(self, project):
+        self.project = project
+        self.index_path = os.path.join(LOG_INDEX_FOLDER, f"{project}.json")
+        self.lock = threading.Lock()
+        self.reset()
+        self.load()
+
+    def reset(self):
+        self.indexed_to = 0
+        self.actions = []      #bit position -> action name
+        self.blocks = []       #[offset, first_timestamp, last_timestamp, action_mask, line_count, end_offset]
+
+    def load(self):
+        try:
+            data = read_project_json(self.index_path)
+        except (OSError, ValueError):
+            return
+        if any(len(block) != 6 for block in data["blocks"]):
+            return  #written before blocks kept their end offset; rebuilt from the log
+        self.indexed_to = data["indexed_to"]
+        self.actions = data["actions"]
+        self.blocks = data["blocks"]
+
+    def save(self):
+        write_project_file(self.index_path, json.dumps({"indexed_to": self.indexed_to, "actions": self.actions,
+                                                  "blocks": self.blocks}))
+
+    def action_bit(self, action):
+        if action not in self.actions:
+            self.actions.append(action)
+        return 1 << self.actions.index(action)
+
+    def update(self):
+        with self.lock:
+            try:
+                size = project_file_size(log_path(self.project))
+            except OSError:
+                return False
+            if size < self.indexed_to:
+                self.reset()
+            if size == self.indexed_to:
+                return False
+
+            with open_project_file(log_path(self.project)) as f:
+                f.seek(self.indexed_to)
+                offset = self.indexed_to
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  #still being written
+                    self.add_line(offset, line)
+                    offset += len(line)
+            self.indexed_to = offset
+            self.save()
+            return True
+
+    def add_line(self, offset, line):
+        #line_count counts entries only; the block's byte range also covers any malformed or
+        #continuation lines between them, so queries read up to end_offset rather than line_count lines
+        parts = parse_log_line(line.decode("utf-8", errors="replace"))
+        if parts and (not self.blocks or self.blocks[-1][4] >= self.BLOCK_LINES):
+            self.blocks.append([offset, parts[0], parts[0], 0, 0, offset])
+        if not self.blocks:
+            return  #the header
+        block = self.blocks[-1]
+        block[5] = offset + len(line)
+        if not parts:
+            return
+        timestamp, action, _ = parts
+        block[1] = min(block[1], timestamp)
+        block[2] = max(block[2], timestamp)
+        block[3] |= self.action_bit(action)
+        block[4] += 1
+
+    def query(self, start=None, end=None, actions=None, text=None):
+        #timestamps are "YYYY-MM-DD HH:MM:SS", so plain string comparison orders them
+        self.update()
+        mask = 0
+        for action in actions or []:
+            if action in self.actions:
+                mask |= 1 << self.actions.index(action)
+        if actions and not mask:
+            return
+        needle = text.lower() if text else None
+        with self.lock:
+            blocks = [tuple(block) for block in self.blocks]
+
+        with open_project_file(log_path(self.project)) as f:
+            for offset, first, last, block_mask, line_count, end_offset in blocks:
+                if (start and last < start) or (end and first > end) or (mask and not block_mask & mask):
+                    continue
+                f.seek(offset)
+                while offset < end_offset:
+                    line = f.readline()
+                    if not line:
+                        break
+                    offset += len(line)
+                    parts = parse_log_line(line.decode("utf-8", errors="replace"))
+                    if not parts:
+                        continue
+                    timestamp, action, details = parts
+                    if (start and timestamp < start) or (end and timestamp > end):
+                        continue
+                    if actions and action not in actions:
+                        continue
+                    if needle and needle not in details.lower() and needle not in action.lower():
+                        continue
+                    yield {"timestamp": timestamp, "action": action, "details": details}
+
+
+log_indexes = {}
+log_indexes_lock = threading.Lock()
+
+
+def get_log_index(project):
+    with log_indexes_lock:
+        index = log_indexes.get(project)
+        if index is None:
+            index = log_indexes[project] = LogIndex(project)
+    return index
+
+
+EXCHANGE_FIELDS = ("column", "wip_limit", "id") + TASK_FIELDS
+
+
+def normalize_exchange_row(row):
+    #one row is either a task (has a title) or a column definition (column and wip_limit only)
+    record = {field: str(row.get(field) or "").strip() for field in EXCHANGE_FIELDS}
+    record["description"] = str(row.get("description") or "")
+    record["column"] = record["column"] or "To Do"
+    try:
+        record["wip_limit"] = max(int(record["wip_limit"]), 0) if record["wip_limit"] else None
+    except ValueError:
+        record["wip_limit"] = None
+    for field in ("start_date", "end_date"):
+        if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", record[field]):
+            record[field] = ""
+    return record
+
+
+def iter_byte_lines(file_path, on_progress=None):
+    with open(file_path, "rb") as f:
+        for number, raw in enumerate(f):
+            if on_progress:
+                on_progress(len(raw))
+            line = raw.decode("utf-8", errors="replace")
+            yield line.lstrip("\ufeff") if number == 0 else line
+
+
+def iter_csv_records(file_path, on_progress=None):
+    for row in csv.DictReader(iter_byte_lines(file_path, on_progress)):
+        yield normalize_exchange_row(row)
+
+
+def iter_jsonl_records(file_path, on_progress=None):
+    for line in iter_byte_lines(file_path, on_progress):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(row, dict):
+            yield normalize_exchange_row(row)
+
+
+def iter_import_records(file_path, on_progress=None):
+    if file_path.lower().endswith((".jsonl", ".ndjson")):
+        return iter_jsonl_records(file_path, on_progress)
+    return iter_csv_records(file_path, on_progress)
+
+
+def iter_board_records(board):
+    for column in board["columns"]:
+        if not column["tasks"]:
+            yield {"column": column["name"], "wip_limit": column["wip_limit"]}
+        for task in column["tasks"]:
+            record = {"column": column["name"], "wip_limit": column["wip_limit"]}
+            record.update(task)
+            yield record
+
+
+def write_export(file_path, records, on_progress=None):
+    as_jsonl = file_path.lower().endswith((".jsonl", ".ndjson"))
+    count = 0
+    with atomic_open(file_path, "w", encoding="utf-8", newline="") as f:
+        if not as_jsonl:
+            writer = csv.DictWriter(f, fieldnames=EXCHANGE_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+        for count, record in enumerate(records, 1):
+            if as_jsonl:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                writer.writerow(record)
+            if on_progress and count % 200 == 0:
+                on_progress(count)
+    return count
+
+
+def newer_autosave(project_name):
+    #an autosave only matters if it was written after the last explicit save of the board
+    path = autosave_path(project_name)
+    try:
+        autosave_mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    try:
+        board_mtime = os.stat(board_path(project_name)).st_mtime
+    except OSError:
+        board_mtime = 0
+    return path if autosave_mtime > board_mtime else None
+
+
+def discard_autosave(project_name):
+    try:
+        os.remove(autosave_path(project_name))
+    except OSError:
+        pass
+
+
+class AutosaveWriter:
+    #The GUI hands over immutable board snapshots; only the newest pending one is ever written
+    def __init__(self, project_name):
+        self.project_name = project_name
+        self.condition = threading.Condition()
+        self.pending = None
+        self.closed = False
+        self.writes = 0
+        self.write_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, name=f"autosave-{project_name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, board):
+        with self.condition:
+            self.pending = board
+            self.condition.notify()
+
+    def cancel(self):
+        #drops the pending snapshot and waits out a write in progress, so nothing lands after an explicit save
+        with self.condition:
+            self.pending = None
+        with self.write_lock:
+            pass
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                board, self.pending = self.pending, None
+                if board is None:
+                    return
+                self.write_lock.acquire()
+            try:
+                self.write(board)
+            except Exception as e:
+                print(f"Autosave failed for {self.project_name}: {e}")
+            finally:
+                self.write_lock.release()
+
+    def write(self, board):
+        write_project_file(autosave_path(self.project_name), board_to_xml(board))
+        self.writes += 1
+
+    def close(self, flush=True):
+        with self.condition:
+            if not flush:
+                self.pending = None
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+
+class TaskArchive:
+    #Archived tasks are gzip-compressed JSON lines; every archive run appends one gzip member,
+    #so archiving never rewrites older entries and reads stream through all members in order
+    def __init__(self, project):
+        self.project = project
+        self.path = archive_path(project)
+
+    def append(self, records):
+        if not records:
+            return
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        os.makedirs(ARCHIVE_FOLDER, exist_ok=True)
+        append_project_file(self.path, gzip.compress(data.encode("utf-8")), durable=True)
+
+    def records(self):
+        try:
+            with open_project_file(self.path) as source, \
+                    io.TextIOWrapper(gzip.GzipFile(fileobj=source), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return
+        except (EOFError, OSError):
+            return  #a member cut off by a crash ends the archive
+
+    def search(self, text="", limit=500):
+        words = text.lower().split()
+        results = []
+        for record in self.records():
+            haystack = " ".join(record.get(field, "") for field in ("title", "assignee", "description")).lower()
+            if all(word in haystack for word in words):
+                results.append(record)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def remove(self, task_ids):
+        task_ids = set(task_ids)
+        removed = []
+        with file_lock(self.path):
+            if not os.path.exists(self.path):
+                return removed
+            with tempfile.SpooledTemporaryFile(max_size=ENCRYPTION_CHUNK * 16) as f:
+                with gzip.GzipFile(fileobj=f, mode="wb") as archive:
+                    for record in self.records():
+                        if record.get("id") in task_ids:
+                            removed.append(record)
+                        else:
+                            archive.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                f.seek(0)
+                write_project_stream(self.path, f)
+        return removed
+
+
+def diff_boards(old, new):
+    #Turns two board snapshots into the operations that lead from one to the other. Deletes and
+    #WIP raises come before moves and creates, WIP reductions after, so each step fits the limits
+    old_columns = {column["name"]: column for column in old["columns"]}
+    new_columns = {column["name"]: column for column in new["columns"]}
+    old_tasks = {task["id"]: (column["name"], task) for column in old["columns"] for task in column["tasks"]}
+    new_tasks = {task["id"]: (column["name"], task) for column in new["columns"] for task in column["tasks"]}
+
+    ops = [{"op": "add_column", "column": name} for name in new_columns if name not in old_columns]
+    ops += [{"op": "delete", "id": task_id} for task_id in old_tasks if task_id not in new_tasks]
+    lowered = []
+    for name, column in new_columns.items():
+        previous = old_columns[name]["wip_limit"] if name in old_columns else 0
+        if column["wip_limit"] != previous:
+            op = {"op": "set_wip", "column": name, "wip_limit": column["wip_limit"]}
+            is_raise = column["wip_limit"] == 0 or 0 < previous < column["wip_limit"]
+            (ops if is_raise else lowered).append(op)
+    for task_id, (column_name, task) in new_tasks.items():
+        fields = {field: task.get(field) or "" for field in TASK_FIELDS}  #empty XML elements load as None
+        if task_id not in old_tasks:
+            ops.append({"op": "create", "id": task_id, "column": column_name, "fields": fields})
+            continue
+        old_column, old_task = old_tasks[task_id]
+        if old_column != column_name:
+            ops.append({"op": "move", "id": task_id, "column": column_name})
+        changed = {field: value for field, value in fields.items() if value != (old_task.get(field) or "")}
+        if changed:
+            ops.append({"op": "edit", "id": task_id, "fields": changed})
+    ops += lowered
+    ops += [{"op": "delete_column", "column": name} for name in old_columns if name not in new_columns]
+    old_order = [name for name in old_columns if name in new_columns] + \
+        [name for name in new_columns if name not in old_columns]
+    if old_order != list(new_columns):
+        ops.append({"op": "reorder_columns", "columns": list(new_columns)})
+    return ops
+
+
+class Outbox:
+    #Operations waiting to reach the server, persisted as JSON lines, plus the board state they lead to.
+    #Queued operations survive restarts; the server applies them idempotently, so a crash that
+    #records an operation twice is harmless
+    def __init__(self, project):
+        self.project = project
+        self.ops_path = os.path.join(OUTBOX_FOLDER, f"{project}.jsonl")
+        self.base_path = os.path.join(OUTBOX_FOLDER, f"{project}.base.json")
+        self.lock = threading.Lock()
+        self.ops = []
+        self.base = {"columns": []}
+        try:
+            with open_project_file(self.ops_path) as f:
+                for line in f:
+                    try:
+                        self.ops.append(json.loads(line))
+                    except ValueError:
+                        continue  #cut off by a crash
+        except OSError:
+            pass
+        try:
+            self.base = read_project_json(self.base_path)
+        except (OSError, ValueError):
+            pass
+        self.next_seq = max((op["seq"] for op in self.ops), default=0) + 1
+
+    def __len__(self):
+        with self.lock:
+            return len(self.ops)
+
+    def record(self, board):
+        with self.lock:
+            ops = diff_boards(self.base, board)
+            if not ops:
+                return 0
+            for op in ops:
+                op["seq"] = self.next_seq
+                self.next_seq += 1
+            os.makedirs(OUTBOX_FOLDER, exist_ok=True)
+            append_project_file(self.ops_path, "".join(json.dumps(op, ensure_ascii=False) + "\n"
+                                                       for op in ops).encode("utf-8"), durable=True)
+            write_project_file(self.base_path, json.dumps(board, ensure_ascii=False))
+            self.base = board
+            self.ops.extend(ops)
+            return len(ops)
+
+    def peek(self, limit):
+        with self.lock:
+            return self.ops[:limit]
+
+    def remove(self, seqs):
+        seqs = set(seqs)
+        with self.lock:
+            self.ops = [op for op in self.ops if op["seq"] not in seqs]
+            write_project_file(self.ops_path, "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in self.ops))
+
+    def rebase(self, server_board):
+        #replays the queued operations on the server's board and keeps only those that still apply;
+        #anything another client changed on the server is left alone, and conflicting local edits are dropped
+        with self.lock:
+            board = copy.deepcopy(server_board)
+            ops = []
+            for op in self.ops:
+                attempt = copy.deepcopy(board)  #a rejected operation may have half-applied
+                try:
+                    apply_operations(attempt, [op])
+                except BatchError:
+                    continue
+                board = attempt
+                ops.append(op)
+            self.ops = ops
+            os.makedirs(OUTBOX_FOLDER, exist_ok=True)
+            write_project_file(self.ops_path, "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops))
+            return len(ops)
+
+
+class TaskIndex:
+    #Secondary indexes over the tasks of one open board (assignee, end date, title-word prefixes and
+    #column), each mapping a key to a set of task ids. A filter intersects a few of these sets instead
+    #of walking every card, and column counts are a set size.
+    PREFIX_LENGTH = 20  #Longer query words are matched on their first 20 characters
+
+    def __init__(self):
+        self.fields = {}  #task id -> (assignee key, end date, title prefixes)
+        self.columns = {}  #task id -> column key
+        self.by_assignee = {}
+        self.assignee_names = {}  #assignee key -> name as first entered
+        self.by_end_date = {}
+        self.end_dates = []  #sorted keys of by_end_date, for range queries
+        self.by_prefix = {}
+        self.by_column = {}
+
+    @staticmethod
+    def add_key(table, key, task_id):
+        table.setdefault(key, set()).add(task_id)
+
+    @staticmethod
+    def discard_key(table, key, task_id):
+        ids = table.get(key)
+        if ids is not None:
+            ids.discard(task_id)
+            if not ids:
+                del table[key]
+                return True
+        return False
+
+    def words(self, text):
+        return re.findall(r"\w+", (text or "").casefold())
+
+    def update(self, task_id, title, assignee, end_date):
+        assignee_key = (assignee or "").strip().casefold()
+        prefixes = frozenset(word[:length] for word in self.words(title)
+                             for length in range(1, min(len(word), self.PREFIX_LENGTH) + 1))
+        entry = (assignee_key, end_date or "", prefixes)
+        previous = self.fields.get(task_id)
+        if previous == entry:
+            return
+        if previous is not None:
+            self.remove_fields(task_id, previous)
+        self.fields[task_id] = entry
+        self.add_key(self.by_assignee, assignee_key, task_id)
+        self.assignee_names.setdefault(assignee_key, (assignee or "").strip())
+        if entry[1] not in self.by_end_date:
+            bisect.insort(self.end_dates, entry[1])
+        self.add_key(self.by_end_date, entry[1], task_id)
+        for prefix in prefixes:
+            self.add_key(self.by_prefix, prefix, task_id)
+
+    def remove_fields(self, task_id, entry):
+        assignee_key, end_date, prefixes = entry
+        if self.discard_key(self.by_assignee, assignee_key, task_id):
+            del self.assignee_names[assignee_key]
+        if self.discard_key(self.by_end_date, end_date, task_id):
+            del self.end_dates[bisect.bisect_left(self.end_dates, end_date)]
+        for prefix in prefixes:
+            self.discard_key(self.by_prefix, prefix, task_id)
+
+    def place(self, task_id, column):
+        previous = self.columns.pop(task_id, None)
+        if previous is not None:
+            self.discard_key(self.by_column, previous, task_id)
+        if column is not None:
+            self.columns[task_id] = column
+            self.add_key(self.by_column, column, task_id)
+
+    def remove(self, task_id):
+        entry = self.fields.pop(task_id, None)
+        if entry is not None:
+            self.remove_fields(task_id, entry)
+        self.place(task_id, None)
+
+    def count(self, column):
+        return len(self.by_column.get(column, ()))
+
+    def in_column(self, column):
+        return self.by_column.get(column, set())
+
+    def assignees(self):
+        return sorted((name for key, name in self.assignee_names.items() if key), key=str.casefold)
+
+    def match(self, text="", assignee=None, due_from=None, due_to=None):
+        #ids of tasks matching every given criterion, or None when nothing filters; every word of
+        #text has to start a word of the title, dates are inclusive "YYYY-MM-DD" bounds
+        candidates = []
+        for word in self.words(text):
+            candidates.append(self.by_prefix.get(word[:self.PREFIX_LENGTH], set()))
+        if assignee is not None:
+            candidates.append(self.by_assignee.get(assignee.strip().casefold(), set()))
+        if due_from is not None or due_to is not None:
+            low = bisect.bisect_left(self.end_dates, due_from) if due_from else 0
+            high = bisect.bisect_right(self.end_dates, due_to) if due_to else len(self.end_dates)
+            dated = set()
+            for end_date in self.end_dates[low:high]:
+                if end_date:
+                    dated |= self.by_end_date[end_date]
+            candidates.append(dated)
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+
+class CycleError(ValueError):
+    def __init__(self, path):
+        #path runs from the task that would be blocked back round to the proposed blocker
+        super().__init__("blocking link would create a cycle")
+        self.path = path
+
+
+def parse_blockers(value):
+    return list(dict.fromkeys((value or "").split()))
+
+
+class DependencyGraph:
+    #Blocked-by links between the tasks of one board, kept in a dynamic topological order
+    #(Pearce-Kelly): a link that already agrees with the order costs O(1); otherwise only tasks ordered
+    #between its two ends are visited, which is where any cycle it would close has to lie. The longest
+    #chain of task durations ending at each task is cached and only recomputed for the descendants
+    #of an edit, so the critical path stays cheap to ask for after every change.
+    def __init__(self):
+        self.blockers = {}  #task -> tasks it waits for
+        self.dependents = {}  #task -> tasks waiting for it
+        self.waiting = {}  #task not on the board (archived, not yet created) -> tasks that list it as a blocker
+        self.order = {}
+        self.next_order = 0
+        self.durations = {}
+        self.finish = {}  #days along the longest chain ending with the task
+        self.via = {}  #previous task on that chain
+        self.dirty = set()
+        self.critical = None
+
+    @classmethod
+    def from_board(cls, board, on_error=None):
+        graph = cls()
+        tasks = [task for column in board["columns"] for task in column["tasks"]]
+        for task in tasks:
+            graph.add_task(task["id"], task.get("start_date"), task.get("end_date"))
+        for task in tasks:
+            for blocker in parse_blockers(task.get("blocked_by")):
+                if blocker not in graph:
+                    graph.waiting.setdefault(blocker, set()).add(task["id"])
+                    continue
+                try:
+                    graph.add_link(blocker, task["id"])
+                except CycleError as e:
+                    if on_error:
+                        on_error(task["id"], blocker, e)
+        return graph
+
+    def __contains__(self, task_id):
+        return task_id in self.order
+
+    def duration(self, start_date, end_date):
+        try:
+            days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days + 1
+        except (TypeError, ValueError):
+            return 1
+        return max(days, 1)
+
+    def add_task(self, task_id, start_date="", end_date=""):
+        if task_id not in self.order:
+            self.order[task_id] = self.next_order
+            self.next_order += 1
+            self.blockers[task_id] = set()
+            self.dependents[task_id] = set()
+            #a task that comes back (restored from the archive) blocks whatever still lists it;
+            #it has no blockers of its own yet, so these links cannot close a cycle
+            for dependent in self.waiting.pop(task_id, ()):
+                if dependent in self.order:
+                    self.add_link(task_id, dependent)
+        self.set_dates(task_id, start_date, end_date)
+
+    def set_dates(self, task_id, start_date, end_date):
+        duration = self.duration(start_date, end_date)
+        if self.durations.get(task_id) != duration:
+            self.durations[task_id] = duration
+            self.dirty.add(task_id)
+
+    def remove_task(self, task_id):
+        if task_id not in self.order:
+            return
+        for blocker in self.blockers.pop(task_id):
+            self.dependents[blocker].discard(task_id)
+        for dependent in self.dependents.pop(task_id):
+            self.blockers[dependent].discard(task_id)
+            self.waiting.setdefault(task_id, set()).add(dependent)
+            self.dirty.add(dependent)
+        for table in (self.order, self.durations, self.finish, self.via):
+            table.pop(task_id, None)
+        self.dirty.discard(task_id)
+        self.critical = None
+
+    def add_link(self, blocker, task_id):
+        #raises KeyError for unknown tasks and CycleError if task_id already (indirectly) blocks blocker
+        lower, upper = self.order[task_id], self.order[blocker]
+        if blocker in self.blockers[task_id]:
+            return
+        if blocker == task_id:
+            raise CycleError([task_id])
+        if upper > lower:
+            forward, parents = [], {task_id: None}
+            stack = [task_id]
+            while stack:
+                node = stack.pop()
+                forward.append(node)
+                for dependent in self.dependents[node]:
+                    if dependent == blocker:
+                        path = [blocker, node]
+                        while parents[path[-1]] is not None:
+                            path.append(parents[path[-1]])
+                        raise CycleError(path[::-1])
+                    if dependent not in parents and self.order[dependent] < upper:
+                        parents[dependent] = node
+                        stack.append(dependent)
+            backward, seen = [], {blocker}
+            stack = [blocker]
+            while stack:
+                node = stack.pop()
+                backward.append(node)
+                for previous in self.blockers[node]:
+                    if previous not in seen and self.order[previous] > lower:
+                        seen.add(previous)
+                        stack.append(previous)
+            #everything that reaches the blocker moves ahead of everything the task reaches
+            affected = sorted(backward, key=self.order.get) + sorted(forward, key=self.order.get)
+            for node, position in zip(affected, sorted(self.order[node] for node in affected)):
+                self.order[node] = position
+        self.blockers[task_id].add(blocker)
+        self.dependents[blocker].add(task_id)
+        self.dirty.add(task_id)
+
+    def remove_link(self, blocker, task_id):
+        if blocker in self.blockers.get(task_id, ()):
+            self.blockers[task_id].discard(blocker)
+            self.dependents[blocker].discard(task_id)
+            self.dirty.add(task_id)
+
+    def set_blockers(self, task_id, blockers):
+        #all or nothing: on a cycle the previous links are left in place
+        old = set(self.blockers[task_id])
+        new = [blocker for blocker in blockers if blocker in self.order]
+        for blocker in old - set(new):
+            self.remove_link(blocker, task_id)
+        try:
+            for blocker in new:
+                self.add_link(blocker, task_id)
+        except CycleError:
+            for blocker in set(new) - old:
+                self.remove_link(blocker, task_id)
+            for blocker in old:
+                self.add_link(blocker, task_id)
+            raise
+        for dependents in self.waiting.values():
+            dependents.discard(task_id)
+        for blocker in blockers:
+            if blocker not in self.order:
+                self.waiting.setdefault(blocker, set()).add(task_id)
+
+    def recompute(self):
+        if not self.dirty:
+            return
+        affected, stack = set(), list(self.dirty)
+        while stack:
+            node = stack.pop()
+            if node not in affected:
+                affected.add(node)
+                stack.extend(self.dependents[node])
+        #in topological order every blocker is final before the tasks waiting for it
+        for node in sorted(affected, key=self.order.get):
+            best = max(self.blockers[node], key=lambda blocker: self.finish[blocker], default=None)
+            self.via[node] = best
+            self.finish[node] = self.durations[node] + (self.finish[best] if best is not None else 0)
+        self.dirty.clear()
+        self.critical = None
+
+    def critical_path(self):
+        #(total days, task ids from first to last) of the longest chain of blocked-by links
+        self.recompute()
+        if self.critical is None:
+            end = max(self.finish, key=lambda node: (self.finish[node], -self.order[node]), default=None)
+            path = []
+            while end is not None:
+                path.append(end)
+                end = self.via[end]
+            self.critical = (self.finish[path[0]] if path else 0, path[::-1])
+        return self.critical
+
+
+class BatchError(ValueError):
+    def __init__(self, index, message):
+        super().__init__(message)
+        self.index = index
+
+
+FIELD_LABELS = {"title": "Title", "assignee": "Assignee", "start_date": "Start Date",
+                "end_date": "End Date", "description": "Description", "blocked_by": "Blocked By"}
+
+
+CONTROL_CHARACTERS = re.compile(r"[\x00-\x1f\x7f]")
+DESCRIPTION_CONTROL_CHARACTERS = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")  #descriptions may span lines
+
+
+def validate_text(value, name, index, optional=False):
+    #ids, column names and titles end up in log rows, so they must be single-line strings
+    if optional and value is None:
+        return
+    if not isinstance(value, str) or not value.strip():
+        raise BatchError(index, f"{name} must be a non-empty string")
+    if CONTROL_CHARACTERS.search(value):
+        raise BatchError(index, f"{name} cannot contain control characters")
+
+
+def is_todo_column(name):
+    return name.lower() == TODO_COLUMN.lower()
+
+
+def validate_fields(fields, index, require_title=False):
+    if not isinstance(fields, dict) or set(fields) - set(TASK_FIELDS):
+        raise BatchError(index, f"fields must be an object with keys from {', '.join(TASK_FIELDS)}")
+    for field, value in fields.items():
+        if not isinstance(value, str):
+            raise BatchError(index, f"{field} must be a string")
+        pattern = DESCRIPTION_CONTROL_CHARACTERS if field == "description" else CONTROL_CHARACTERS
+        if pattern.search(value):
+            raise BatchError(index, f"{field} cannot contain control characters")
+        if field in ("start_date", "end_date") and value and not re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+            raise BatchError(index, f"{field} must be YYYY-MM-DD")
+    if (require_title or "title" in fields) and not fields.get("title", "").strip():
+        raise BatchError(index, "title cannot be empty")
+
+
+def apply_operations(board, operations):
+    #Applies operations in order to a board read from disk, enforcing the same rules as the desktop
+    #client (task and column limits, WIP limits, the fixed "To Do" column, no moving a task to a later
+    #column while a task it is blocked by is outside Done). Repeating an operation that
+    #already took effect is a no-op, so a client may resend a batch whose response it never saw.
+    #Returns the log entries to append; the caller only writes the board if nothing raised.
+    columns = {column["name"]: column for column in board["columns"]}
+    locations = {task["id"]: column for column in board["columns"] for task in column["tasks"]}
+    task_count = len(locations)
+    entries = []
+    graph = None  #built on the first blocked_by change, then kept in step with the tasks on the board
+
+    def find_task(task_id):
+        column = locations.get(task_id)
+        return column, next(task for task in column["tasks"] if task["id"] == task_id)
+
+    def check_wip(column, index):
+        if 0 < column["wip_limit"] <= len(column["tasks"]):
+            raise BatchError(index, f"WIP limit of '{column['name']}' reached ({column['wip_limit']})")
+
+    def target_column(name, index):
+        validate_text(name, "column", index)
+        if name not in columns:
+            raise BatchError(index, f"Unknown column '{name}'")
+        return columns[name]
+
+    def load_graph():
+        #must run before the operation touches the board: from_board drops any link that closes a
+        #cycle, and on an already edited board that could be the old link rather than the new one
+        nonlocal graph
+        if graph is None:
+            graph = DependencyGraph.from_board(board)
+
+    def check_blockers(task, index):
+        #links to tasks that are not on the board (archived or deleted) are kept but ignored
+        try:
+            graph.set_blockers(task["id"], parse_blockers(task["blocked_by"]))
+        except CycleError as e:
+            titles = {task_id: find_task(task_id)[1]["title"] for task_id in e.path}
+            raise BatchError(index, "blocked_by would create a cycle: " +
+                             " blocks ".join(f"'{titles[task_id]}'" for task_id in e.path + e.path[:1]))
+
+    for index, op in enumerate(operations):
+        kind = op.get("op") if isinstance(op, dict) else None
+        if kind == "create":
+            task_id = op.get("id") if op.get("id") != "" else None  #no id: the server picks one
+            validate_text(task_id, "id", index, optional=True)
+            if task_id in locations:
+                continue
+            fields = op.get("fields", {})
+            validate_fields(fields, index, require_title=True)
+            column = target_column(op.get("column", TODO_COLUMN), index)
+            if task_count >= MAX_BOARD_TASKS:
+                raise BatchError(index, f"Board is full ({MAX_BOARD_TASKS} tasks)")
+            check_wip(column, index)
+            task = {field: fields.get(field, "") for field in TASK_FIELDS}
+            task["id"] = task_id or uuid.uuid4().hex
+            if task["blocked_by"]:
+                load_graph()
+            column["tasks"].append(task)
+            locations[task["id"]] = column
+            task_count += 1
+            if graph is not None:
+                graph.add_task(task["id"])
+            if task["blocked_by"]:
+                check_blockers(task, index)
+            entries.append(("Task Created", f"'{task['title']}' in column '{column['name']}' [id {task['id']}]"))
+        elif kind == "move":
+            validate_text(op.get("id"), "id", index)
+            if op["id"] not in locations:
+                raise BatchError(index, f"Unknown task '{op['id']}'")
+            source, task = find_task(op["id"])
+            column = target_column(op.get("column"), index)
+            if column is source:
+                continue
+            if board["columns"].index(column) > board["columns"].index(source):
+                open_blockers = [find_task(blocker)[1]["title"] for blocker in parse_blockers(task["blocked_by"])
+                                 if blocker in locations and locations[blocker]["name"].lower() != DONE_COLUMN.lower()]
+                if open_blockers:
+                    raise BatchError(index, f"'{task['title']}' is blocked by " +
+                                     ", ".join(f"'{title}'" for title in open_blockers))
+            check_wip(column, index)
+            source["tasks"].remove(task)
+            column["tasks"].append(task)
+            locations[task["id"]] = column
+            entries.append(("Task Moved", f"'{task['title']}' moved to '{column['name']}' [id {task['id']}]"))
+        elif kind == "edit":
+            validate_text(op.get("id"), "id", index)
+            if op["id"] not in locations:
+                raise BatchError(index, f"Unknown task '{op['id']}'")
+            fields = op.get("fields", {})
+            validate_fields(fields, index)
+            _, task = find_task(op["id"])
+            changed = [field for field, value in fields.items() if task[field] != value]
+            if not changed:
+                continue
+            if "blocked_by" in changed:
+                load_graph()
+            task.update(fields)
+            if "blocked_by" in changed:
+                check_blockers(task, index)
+            entries.append(("Task Edited", f"'{task['title']}' fields changed: "
+                                           f"{', '.join(FIELD_LABELS[field] for field in changed)}"))
+        elif kind == "delete":
+            validate_text(op.get("id"), "id", index)
+            if op["id"] not in locations:
+                continue
+            column, task = find_task(op["id"])
+            column["tasks"].remove(task)
+            del locations[task["id"]]
+            task_count -= 1
+            if graph is not None:
+                graph.remove_task(task["id"])
+            entries.append(("Task Deleted", f"'{task['title']}' deleted [id {task['id']}]"))
+        elif kind == "set_wip":
+            column = target_column(op.get("column"), index)
+            wip_limit = op.get("wip_limit")
+            if not isinstance(wip_limit, int) or isinstance(wip_limit, bool) or not 0 <= wip_limit <= MAX_WIP_LIMIT:
+                raise BatchError(index, f"wip_limit must be a whole number from 0 to {MAX_WIP_LIMIT}")
+            if wip_limit == column["wip_limit"]:
+                continue
+            if column["wip_limit"] == 0:
+                entries.append(("WIP Limit Set", f"WIP limit for '{column['name']}' set to {wip_limit}"))
+            else:
+                entries.append(("WIP Limit Changed", f"WIP limit for '{column['name']}' changed from "
+                                                     f"{column['wip_limit']} to {wip_limit}"))
+            column["wip_limit"] = wip_limit
+        elif kind == "add_column":
+            name = op.get("column")
+            validate_text(name, "column", index)
+            if name in columns:
+                continue
+            if is_todo_column(name) and any(is_todo_column(existing) for existing in columns):
+                raise BatchError(index, f"A '{TODO_COLUMN}' column already exists")
+            if len(columns) >= MAX_BOARD_COLUMNS:
+                raise BatchError(index, f"Boards are limited to {MAX_BOARD_COLUMNS} columns")
+            column = {"name": name, "wip_limit": 0, "tasks": []}
+            board["columns"].append(column)
+            columns[name] = column
+            entries.append(("Column Created", f"'{name}' column added"))
+        elif kind == "delete_column":
+            name = op.get("column")
+            validate_text(name, "column", index)
+            if is_todo_column(name):
+                raise BatchError(index, f"The '{TODO_COLUMN}' column cannot be deleted")
+            if name not in columns:
+                continue
+            column = columns.pop(name)
+            board["columns"].remove(column)
+            for task in column["tasks"]:
+                del locations[task["id"]]
+                if graph is not None:
+                    graph.remove_task(task["id"])
+            task_count -= len(column["tasks"])
+            entries.append(("Column Deleted", f"'{name}' column deleted"))
+        elif kind == "reorder_columns":
+            order = op.get("columns")
+            if not isinstance(order, list) or not all(isinstance(name, str) for name in order) \
+                    or sorted(order) != sorted(columns):
+                raise BatchError(index, "columns must list every column of the board exactly once")
+            if any(is_todo_column(name) for name in columns) and not is_todo_column(order[0]):
+                raise BatchError(index, f"The '{TODO_COLUMN}' column must stay first")
+            if order == [column["name"] for column in board["columns"]]:
+                continue
+            board["columns"] = [columns[name] for name in order]
+            entries.append(("Columns Reordered", " | ".join(order)))
+        else:
+            raise BatchError(index, f"Unknown operation {kind!r}")
+    return entries
+
+
+def empty_board():
+    #what the server starts from when a board's first batch arrives
+    return {"version": 0, "columns": [{"name": TODO_COLUMN, "wip_limit": 0, "tasks": []}]}
+
+
+def update_board(project_name, operations):
+    #one lock, one read, one atomic write and one version bump for the whole batch
+    file_path = board_path(project_name)
+    with file_lock(file_path):
+        try:
+            board = read_board(file_path)
+        except FileNotFoundError:
+            board = empty_board()
+        entries = apply_operations(board, operations)
+        if entries:
+            board["version"] += 1
+            write_project_file(file_path, board_to_xml(board))
+    if entries:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        append_log_line(log_path(project_name),
+                        "".join(format_log_line(timestamp, action, details) for action, details in entries))
+    return board, len(entries)
+
+
+def migrate_layout(target, depth=SHARD_DEPTH, verbose=True):
+    #Moves every board and log into the target layout with same-filesystem renames. It is safe to
+    #re-run after an interruption; the manifest is written once the files are in place.
+    #No client or server may be running while it works.
+    global project_layout
+    layout = get_project_layout()
+    layout.depth = depth if target == "sharded" else layout.depth
+    if not os.path.isdir(PROJECTS_FOLDER):
+        os.makedirs(PROJECTS_FOLDER)
+
+    files = []  #(project name, file name, current folder)
+    for folder, directories, file_names in os.walk(PROJECTS_FOLDER):
+        directories[:] = [d for d in directories if not d.startswith(".")]
+        for file_name in file_names:
+            if file_name.startswith("Log_") and file_name.endswith(".csv"):
+                files.append((file_name[4:-4], file_name, folder))
+            elif file_name.endswith(".xml"):
+                files.append((file_name[:-4], file_name, folder))
+
+    moved = 0
+    projects = set()
+    for name, file_name, folder in files:
+        if file_name.endswith(".xml"):
+            projects.add(name)
+        destination = layout.folder(name, sharded=target == "sharded")
+        if os.path.normpath(folder) == os.path.normpath(destination):
+            continue
+        os.makedirs(destination, exist_ok=True)
+        os.replace(os.path.join(folder, file_name), os.path.join(destination, file_name))
+        for path in (os.path.join(folder, f"{file_name}.lock"), lock_path(os.path.join(folder, file_name))):
+            try:
+                os.remove(path)  #lock files (and the sidecars of older versions) are recreated on demand
+            except OSError:
+                pass
+        moved += 1
+        if verbose and moved % 1000 == 0:
+            print(f"{moved} files moved")
+
+    if target == "sharded":
+        layout.sharded = True
+        layout.projects = projects
+        layout.save()
+    else:
+        for path in (MANIFEST_FILE, f"{MANIFEST_FILE}.lock", lock_path(MANIFEST_FILE)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        for folder, directories, file_names in os.walk(PROJECTS_FOLDER, topdown=False):
+            if folder != PROJECTS_FOLDER and not os.path.basename(folder).startswith(".") \
+                    and not folder.startswith(METADATA_FOLDER):
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    pass
+    fsync_directory(PROJECTS_FOLDER)
+    project_layout = None
+    if project_catalog is not None:
+        project_catalog.refresh(force=True)
+    if verbose:
+        print(f"{moved} files moved; {len(projects)} projects now use the {target} layout")
+    return moved
+
+
+def convert_encryption(encrypt=True, verbose=True):
+    #Rewrites every board, log, autosave and metadata store encrypted with the configured passphrase, or
+    #back to plaintext. Encrypting also repacks logs written one chunk per entry into full-size chunks and
+    #deletes the on-disk search index; plaintext offsets, and so the log indexes and metrics checkpoints,
+    #stay valid either way.
+    cipher = get_file_cipher()
+    if encrypt and cipher is None:
+        raise RuntimeError(f"Set {ENCRYPTION_PASSPHRASE_ENV} to encrypt project files")
+    converted = 0
+    for name in get_project_layout().names():
+        for file_path in [board_path(name), log_path(name), autosave_path(name)] + metadata_paths(name):
+            if not os.path.exists(file_path):
+                continue
+            with file_lock(file_path):
+                if not encrypt and not is_encrypted_file(file_path):
+                    continue
+                with open_project_file(file_path) as source, atomic_open(file_path) as target:
+                    if encrypt:
+                        write_encrypted(target, cipher, source)
+                    else:
+                        shutil.copyfileobj(source, target)
+            converted += 1
+    if encrypt:
+        remove_search_database()
+    if verbose:
+        print(f"{converted} files {'encrypted' if encrypt else 'decrypted'}")
+    return converted
+
+
+class BackupCancelled(Exception):
+    pass
+
+
+class ProgressReader:
+    #Wraps a file for tarfile: every read is reported, and a requested stop ends the copy mid-file
+    def __init__(self, f, on_read, should_stop=None):
+        self.f = f
+        self.on_read = on_read
+        self.should_stop = should_stop
+
+    def read(self, size=-1):
+        if self.should_stop and self.should_stop():
+            raise BackupCancelled()
+        data = self.f.read(size)
+        self.on_read(len(data))
+        return data
+
+
+def backup_members(projects=None):
+    #(name in the archive, path on disk). Files are copied exactly as stored, so encrypted boards and
+    #logs stay encrypted and encryption.json travels with them.
+    members = [(name, path) for name, path in ((BACKUP_ENCRYPTION, ENCRYPTION_FILE), (ADMINS_FILE, ADMINS_FILE))
+               if os.path.exists(path)]
+    for name in get_project_layout().names() if projects is None else projects:
+        if not project_file_path(name):
+            raise ValueError(f"Invalid project name: {name!r}")
+        for member, path in ((f"projects/{name}.xml", board_path(name)),
+                             (f"projects/Log_{name}.csv", log_path(name)),
+                             (f"archive/{name}.jsonl.gz", archive_path(name))):
+            if os.path.exists(path):
+                members.append((member, path))
+    return members
+
+
+def write_backup(fileobj, projects=None, on_progress=None, should_stop=None):
+    #Streams a tar.gz into fileobj one 16 KiB block at a time, so memory use does not grow with the
+    #installation. Each file is snapshotted under its lock and streamed after the lock is released, so a
+    #slow reader of the backup never holds up saves. on_progress(done, total) is called in bytes of the
+    #original files.
+    members = []
+    for name, path in backup_members(projects):
+        try:
+            members.append((name, path, os.stat(path)))
+        except OSError:
+            continue  #deleted since the listing
+    total = sum(stat.st_size for _, _, stat in members)
+    done = 0
+
+    def on_read(count):
+        nonlocal done
+        done += count
+        if on_progress:
+            on_progress(done, total)
+
+    manifest = json.dumps({"format": 1, "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                           "projects": [name[9:-4] for name, _, _ in members if name.startswith("projects/")
+                                        and name.endswith(".xml")],
+                           "files": len(members)}).encode("utf-8")
+    with tarfile.open(fileobj=fileobj, mode="w|gz") as tar:
+        info = tarfile.TarInfo(BACKUP_MANIFEST)
+        info.size = len(manifest)
+        info.mtime = int(datetime.now().timestamp())
+        tar.addfile(info, io.BytesIO(manifest))
+        for name, path, stat in members:
+            with tempfile.SpooledTemporaryFile(max_size=BACKUP_SPOOL_MEMORY) as snapshot:
+                with file_lock(path), open(path, "rb") as f:
+                    shutil.copyfileobj(f, snapshot)
+                info = tarfile.TarInfo(name)
+                info.size = snapshot.tell()
+                info.mtime = int(stat.st_mtime)
+                snapshot.seek(0)
+                tar.addfile(info, ProgressReader(snapshot, on_read, should_stop))
+    return len(members)
+
+
+def backup_target(member_name):
+    #Maps an archive member back to (project, path), or (None, None) for anything a backup never contains
+    if member_name == BACKUP_ENCRYPTION:
+        return None, ENCRYPTION_FILE
+    if member_name == ADMINS_FILE:
+        return None, ADMINS_FILE
+    match = BACKUP_MEMBER.match(member_name)
+    if not match:
+        return None, None
+    kind, name = next((kind, name) for kind, name in match.groupdict().items() if name is not None)
+    if not project_file_path(name):
+        return None, None
+    return name, {"board": board_path, "log": log_path, "archive": archive_path}[kind](name)
+
+
+def restore_backup(fileobj, on_progress=None, should_stop=None):
+    #Reads a backup written by write_backup front to back without extracting it anywhere first.
+    #Every file is replaced atomically under its lock, so a cancelled restore leaves each file either
+    #old or new; files already restored stay restored. on_progress(done) counts archive bytes read.
+    #Returns the restored project names.
+    restored = set()
+    layout = get_project_layout()
+    done = 0
+
+    def on_read(count):
+        nonlocal done
+        done += count
+        if on_progress:
+            on_progress(done)
+
+    with tarfile.open(fileobj=ProgressReader(fileobj, on_read, should_stop), mode="r|gz") as tar:
+        first = True
+        for member in tar:
+            if first:
+                if member.name != BACKUP_MANIFEST:
+                    raise ValueError("Not a kanban backup archive")
+                first = False
+                continue
+            name, path = backup_target(member.name)
+            if path is None or not member.isfile():
+                continue
+            source = tar.extractfile(member)
+            if path == ENCRYPTION_FILE and os.path.exists(path):
+                #encryption.json comes first, so a mismatch stops the restore before anything is replaced
+                with open(path, "rb") as f:
+                    if f.read() != source.read():
+                        raise ValueError("The backup was encrypted with a different key salt than this installation")
+                continue
+            if name is not None and path == board_path(name):
+                layout.add(name)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with file_lock(path), atomic_open(path) as f:
+                shutil.copyfileobj(source, f)
+            with chunk_maps_lock:
+                chunk_maps.pop(path, None)
+            if name is not None:
+                restored.add(name)
+
+    for name in restored:
+        #logs were replaced wholesale, so incremental checkpoints over them no longer apply
+        flow_metrics.pop(name, None)
+        log_indexes.pop(name, None)
+        for path in (os.path.join(METRICS_FOLDER, f"{name}.json"), os.path.join(LOG_INDEX_FOLDER, f"{name}.json")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        discard_autosave(name)
+    if project_catalog is not None:
+        project_catalog.refresh(force=True)
+    return sorted(restored)
+
+
+def check_new_project(name):
+    if not project_file_path(name):
+        raise ValueError(f"Invalid project name: {name!r}")
+    if os.path.exists(board_path(name)):
+        raise ValueError(f"Project '{name}' already exists")
+    if os.path.exists(log_path(name)):
+        raise ValueError(f"A log for '{name}' is still kept from a deleted project")
+
+
+def delete_project_files(name):
+    #the log and the task archive are kept, as they always have been
+    file_path = board_path(name)
+    with file_lock(file_path):
+        if not os.path.exists(file_path):
+            raise ValueError(f"Project '{name}' does not exist")
+        os.remove(file_path)
+    discard_autosave(name)
+
+
+def clone_project_files(source, target, timestamp):
+    #Task ids are unique across the search index, so the clone's board gets fresh ids. The source's log,
+    #archive and metrics refer to the old ids, so the clone starts its own log: a "Project Cloned" entry
+    #and a "Task Created" entry per task, which the flow metrics then count from.
+    check_new_project(target)
+    board = read_board(board_path(source))
+    new_ids = {}
+    for column in board["columns"]:
+        for task in column["tasks"]:
+            new_ids[task["id"]] = uuid.uuid4().hex
+            task["id"] = new_ids[task["id"]]
+    for column in board["columns"]:
+        for task in column["tasks"]:
+            task["blocked_by"] = " ".join(new_ids.get(blocker, blocker) for blocker in parse_blockers(task["blocked_by"]))
+    board["version"] = 0
+    write_project_file(board_path(target), board_to_xml(board))
+    entries = [format_log_line(timestamp, "Project Cloned", f"Cloned from '{source}'")]
+    entries += [format_log_line(timestamp, "Task Created", f"'{task['title']}' in column '{column['name']}' [id {task['id']}]")
+                for column in board["columns"] for task in column["tasks"]]
+    append_log_line(log_path(target), "".join(entries))
+
+
+def rename_project_files(old, new):
+    check_new_project(new)
+    if len(Outbox(old)):
+        raise ValueError(f"Project '{old}' has edits not yet synced to the server")
+    moves = [(board_path(old), board_path(new)), (log_path(old), log_path(new)),
+             (archive_path(old), archive_path(new)), (autosave_path(old), autosave_path(new)),
+             (os.path.join(METRICS_FOLDER, f"{old}.json"), os.path.join(METRICS_FOLDER, f"{new}.json")),
+             (os.path.join(LOG_INDEX_FOLDER, f"{old}.json"), os.path.join(LOG_INDEX_FOLDER, f"{new}.json"))]
+    with file_lock(board_path(old)):
+        if not os.path.exists(board_path(old)):
+            raise ValueError(f"Project '{old}' does not exist")
+        os.makedirs(os.path.dirname(board_path(new)), exist_ok=True)
+        os.replace(board_path(old), board_path(new))
+    for source, target in moves[1:]:
+        if os.path.exists(source):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with file_lock(source):
+                os.replace(source, target)
+    flow_metrics.pop(old, None)
+    log_indexes.pop(old, None)
+    with chunk_maps_lock:
+        for source, _ in moves:
+            chunk_maps.pop(source, None)
+    for path in (os.path.join(OUTBOX_FOLDER, f"{old}.jsonl"), os.path.join(OUTBOX_FOLDER, f"{old}.base.json")):
+        try:
+            os.remove(path)  #the server has no board under the new name; the next sync sends it whole
+        except OSError:
+            pass
+
+
+def apply_project_operations(operations, on_progress=None, should_stop=None):
+    #operations: ("delete", name), ("clone", source, target) or ("rename", old, new). Each one is
+    #independent; failures are collected and the rest still run. Returns (added, removed, errors);
+    #record_project_changes then updates the catalog, manifest and search index once for the batch.
+    added, removed, errors = [], [], []
+    for count, (action, name, *target) in enumerate(operations, 1):
+        if should_stop and should_stop():
+            break
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            if action == "delete":
+                delete_project_files(name)
+                append_log_line(log_path(name), format_log_line(timestamp, "Project Deleted", f"Project '{name}' XML deleted"))
+                removed.append(name)
+            elif action == "clone":
+                clone_project_files(name, target[0], timestamp)
+                added.append(target[0])
+            elif action == "rename":
+                rename_project_files(name, target[0])
+                append_log_line(log_path(target[0]), format_log_line(timestamp, "Project Renamed", f"Renamed from '{name}'"))
+                removed.append(name)
+                added.append(target[0])
+            else:
+                raise ValueError(f"Unknown operation {action!r}")
+        except (OSError, ValueError, ET.ParseError) as e:
+            errors.append(f"{name}: {e}")
+        if on_progress:
+            on_progress(count)
+    return added, removed, errors
+
+
+def record_project_changes(added=(), removed=()):
+    #applied to the catalog directly rather than through a refresh, so the batch costs one catalog write
+    catalog = get_project_catalog(refresh=False)
+    catalog.record_changes(added, removed)
+    index = get_search_index(refresh=False)
+    for name in removed:
+        index.delete_project(name)
+    index.refresh(catalog)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Kanban board storage maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser("migrate-layout", help="move boards and logs between the flat and sharded layouts")
+    migrate.add_argument("target", choices=("flat", "sharded"))
+    migrate.add_argument("--depth", type=int, default=SHARD_DEPTH, help="levels of hashed directories (default 2)")
+    encryption = commands.add_parser("encrypt-files",
+                                     help=f"encrypt all boards and logs with {ENCRYPTION_PASSPHRASE_ENV}")
+    encryption.add_argument("--decrypt", action="store_true", help="write them back as plaintext instead")
+    backup = commands.add_parser("backup", help="write projects, logs, archives and admin_users.json to a tar.gz")
+    backup.add_argument("path")
+    backup.add_argument("--project", action="append", help="back up only this project (repeatable)")
+    restore = commands.add_parser("restore", help="restore a backup written by the backup command")
+    restore.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "migrate-layout":
+        migrate_layout(args.target, args.depth)
+    elif args.command == "encrypt-files":
+        convert_encryption(not args.decrypt)
+    elif args.command == "backup":
+        with atomic_open(args.path) as f:
+            count = write_backup(f, args.project)
+        print(f"{count} files backed up to {args.path}")
+    elif args.command == "restore":
+        with open(args.path, "rb") as f:
+            names = restore_backup(f)
+        print(f"{len(names)} projects restored")
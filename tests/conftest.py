@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import kanban_storage  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    #every path in kanban_storage is relative to the working directory, and its caches belong to one tree
+    monkeypatch.chdir(tmp_path)
+    for name in ("project_layout", "project_catalog", "search_index"):
+        monkeypatch.setattr(kanban_storage, name, None)
+    for name in ("flow_metrics", "log_indexes", "chunk_maps"):
+        monkeypatch.setattr(kanban_storage, name, {})
+    return tmp_path
@@ -0,0 +1,229 @@
+import os
+
+import pytest
+
+import kanban_storage
+
+kanban_server = pytest.importorskip("kanban_server")
+
+
+@pytest.fixture
+def client(workdir, monkeypatch):
+    monkeypatch.setitem(kanban_server.app.config, "TESTING", True)
+    monkeypatch.setitem(kanban_server.app.config, "JWT_SECRET_KEY", "test-secret-that-is-long-enough-for-hs256")
+    return kanban_server.app.test_client()
+
+
+def auth(identity="admin"):
+    with kanban_server.app.app_context():
+        return {"Authorization": f"Bearer {kanban_server.create_access_token(identity=identity)}"}
+
+
+def batch(client, operations, name="b1"):
+    return client.post(f"/boards/{name}/batch", json={"operations": operations}, headers=auth())
+
+
+def log_rows(name="b1"):
+    with open(kanban_storage.log_path(name), encoding="utf-8") as f:
+        return f.read().splitlines()[1:]
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "create", "id": 5, "fields": {"title": "Numbered"}},
+    {"op": "move", "id": ["x"], "column": "To Do"},
+    {"op": "create", "column": ["a"], "fields": {"title": "Listed"}},
+    {"op": "reorder_columns", "columns": ["To Do", 1]},
+    {"op": "create", "fields": {"title": 7}},
+    {"op": "delete", "id": {"a": 1}},
+])
+def test_batch_rejects_fields_of_the_wrong_type(client, operation):
+    response = batch(client, [operation])
+    assert response.status_code == 409
+    assert response.get_json()["index"] == 0
+
+
+def test_batch_rejects_line_breaks_that_would_forge_log_rows(client):
+    title = "evil\n2099-01-01 00:00:00,Task Deleted,'x' deleted"
+    response = batch(client, [{"op": "create", "fields": {"title": title}}])
+    assert response.status_code == 409
+    assert not os.path.exists(kanban_storage.log_path("b1"))
+
+
+def test_batch_log_rows_quote_commas_and_quotes(client):
+    title = 'Fix "a", then b'
+    assert batch(client, [{"op": "create", "id": "t1", "fields": {"title": title}}]).status_code == 200
+    row = log_rows()[-1]
+    assert row.endswith('"\'Fix ""a"", then b\' in column \'To Do\' [id t1]"')
+    assert kanban_storage.parse_log_line(row)[2] == f"'{title}' in column 'To Do' [id t1]"
+
+
+def test_batch_refuses_to_move_a_blocked_task_forward(client):
+    assert batch(client, [{"op": "add_column", "column": "Doing"},
+                          {"op": "add_column", "column": "Done"},
+                          {"op": "create", "id": "a", "fields": {"title": "First"}},
+                          {"op": "create", "id": "b", "fields": {"title": "Second", "blocked_by": "a"}}]).status_code == 200
+    response = batch(client, [{"op": "move", "id": "b", "column": "Doing"}])
+    assert response.status_code == 409
+    assert "blocked by 'First'" in response.get_json()["message"]
+    assert batch(client, [{"op": "move", "id": "a", "column": "Done"},
+                          {"op": "move", "id": "b", "column": "Doing"}]).status_code == 200
+
+
+def test_batch_treats_the_todo_column_case_insensitively(client):
+    response = batch(client, [{"op": "delete_column", "column": "to do"}])
+    assert response.status_code == 409
+    assert batch(client, [{"op": "add_column", "column": "TO DO"}]).status_code == 409
+
+
+def test_batch_requires_a_token(client):
+    response = client.post("/boards/b1/batch", json={"operations": [{"op": "add_column", "column": "Doing"}]})
+    assert response.status_code == 401
+
+
+def test_log_export_quotes_details(client):
+    title = 'evil, "quoted"'
+    assert batch(client, [{"op": "create", "id": "t1", "fields": {"title": title}},
+                          {"op": "create", "id": "t2", "fields": {"title": "plain"}}]).status_code == 200
+    response = client.get("/logs/b1?q=evil", headers=auth())
+    assert response.status_code == 200
+    import csv
+    rows = list(csv.reader(response.get_data(as_text=True).splitlines()))
+    assert rows[0] == ["timestamp", "action", "details"]
+    assert [row[1:] for row in rows[1:]] == [["Task Created", f"'{title}' in column 'To Do' [id t1]"]]
+
+
+@pytest.mark.parametrize("limit", ["0", "-1", "x"])
+def test_log_export_rejects_bad_limits(client, limit):
+    assert batch(client, [{"op": "create", "fields": {"title": "One"}}]).status_code == 200
+    assert client.get(f"/logs/b1?limit={limit}", headers=auth()).status_code == 400
+
+
+def test_log_export_limit(client):
+    assert batch(client, [{"op": "create", "fields": {"title": f"Task {n}"}} for n in range(3)]).status_code == 200
+    assert len(client.get("/logs/b1?limit=2", headers=auth()).get_data(as_text=True).splitlines()) == 3
+    assert len(client.get("/logs/b1", headers=auth()).get_data(as_text=True).splitlines()) == 4
+
+
+@pytest.mark.parametrize("days", ["0", "-5", "x"])
+def test_board_metrics_reject_bad_days(client, days):
+    assert batch(client, [{"op": "create", "fields": {"title": "One"}}]).status_code == 200
+    assert client.get(f"/boards/b1/metrics?days={days}", headers=auth()).status_code == 400
+    assert client.get("/boards/b1/metrics?days=7", headers=auth()).status_code == 200
+
+
+def test_backup_ends_the_stream_when_the_writer_fails(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk on fire")
+    monkeypatch.setattr(kanban_server, "write_backup", fail)
+    response = client.get("/backup", headers=auth())
+    assert response.status_code == 200
+    assert response.get_data() == b""
+
+
+def login(client):
+    assert client.post("/register", json={"username": "admin", "password": "secret"}).status_code == 200
+    response = client.post("/login", json={"username": "admin", "password": "secret"})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_login_returns_an_access_and_a_refresh_token(client):
+    data = login(client)
+    assert data["success"] and data["access_token"] and data["refresh_token"]
+    assert data["access_token"] != data["refresh_token"]
+    assert client.get("/protected", headers={"Authorization": f"Bearer {data['access_token']}"}).status_code == 200
+
+
+def test_login_rejects_a_wrong_password(client):
+    login(client)
+    assert client.post("/login", json={"username": "admin", "password": "wrong"}).status_code == 401
+
+
+def test_refresh_issues_an_access_token_for_a_refresh_token(client):
+    data = login(client)
+    response = client.post("/refresh", headers={"Authorization": f"Bearer {data['refresh_token']}"})
+    assert response.status_code == 200
+    token = response.get_json()["access_token"]
+    assert "refresh_token" not in response.get_json()
+    assert client.get("/protected", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+
+def test_refresh_rejects_an_access_token(client):
+    data = login(client)
+    response = client.post("/refresh", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert response.status_code in (401, 422)
+    assert "access_token" not in response.get_json()
+
+
+def test_refresh_token_is_not_an_access_token(client):
+    data = login(client)
+    assert client.get("/protected", headers={"Authorization": f"Bearer {data['refresh_token']}"}).status_code in (401, 422)
+
+
+def large_board(client):
+    description = "A description long enough to push the board past the compression threshold. " * 4
+    operations = [{"op": "create", "fields": {"title": f"Task {n}", "description": description}} for n in range(10)]
+    assert batch(client, operations).status_code == 200
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_board_responses_are_compressed_when_accepted(client, encoding):
+    if encoding == "br":
+        brotli = pytest.importorskip("brotli")
+        decompress = brotli.decompress
+    else:
+        import gzip
+        decompress = gzip.decompress
+    large_board(client)
+    response = client.get("/boards/b1", headers={**auth(), "Accept-Encoding": encoding})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["Vary"]
+    import json
+    assert len(json.loads(decompress(response.get_data()))["board"]["columns"][0]["tasks"]) == 10
+
+
+def test_board_responses_prefer_brotli_over_gzip(client):
+    pytest.importorskip("brotli")
+    large_board(client)
+    response = client.get("/boards/b1", headers={**auth(), "Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+
+
+def test_board_responses_stay_plain_without_accept_encoding(client):
+    large_board(client)
+    response = client.get("/boards/b1", headers=auth())
+    assert "Content-Encoding" not in response.headers
+    assert len(response.get_json()["board"]["columns"][0]["tasks"]) == 10
+
+
+def test_small_responses_are_not_compressed(client):
+    assert batch(client, [{"op": "create", "fields": {"title": "One"}}]).status_code == 200
+    response = client.get("/boards/b1", headers={**auth(), "Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json()["success"]
+
+
+def test_board_responses_use_msgpack_when_preferred(client):
+    msgpack = pytest.importorskip("msgpack")
+    assert batch(client, [{"op": "create", "fields": {"title": "One"}}]).status_code == 200
+    response = client.get("/boards/b1", headers={**auth(), "Accept": "application/x-msgpack, application/json;q=0.5"})
+    assert response.mimetype == "application/x-msgpack"
+    assert "Accept" in response.headers["Vary"]
+    assert msgpack.unpackb(response.get_data(), raw=False)["board"]["columns"][0]["tasks"][0]["title"] == "One"
+
+
+@pytest.mark.parametrize("accept", [None, "application/json", "*/*", "application/json, application/x-msgpack;q=0.5"])
+def test_board_responses_fall_back_to_json(client, accept):
+    assert batch(client, [{"op": "create", "fields": {"title": "One"}}]).status_code == 200
+    headers = {**auth(), "Accept": accept} if accept else auth()
+    response = client.get("/boards/b1", headers=headers)
+    assert response.mimetype == "application/json"
+    assert response.get_json()["board"]["columns"][0]["tasks"][0]["title"] == "One"
+
+
+def test_board_responses_fall_back_to_json_without_msgpack(client, monkeypatch):
+    monkeypatch.setattr(kanban_server, "msgpack", None)
+    assert batch(client, [{"op": "create", "fields": {"title": "One"}}]).status_code == 200
+    response = client.get("/boards/b1", headers={**auth(), "Accept": "application/x-msgpack"})
+    assert response.mimetype == "application/json"
@@ -0,0 +1,321 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import kanban_storage  # noqa: E402
+from kanban_storage import BatchError, apply_operations  # noqa: E402
+
+
+def make_board(*tasks):
+    columns = [{"name": "To Do", "wip_limit": 0, "tasks": []}, {"name": "Done", "wip_limit": 0, "tasks": []}]
+    for task_id, blocked_by in tasks:
+        task = {field: "" for field in kanban_storage.TASK_FIELDS}
+        task.update({"id": task_id, "title": f"Task {task_id}", "blocked_by": blocked_by})
+        columns[0]["tasks"].append(task)
+    return {"version": 0, "columns": columns}
+
+
+def test_edit_that_closes_a_cycle_is_rejected():
+    board = make_board(("1", ""), ("2", "1"))
+    with pytest.raises(BatchError, match="cycle"):
+        apply_operations(board, [{"op": "edit", "id": "1", "fields": {"blocked_by": "2"}}])
+
+
+def test_create_that_closes_a_cycle_is_rejected():
+    #task 1 already waits for a task "3" that is not on the board yet
+    board = make_board(("1", "3"), ("2", "1"))
+    with pytest.raises(BatchError, match="cycle"):
+        apply_operations(board, [{"op": "create", "id": "3", "fields": {"title": "Task 3", "blocked_by": "2"}}])
+
+
+def test_reversing_a_link_in_one_batch_is_allowed():
+    board = make_board(("1", ""), ("2", "1"))
+    entries = apply_operations(board, [{"op": "edit", "id": "2", "fields": {"blocked_by": ""}},
+                                       {"op": "edit", "id": "1", "fields": {"blocked_by": "2"}}])
+    assert [action for action, _ in entries] == ["Task Edited", "Task Edited"]
+
+
+def test_recreated_task_cannot_close_a_cycle():
+    board = make_board(("1", ""), ("2", "1"))
+    with pytest.raises(BatchError, match="cycle"):
+        apply_operations(board, [{"op": "delete", "id": "1"},
+                                 {"op": "create", "id": "1", "fields": {"title": "Again", "blocked_by": "2"}}])
+
+
+def write_log(project, *entries):
+    for entry in entries:
+        kanban_storage.append_log_line(kanban_storage.log_path(project), entry + "\n")
+
+
+def test_flow_metrics_follow_a_renamed_task(workdir):
+    write_log("flow",
+              "2024-01-01 09:00:00,Task Created,'Task 1' in column 'To Do' [id a1]",
+              "2024-01-01 10:00:00,Task Edited,'Write docs' fields changed: Title",
+              "2024-01-02 09:00:00,Task Moved,'Write docs' moved to 'Done' [id a1]")
+    summary = kanban_storage.FlowMetrics("flow")
+    summary.update()
+    summary = summary.summary()
+    assert summary["columns"]["To Do"]["current"] == 0
+    assert summary["columns"]["Done"]["current"] == 1
+    assert summary["cycle_time"] == {"count": 1, "average_hours": 24.0}
+
+
+def test_flow_metrics_keep_reused_titles_apart(workdir):
+    write_log("flow",
+              "2024-01-01 09:00:00,Task Created,'Task 1' in column 'To Do' [id a1]",
+              "2024-01-01 09:05:00,Task Deleted,'Task 1' deleted [id a1]",
+              "2024-01-01 09:10:00,Task Created,'Task 1' in column 'To Do' [id b2]",
+              "2024-01-01 09:20:00,Task Created,'Task 2' in column 'To Do' [id c3]",
+              "2024-01-01 09:30:00,Task Edited,'Task 1' fields changed: Title",
+              "2024-01-01 09:40:00,Task Moved,'Task 1' moved to 'Doing' [id c3]")
+    metrics = kanban_storage.FlowMetrics("flow")
+    metrics.update()
+    assert metrics.tasks["b2"][0] == "To Do"
+    assert metrics.tasks["c3"][0] == "Doing"
+    assert metrics.summary()["columns"]["To Do"]["current"] == 1
+
+
+def test_flow_metrics_read_entries_logged_without_ids(workdir):
+    write_log("flow",
+              "2024-01-01 09:00:00,Task Created,'Old task' in column 'To Do'",
+              "2024-01-01 10:00:00,Task Moved,'Old task' moved to 'Done' [id a1]")
+    metrics = kanban_storage.FlowMetrics("flow")
+    metrics.update()
+    assert list(metrics.tasks) == ["a1"]
+    assert metrics.summary()["columns"]["To Do"]["current"] == 0
+
+
+def test_flow_metrics_share_one_engine_across_threads(workdir):
+    import threading
+    write_log("flow", "2024-01-01 09:00:00,Task Created,'Task 1' in column 'To Do' [id a1]")
+    engines = []
+    threads = [threading.Thread(target=lambda: engines.append(kanban_storage.get_flow_metrics("flow"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(engine) for engine in engines}) == 1
+    assert engines[0].summary()["columns"]["To Do"]["current"] == 1
+
+
+def test_catalog_notices_a_board_edited_in_place(workdir):
+    os.makedirs(kanban_storage.PROJECTS_FOLDER)
+    path = kanban_storage.board_path("inplace")
+    with open(path, "wb") as f:
+        f.write(kanban_storage.board_to_xml({"columns": []}))
+    catalog = kanban_storage.ProjectCatalog()
+    catalog.refresh()
+    assert catalog.entries["inplace"]["columns"] == 0
+    folder_mtime = os.stat(kanban_storage.PROJECTS_FOLDER).st_mtime
+    with open(path, "r+b") as f:
+        f.write(kanban_storage.board_to_xml({"columns": [{"name": "To Do", "wip_limit": 0, "tasks": []}]}))
+    os.utime(kanban_storage.PROJECTS_FOLDER, (folder_mtime, folder_mtime))
+    os.utime(path, (folder_mtime + 5, folder_mtime + 5))
+    catalog.refresh()
+    assert catalog.entries["inplace"]["columns"] == 1
+
+
+@pytest.fixture
+def encrypted(workdir, monkeypatch):
+    pytest.importorskip("cryptography")
+    monkeypatch.setattr(kanban_storage, "file_ciphers", {})
+    monkeypatch.setattr(kanban_storage, "chunk_maps", {})
+    monkeypatch.setenv(kanban_storage.ENCRYPTION_PASSPHRASE_ENV, "correct horse")
+    return workdir
+
+
+def read_plaintext(path):
+    with kanban_storage.open_project_file(path) as f:
+        return f.read()
+
+
+def test_cutting_chunks_off_an_encrypted_file_is_detected(encrypted):
+    path = kanban_storage.board_path("secret")
+    kanban_storage.write_project_file(path, os.urandom(3 * kanban_storage.ENCRYPTION_CHUNK))
+    chunks = kanban_storage.encrypted_chunk_map(path, open(path, "rb"))["chunks"]
+    with open(path, "r+b") as f:
+        f.truncate(chunks[-1][1])  #drops the end record, keeping every data chunk
+    kanban_storage.chunk_maps.clear()
+    with pytest.raises(OSError, match="truncated"):
+        read_plaintext(path)
+
+
+def test_a_flipped_bit_fails_authentication(encrypted):
+    path = kanban_storage.board_path("secret")
+    kanban_storage.write_project_file(path, os.urandom(2 * kanban_storage.ENCRYPTION_CHUNK))
+    with open(path, "r+b") as f:
+        f.seek(100)
+        byte = f.read(1)
+        f.seek(100)
+        f.write(bytes([byte[0] ^ 1]))
+    kanban_storage.chunk_maps.clear()
+    with pytest.raises(OSError, match="failed authentication"):
+        read_plaintext(path)
+
+
+def test_encrypted_appends_only_add_bytes(encrypted):
+    write_log("secret", "2024-01-01 09:00:00,Task Created,'One' in column 'To Do'")
+    path = kanban_storage.log_path("secret")
+    with open(path, "rb") as f:
+        committed = f.read()
+    write_log("secret", "2024-01-01 09:05:00,Task Created,'Two' in column 'To Do'")
+    with open(path, "rb") as f:
+        assert f.read().startswith(committed)
+    assert read_plaintext(path).endswith(b"'Two' in column 'To Do'\n")
+
+
+def test_append_cut_off_before_its_end_record_is_dropped(encrypted):
+    write_log("secret", "2024-01-01 09:00:00,Task Created,'One' in column 'To Do'",
+              "2024-01-01 09:05:00,Task Created,'Two' in column 'To Do'")
+    path = kanban_storage.log_path("secret")
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - kanban_storage.CHUNK_OVERHEAD)  #a crash before the end record
+    kanban_storage.chunk_maps.clear()
+    assert b"'Two'" not in read_plaintext(path)  #only what a completed write left is read
+    write_log("secret", "2024-01-01 09:10:00,Task Created,'Three' in column 'To Do'")
+    entries = read_plaintext(path).splitlines()
+    assert len(entries) == 3
+    assert entries[1].endswith(b"'One' in column 'To Do'") and entries[2].endswith(b"'Three' in column 'To Do'")
+
+
+def test_plaintext_log_is_encrypted_on_append(encrypted, monkeypatch):
+    monkeypatch.delenv(kanban_storage.ENCRYPTION_PASSPHRASE_ENV)
+    write_log("secret", "2024-01-01 09:00:00,Task Created,'One' in column 'To Do'")
+    path = kanban_storage.log_path("secret")
+    assert not kanban_storage.is_encrypted_file(path)
+    monkeypatch.setenv(kanban_storage.ENCRYPTION_PASSPHRASE_ENV, "correct horse")
+    write_log("secret", "2024-01-01 09:05:00,Task Created,'Two' in column 'To Do'")
+    assert kanban_storage.is_encrypted_file(path)
+    assert read_plaintext(path).count(b"Task Created") == 2
+
+
+def test_side_stores_are_encrypted(encrypted):
+    board = make_board(("1", ""))
+    board["columns"][0]["tasks"][0]["title"] = "Confidential launch"
+    kanban_storage.TaskArchive("secret").append([board["columns"][0]["tasks"][0]])
+    outbox = kanban_storage.Outbox("secret")
+    outbox.record(board)
+    write_log("secret", "2024-01-01 09:00:00,Task Created,'Confidential launch' in column 'To Do' [id 1]")
+    metrics = kanban_storage.FlowMetrics("secret")
+    metrics.update()
+    kanban_storage.LogIndex("secret").update()
+    for path in kanban_storage.metadata_paths("secret"):
+        with open(path, "rb") as f:
+            assert b"Confidential" not in f.read()
+    assert [record["title"] for record in kanban_storage.TaskArchive("secret").records()] == ["Confidential launch"]
+    assert len(kanban_storage.Outbox("secret")) == len(outbox)
+    index = kanban_storage.SearchIndex()
+    index.index_project("secret", board, 0)
+    assert index.search("confid")[0]["title"] == "Confidential launch"
+    assert not os.path.exists(kanban_storage.SEARCH_INDEX_FILE)
+
+
+def test_backup_does_not_hold_file_locks_while_streaming(workdir):
+    import threading
+    write_log("busy", "2024-01-01 09:00:00,Task Created,'One' in column 'To Do'")
+    kanban_storage.write_project_file(kanban_storage.board_path("busy"), kanban_storage.board_to_xml({"columns": []}))
+    saved = []
+
+    def save():
+        for path in (kanban_storage.board_path("busy"), kanban_storage.log_path("busy")):
+            with kanban_storage.file_lock(path):
+                saved.append(path)
+
+    def on_progress(done, total):
+        #the backup client is stalled here, mid-stream; saves must still get through
+        if not saved:
+            writer = threading.Thread(target=save, daemon=True)
+            writer.start()
+            writer.join(5)
+            assert len(saved) == 2
+
+    import io
+    assert kanban_storage.write_backup(io.BytesIO(), ["busy"], on_progress) >= 2
+
+
+def test_lock_files_go_away_with_their_project(workdir):
+    kanban_storage.write_project_file(kanban_storage.board_path("gone"), kanban_storage.board_to_xml({"columns": []}))
+    write_log("gone", "2024-01-01 09:00:00,Task Created,'One' in column 'To Do'")
+    kanban_storage.rename_project_files("gone", "moved")
+    kanban_storage.delete_project_files("moved")
+    locks = os.listdir(kanban_storage.LOCK_FOLDER)
+    assert not [name for name in locks if "gone" in name or "moved.xml" in name]
+    assert not [name for name in os.listdir(kanban_storage.PROJECTS_FOLDER) if name.endswith(".lock")]
+
+
+def test_waiting_locker_relocks_after_the_lock_file_is_removed(workdir):
+    import threading
+    path = "target.txt"
+    order = []
+    with open(path, "w") as f:
+        f.write("x")
+
+    def wait_for_lock():
+        with kanban_storage.file_lock(path):
+            order.append("waiter")
+            assert os.path.exists(kanban_storage.lock_path(path))
+
+    with kanban_storage.file_lock(path):
+        waiter = threading.Thread(target=wait_for_lock)
+        waiter.start()
+        os.remove(path)  #the lock file goes when this lock is released
+        order.append("holder")
+    waiter.join(5)
+    assert order == ["holder", "waiter"]
+
+
+def test_atomic_write_keeps_the_file_mode(workdir):
+    with open("shared.xml", "w") as f:
+        f.write("old")
+    os.chmod("shared.xml", 0o644)
+    kanban_storage.atomic_write("shared.xml", "new")
+    assert os.stat("shared.xml").st_mode & 0o777 == 0o644
+    kanban_storage.atomic_write("fresh.xml", "new")
+    assert os.stat("fresh.xml").st_mode & 0o777 == 0o666 & ~kanban_storage.process_umask
+
+
+def test_outbox_rebase_keeps_server_changes_and_drops_conflicts(workdir):
+    board = make_board(("1", ""))
+    outbox = kanban_storage.Outbox("synced")
+    outbox.record(board)
+    outbox.remove(op["seq"] for op in outbox.peek(10))
+    board = make_board(("1", ""), ("2", ""))
+    board["columns"][0]["tasks"][0]["title"] = "Renamed"
+    outbox.record(board)
+    assert sorted(op["op"] for op in outbox.peek(10)) == ["create", "edit"]
+    #another client deleted task 1 and added task 3; the queued edit can never apply
+    server_board = make_board(("3", ""))
+    assert outbox.rebase(server_board) == 1
+    queued = kanban_storage.Outbox("synced").peek(10)
+    assert [(op["op"], op["id"]) for op in queued] == [("create", "2")]
+    apply_operations(server_board, queued)
+    assert [task["id"] for task in server_board["columns"][0]["tasks"]] == ["3", "2"]
+
+
+def test_log_index_reads_past_malformed_lines(workdir, monkeypatch):
+    monkeypatch.setattr(kanban_storage.LogIndex, "BLOCK_LINES", 2)
+    write_log("index",
+              "2024-01-01 09:00:00,Task Created,'One' in column 'To Do'",
+              "a stray line without fields",
+              "2024-01-01 09:05:00,Task Created,'Two' in column 'To Do'",
+              "2024-01-01 09:10:00,Task Created,'Three' in column 'To Do'")
+    index = kanban_storage.LogIndex("index")
+    assert [entry["details"][:5] for entry in index.query()] == ["'One'", "'Two'", "'Thre"]
+    assert [entry["details"][:5] for entry in index.query(start="2024-01-01 09:02:00")] == ["'Two'", "'Thre"]
+
+
+def test_clone_starts_a_log_of_its_own(workdir):
+    board = make_board(("a1", ""))
+    kanban_storage.write_project_file(kanban_storage.board_path("src"), kanban_storage.board_to_xml(board))
+    write_log("src", "2024-01-01 09:00:00,Task Created,'Task a1' in column 'To Do' [id a1]")
+    added, _, errors = kanban_storage.apply_project_operations([("clone", "src", "dst")])
+    assert (added, errors) == (["dst"], [])
+    [task] = kanban_storage.read_board(kanban_storage.board_path("dst"))["columns"][0]["tasks"]
+    write_log("dst", f"2099-01-02 09:00:00,Task Moved,'Task a1' moved to 'Done' [id {task['id']}]")
+    columns = kanban_storage.FlowMetrics("dst")
+    columns.update()
+    columns = columns.summary()["columns"]
+    assert (columns["To Do"]["current"], columns["Done"]["current"]) == (0, 1)